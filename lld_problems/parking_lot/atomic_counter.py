@@ -0,0 +1,24 @@
+from threading import Lock
+
+
+class AtomicCounter:
+    def __init__(self, start=1):
+        self._value = start
+        self._lock = Lock()
+
+    def next(self):
+        with self._lock:
+            value = self._value
+            self._value += 1
+            return value
+
+    def reserve(self, count):
+        """Claim `count` consecutive values and return the first one."""
+        with self._lock:
+            first = self._value
+            self._value += count
+            return first
+
+    @property
+    def value(self):
+        return self._value
@@ -0,0 +1,64 @@
+"""Park/unpark latency of the free-spot index versus the old full scan.
+
+Run with `python benchmark_allocation.py`. The indexed strategy should stay
+flat as the lot grows, while the scan grows linearly with the spot count.
+"""
+import time
+
+from building import ParkingBuilding
+from parking_floor import ParkingFloor
+from parking_spot import ParkingSpot
+from strategy import SpotAllocationStrategy
+from vehicle import Vehicle, VehicleType
+
+
+SPOTS_PER_FLOOR = 1000
+
+
+class LinearScanStrategy(SpotAllocationStrategy):
+    """The original allocation path: list every free spot, take the first."""
+
+    def find_available_spot(self, buildings, vehicle_type, entrance=None):
+        for building in buildings:
+            spots = building.get_all_spots(vehicle_type)
+            if spots:
+                return spots[0]
+        return None
+
+
+def build_lot(total_spots, occupied_ratio=0.9):
+    building = ParkingBuilding(name="bench")
+    for floor_num in range(total_spots // SPOTS_PER_FLOOR):
+        floor = ParkingFloor(floor_num=floor_num, building=building)
+        building.add_floor(floor)
+        for _ in range(SPOTS_PER_FLOOR):
+            floor.add_spots(ParkingSpot(vehicle_type_supported=VehicleType.Car))
+    # Fill the front of the lot so a scan has to walk past occupied spots.
+    filler = Vehicle("FILLER", VehicleType.Car)
+    strategy = SpotAllocationStrategy()
+    for _ in range(int(total_spots * occupied_ratio)):
+        strategy.find_available_spot([building], VehicleType.Car).assign_vehicle(filler)
+    return [building]
+
+
+def measure(strategy, buildings, rounds):
+    vehicle = Vehicle("KA-01-AA-1234", VehicleType.Car)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        spot = strategy.find_available_spot(buildings, VehicleType.Car)
+        spot.assign_vehicle(vehicle)
+        spot.remove_vehicle()
+    return (time.perf_counter() - start) / rounds * 1e6
+
+
+def main():
+    print(f"{'spots':>8} {'indexed us/op':>15} {'scan us/op':>12}")
+    for total_spots in (1_000, 10_000, 100_000):
+        buildings = build_lot(total_spots)
+        indexed = measure(SpotAllocationStrategy(), buildings, rounds=20_000)
+        scan = measure(LinearScanStrategy(), buildings, rounds=max(10, 200_000 // total_spots))
+        print(f"{total_spots:>8} {indexed:>15.2f} {scan:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Multi-threaded park/unpark stress test for ParkingLot.
+
+Every gate runs on its own thread and repeatedly parks a batch of vehicles,
+checks that each ticketed spot still holds its own vehicle (a double
+assignment would overwrite it) and unparks them again. Throughput is
+reported per gate count; the run fails loudly on any inconsistency.
+"""
+import sys
+import time
+from threading import Thread
+
+from building import ParkingBuilding
+from parking_floor import ParkingFloor
+from parking_spot import ParkingSpot
+from parkinglot import ParkingLot
+from payment import Payment
+from vehicle import Vehicle, VehicleType
+
+
+BATCH = 20
+ROUNDS = 50
+
+
+class NoOpPayment(Payment):
+    def pay(self, amount):
+        pass
+
+
+def build_lot(floors=10, spots_per_floor=100):
+    lot = ParkingLot.get_instance()
+    lot.verbose = False
+    building = ParkingBuilding(name="stress")
+    lot.add_building(building)
+    for floor_num in range(floors):
+        floor = ParkingFloor(floor_num=floor_num, building=building)
+        building.add_floor(floor)
+        for i in range(spots_per_floor):
+            vehicle_type = VehicleType.BIKE if i % 4 == 0 else VehicleType.Car
+            floor.add_spots(ParkingSpot(vehicle_type_supported=vehicle_type))
+    return lot
+
+
+def run_gate(lot, gate_id, errors, issued):
+    payment = NoOpPayment()
+    for round_num in range(ROUNDS):
+        tickets = []
+        for i in range(BATCH):
+            vehicle_type = VehicleType.BIKE if i % 4 == 0 else VehicleType.Car
+            vehicle = Vehicle(f"G{gate_id}-{round_num}-{i}", vehicle_type)
+            ticket = lot.park_vehicle(vehicle)
+            if ticket:
+                tickets.append(ticket)
+        for ticket in tickets:
+            if ticket.spot.vehicle is not ticket.vehicle:
+                errors.append(f"spot {ticket.spot.id} double-assigned")
+            issued.append(ticket.ticket_id)
+        for ticket in tickets:
+            lot.unpark_vehicle(ticket.ticket_id, payment)
+
+
+def run(lot, gates):
+    errors, issued = [], []
+    threads = [Thread(target=run_gate, args=(lot, g, errors, issued)) for g in range(gates)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    if len(set(issued)) != len(issued):
+        errors.append("duplicate ticket IDs issued")
+    if lot.active_tickets:
+        errors.append(f"{len(lot.active_tickets)} tickets left active")
+    for building in lot.buildings:
+        for floor in building.floors:
+            for spot in floor.spots:
+                if spot.is_occupied or spot not in floor.free_spots[spot.vehicle_type_supported]:
+                    errors.append(f"spot {spot.id} not released")
+    return len(issued) * 2 / elapsed, errors
+
+
+def main():
+    # switch threads as often as possible to shake out races
+    sys.setswitchinterval(1e-6)
+    lot = build_lot()
+    print(f"{'gates':>6} {'ops/sec':>12}  result")
+    for gates in (1, 2, 4, 8, 16):
+        throughput, errors = run(lot, gates)
+        print(f"{gates:>6} {throughput:>12.0f}  {'OK' if not errors else errors[:3]}")
+        if errors:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
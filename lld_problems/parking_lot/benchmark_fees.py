@@ -0,0 +1,45 @@
+"""Re-price closed stays with the scalar FeePolicy and the batch calculator.
+
+Checks that both paths agree before reporting timings. Without NumPy the
+batch calculator falls back to the scalar path, so expect no speed-up.
+"""
+import random
+import time
+from datetime import datetime, timedelta
+
+from fee_policy import FeePolicy
+from fee_settlement import BatchFeeCalculator, np
+
+
+def random_stays(count, seed=7):
+    rng = random.Random(seed)
+    start = datetime(2025, 12, 1)
+    entries, exits = [], []
+    for _ in range(count):
+        entry = start + timedelta(seconds=rng.randrange(60 * 86400))
+        entries.append(entry)
+        exits.append(entry + timedelta(seconds=rng.randrange(3 * 86400)))
+    return entries, exits
+
+
+def main():
+    entries, exits = random_stays(200_000)
+
+    start = time.perf_counter()
+    scalar = [FeePolicy.calculate_fee(a, b) for a, b in zip(entries, exits)]
+    scalar_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = BatchFeeCalculator().calculate_fees(entries, exits)
+    batch_time = time.perf_counter() - start
+
+    if [int(fee) for fee in batch] != scalar:
+        raise SystemExit("batch and scalar fees disagree")
+    if np is None:
+        print("NumPy is not installed; the batch path ran FeePolicy per stay")
+    print(f"{len(entries)} stays, revenue ₹{sum(scalar)}")
+    print(f"scalar: {scalar_time:.3f}s  batch: {batch_time:.3f}s  speed-up: {scalar_time / batch_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Write throughput and recovery time of ParkingJournal on local files.
+
+Run with `python benchmark_journal.py`. Recovery time should follow the
+number of records logged since the last snapshot, not the total history.
+"""
+import tempfile
+import time
+
+from building import ParkingBuilding
+from journal import ParkingJournal
+from parking_floor import ParkingFloor
+from parking_spot import ParkingSpot
+from parkinglot import ParkingLot
+from payment import Payment
+from vehicle import Vehicle, VehicleType
+
+
+class NoOpPayment(Payment):
+    def pay(self, amount):
+        pass
+
+
+def build_lot(floors=10, spots_per_floor=1000):
+    lot = ParkingLot.get_instance()
+    lot.verbose = False
+    building = ParkingBuilding(name="journal")
+    lot.add_building(building)
+    for floor_num in range(floors):
+        floor = ParkingFloor(floor_num=floor_num, building=building)
+        building.add_floor(floor)
+        for _ in range(spots_per_floor):
+            floor.add_spots(ParkingSpot(vehicle_type_supported=VehicleType.Car))
+    return lot
+
+
+def simulate_restart(lot):
+    lot.journal.close()
+    lot.journal = None
+    for ticket in list(lot.active_tickets.values()):
+        lot.ticket_index.remove(ticket)
+        ticket.spot.remove_vehicle()
+    lot.active_tickets.clear()
+
+
+def churn(lot, operations):
+    """Park and unpark so the log grows while ~5000 cars stay parked."""
+    payment = NoOpPayment()
+    parked = []
+    for i in range(operations // 2):
+        parked.append(lot.park_vehicle(Vehicle(f"KA-{i}", VehicleType.Car)))
+        if len(parked) > 5000:
+            lot.unpark_vehicle(parked.pop(0).ticket_id, payment)
+
+
+def main():
+    lot = build_lot()
+
+    print(f"{'fsync every':>12} {'records/sec':>12}")
+    for fsync_every in (1, 64, 1024):
+        with tempfile.TemporaryDirectory() as directory:
+            ParkingJournal(directory, fsync_every=fsync_every, snapshot_every=10**9).attach(lot)
+            operations = 2_000 if fsync_every == 1 else 40_000
+            start = time.perf_counter()
+            churn(lot, operations)
+            lot.journal.sync()
+            print(f"{fsync_every:>12} {operations / (time.perf_counter() - start):>12.0f}")
+            simulate_restart(lot)
+
+    print(f"\n{'history':>8} {'since snapshot':>15} {'recovery ms':>12}")
+    for history, snapshot_every in ((20_000, 10**9), (100_000, 10**9), (100_000, 20_000)):
+        with tempfile.TemporaryDirectory() as directory:
+            ParkingJournal(directory, snapshot_every=snapshot_every).attach(lot)
+            churn(lot, history)
+            since = lot.journal.records_since_snapshot
+            active = len(lot.active_tickets)
+            simulate_restart(lot)
+            start = time.perf_counter()
+            ParkingJournal(directory).attach(lot)
+            elapsed = (time.perf_counter() - start) * 1000
+            assert len(lot.active_tickets) == active
+            print(f"{history:>8} {since:>15} {elapsed:>12.1f}")
+            simulate_restart(lot)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Memory and lookup cost of ParkingSpot objects versus CompactParkingFloor.
+
+Run with `python benchmark_storage.py`.
+"""
+import random
+import time
+import tracemalloc
+
+from building import ParkingBuilding
+from compact_floor import CompactParkingFloor
+from parking_floor import ParkingFloor
+from parking_spot import ParkingSpot
+from strategy import SpotAllocationStrategy
+from vehicle import Vehicle, VehicleType
+
+
+FLOORS = 20
+SPOTS_PER_FLOOR = 10_000
+
+
+def build_object_lot():
+    building = ParkingBuilding(name="objects")
+    for floor_num in range(FLOORS):
+        floor = ParkingFloor(floor_num=floor_num, building=building)
+        building.add_floor(floor)
+        for i in range(SPOTS_PER_FLOOR):
+            floor.add_spots(ParkingSpot(vehicle_type_supported=VehicleType.Car, ev_supported=i % 10 == 0))
+    return building
+
+
+def build_compact_lot():
+    building = ParkingBuilding(name="compact")
+    for floor_num in range(FLOORS):
+        floor = CompactParkingFloor(floor_num=floor_num, building=building)
+        building.add_floor(floor)
+        for i in range(0, SPOTS_PER_FLOOR, 10):
+            floor.add_spot_range(1, VehicleType.Car, ev_supported=True)
+            floor.add_spot_range(9, VehicleType.Car)
+    return building
+
+
+def measure_memory(build):
+    tracemalloc.start()
+    building = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return building, size
+
+
+def measure_lookups(building, rounds=100_000):
+    rng = random.Random(1)
+    floors = building.floors
+    start = time.perf_counter()
+    for _ in range(rounds):
+        floors[rng.randrange(FLOORS)].spots[rng.randrange(SPOTS_PER_FLOOR)].is_occupied
+    lookup = (time.perf_counter() - start) / rounds * 1e6
+
+    strategy = SpotAllocationStrategy()
+    vehicle = Vehicle("KA-01-AA-1234", VehicleType.Car)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        spot = strategy.find_available_spot([building], VehicleType.Car)
+        spot.assign_vehicle(vehicle)
+        spot.remove_vehicle()
+    park = (time.perf_counter() - start) / rounds * 1e6
+    return lookup, park
+
+
+def main():
+    total = FLOORS * SPOTS_PER_FLOOR
+    print(f"{total} spots")
+    print(f"{'storage':>8} {'bytes/spot':>11} {'lookup us':>10} {'park+unpark us':>15}")
+    for name, build in (("objects", build_object_lot), ("compact", build_compact_lot)):
+        building, size = measure_memory(build)
+        lookup, park = measure_lookups(building)
+        print(f"{name:>8} {size / total:>11.1f} {lookup:>10.2f} {park:>15.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,29 @@
+from free_spot_pool import FreeSpotPool
+from occupancy import OccupancyCounter
+
 
 class ParkingBuilding:
     def __init__(self, name):
         self.id = id(self)
         self.floors = []
         self.name = name
+        # vehicle type -> pool of floors with at least one free spot
+        self.floors_with_free = {}
+        self.occupancy = OccupancyCounter()
+        # bumped whenever floors or spots are added; see layout_changed
+        self.layout_version = 0
+        # set by ParkingLot.add_building
+        self.lot = None
     
     def add_floor(self, floor):
+        floor.building = self
+        floor.position = len(self.floors)
         self.floors.append(floor)
+        self.layout_changed()
+        for vehicle_type in floor.free_vehicle_types():
+            self.floor_has_free(floor, vehicle_type)
+        for key, total in floor.occupancy.total.items():
+            self.occupancy_changed(floor, key, floor.occupancy.free.get(key, 0), total)
 
     def get_all_spots(self, vehicle_type):
         spots = []
@@ -14,3 +31,37 @@ class ParkingBuilding:
             spots.extend(floor.get_available_spots(vehicle_type))
         return spots
 
+    def find_free_spot(self, vehicle_type, accept=None):
+        pool = self.floors_with_free.get(vehicle_type)
+        if not pool:
+            return None
+        if accept is None:
+            floor = pool.peek()
+            return floor.find_free_spot(vehicle_type) if floor else None
+        found = []
+
+        def has_acceptable_spot(floor):
+            spot = floor.find_free_spot(vehicle_type, accept)
+            if spot:
+                found.append(spot)
+            return spot is not None
+
+        pool.find(has_acceptable_spot)
+        return found[0] if found else None
+
+    def floor_has_free(self, floor, vehicle_type):
+        self.floors_with_free.setdefault(vehicle_type, FreeSpotPool()).add(floor.position, floor)
+
+    def floor_is_full(self, floor, vehicle_type):
+        pool = self.floors_with_free.get(vehicle_type)
+        if pool:
+            pool.discard(floor)
+
+    def layout_changed(self):
+        """Called when a floor or spot is added, so cached layouts are rebuilt."""
+        self.layout_version += 1
+
+    def occupancy_changed(self, floor, key, free_delta, total_delta=0):
+        self.occupancy.update(key, free_delta, total_delta)
+        if self.lot:
+            self.lot.occupancy.changed(self, floor, key, free_delta, total_delta)
@@ -0,0 +1,248 @@
+import bisect
+from array import array
+
+from occupancy import OccupancyCounter
+from parking_spot import spot_ids
+
+
+class SpotView:
+    """Lightweight handle on one spot of a CompactParkingFloor.
+
+    Exposes the same attributes and methods as ParkingSpot, but all state
+    lives in the floor's arrays; a view is two slots and is created on
+    demand, so the floor never keeps one object per spot.
+    """
+
+    __slots__ = ("floor", "position")
+
+    def __init__(self, floor, position):
+        self.floor = floor
+        self.position = position
+
+    @property
+    def id(self):
+        return self.floor.spot_id(self.position)
+
+    @property
+    def vehicle_type_supported(self):
+        return self.floor.vehicle_types[self.floor.type_codes[self.position]]
+
+    @property
+    def is_occupied(self):
+        return bool(self.floor.occupied[self.position])
+
+    @property
+    def ev_supported(self):
+        return bool(self.floor.ev_supported[self.position])
+
+    @property
+    def vehicle(self):
+        return self.floor.vehicles.get(self.position)
+
+    @property
+    def location(self):
+        return self.floor.location_of(self.position)
+
+    def is_available_for(self, vehicle_type):
+        return not self.is_occupied and self.vehicle_type_supported == vehicle_type
+
+    def get_floor_number(self):
+        return self.floor.floor_num
+
+    def get_building(self):
+        return self.floor.building
+
+    def assign_vehicle(self, vehicle):
+        self.floor.assign(self.position, vehicle)
+
+    def remove_vehicle(self):
+        self.floor.release(self.position)
+
+    def __eq__(self, other):
+        return isinstance(other, SpotView) and self.id == other.id
+
+    def __hash__(self):
+        return hash(self.id)
+
+
+class SpotViewSequence:
+    """Read-only `floor.spots` for a compact floor, yielding SpotViews."""
+
+    __slots__ = ("floor",)
+
+    def __init__(self, floor):
+        self.floor = floor
+
+    def __len__(self):
+        return len(self.floor.occupied)
+
+    def __getitem__(self, position):
+        if not 0 <= position < len(self):
+            raise IndexError(position)
+        return SpotView(self.floor, position)
+
+    def __iter__(self):
+        for position in range(len(self)):
+            yield SpotView(self.floor, position)
+
+
+class CompactParkingFloor:
+    """Drop-in ParkingFloor for very large lots.
+
+    Occupancy, EV support and vehicle type are one byte per spot, and the
+    free spots of each vehicle type are a stack of positions in an int
+    array. Only occupied spots cost a Python object (the parked vehicle).
+    Free spots are handed out last-released-first rather than lowest
+    position first.
+
+    Each add_spot_range takes one contiguous block of IDs from the shared
+    allocator, and a spot's location is its range's origin plus its offset
+    times the range's step. Both are looked up by bisecting the ranges, so
+    other spots may be created between two ranges.
+    """
+
+    def __init__(self, floor_num, building):
+        self.id = id(self)
+        self.floor_num = floor_num
+        self.building = building
+        # set by ParkingBuilding.add_floor
+        self.position = None
+        # one entry per add_spot_range, in position (and so ID) order
+        self.range_starts = []
+        self.range_ids = []
+        self.range_origins = []
+        self.range_steps = []
+        self.occupied = bytearray()
+        self.ev_supported = bytearray()
+        self.type_codes = bytearray()
+        self.queued = bytearray()
+        self.vehicle_types = []
+        self.vehicles = {}
+        self.free_stacks = {}  # type code -> array of free positions
+        self.free_counts = {}  # type code -> number of free spots
+        self.spots = SpotViewSequence(self)
+        self.occupancy = OccupancyCounter()
+
+    def add_spot_range(self, count, vehicle_type_supported, ev_supported=False, location=None, step=(1, 0)):
+        """Add `count` identical free spots and return the first new spot ID.
+
+        The spots lie at `location`, `location + step`, ... and the default
+        origin is the start of the range's row on this floor.
+        """
+        code = self._type_code(vehicle_type_supported)
+        start = len(self.occupied)
+        first_id = spot_ids.reserve(count)
+        origin = tuple(location) if location is not None else (start, self.floor_num)
+        step = tuple(step)
+        # a range that carries on from the last one in IDs and locations
+        # extends it, so a floor built range by range usually keeps one entry
+        if not (self.range_starts and start
+                and first_id == self.spot_id(start - 1) + 1
+                and step == self.range_steps[-1]
+                and origin == tuple(o + d for o, d in zip(self.location_of(start - 1), step))):
+            self.range_starts.append(start)
+            self.range_ids.append(first_id)
+            self.range_origins.append(origin)
+            self.range_steps.append(step)
+        self.occupied.extend(bytes(count))
+        self.ev_supported.extend(bytes([1 if ev_supported else 0]) * count)
+        self.type_codes.extend(bytes([code]) * count)
+        self.queued.extend(b"\x01" * count)
+        # reversed so the lowest positions are handed out first
+        self.free_stacks[code].extend(range(start + count - 1, start - 1, -1))
+        was_full = not self.free_counts[code]
+        self.free_counts[code] += count
+        self._count(vehicle_type_supported, ev_supported, count, count)
+        if self.building and self.position is not None:
+            if was_full and count:
+                self.building.floor_has_free(self, vehicle_type_supported)
+            self.building.layout_changed()
+        return first_id
+
+    def get_spot(self, spot_id):
+        i = bisect.bisect_right(self.range_ids, spot_id) - 1
+        if i < 0:
+            raise IndexError(spot_id)
+        position = self.range_starts[i] + spot_id - self.range_ids[i]
+        end = self.range_starts[i + 1] if i + 1 < len(self.range_starts) else len(self.occupied)
+        if position >= end:
+            raise IndexError(spot_id)
+        return self.spots[position]
+
+    def spot_id(self, position):
+        i = bisect.bisect_right(self.range_starts, position) - 1
+        return self.range_ids[i] + position - self.range_starts[i]
+
+    def location_of(self, position):
+        i = bisect.bisect_right(self.range_starts, position) - 1
+        offset = position - self.range_starts[i]
+        return tuple(o + offset * d for o, d in zip(self.range_origins[i], self.range_steps[i]))
+
+    def get_available_spots(self, vehicle_type):
+        return [spot for spot in self.spots if spot.is_available_for(vehicle_type)]
+
+    def free_vehicle_types(self):
+        return [self.vehicle_types[code] for code, count in self.free_counts.items() if count]
+
+    def find_free_spot(self, vehicle_type, accept=None):
+        code = self._code_of(vehicle_type)
+        if code is None or not self.free_counts[code]:
+            return None
+        stack = self.free_stacks[code]
+        while self.occupied[stack[-1]]:
+            # taken directly through a view; drop the stale entry
+            self.queued[stack.pop()] = 0
+        if accept is None:
+            return SpotView(self, stack[-1])
+        for i in range(len(stack) - 1, -1, -1):
+            if not self.occupied[stack[i]]:
+                spot = SpotView(self, stack[i])
+                if accept(spot):
+                    return spot
+        return None
+
+    def assign(self, position, vehicle):
+        self.vehicles[position] = vehicle
+        if self.occupied[position]:
+            return
+        self.occupied[position] = 1
+        code = self.type_codes[position]
+        self.free_counts[code] -= 1
+        self._count(self.vehicle_types[code], bool(self.ev_supported[position]), -1)
+        if not self.free_counts[code] and self.building and self.position is not None:
+            self.building.floor_is_full(self, self.vehicle_types[code])
+
+    def release(self, position):
+        self.vehicles.pop(position, None)
+        if not self.occupied[position]:
+            return
+        self.occupied[position] = 0
+        code = self.type_codes[position]
+        if not self.queued[position]:
+            self.queued[position] = 1
+            self.free_stacks[code].append(position)
+        self.free_counts[code] += 1
+        self._count(self.vehicle_types[code], bool(self.ev_supported[position]), 1)
+        if self.free_counts[code] == 1 and self.building and self.position is not None:
+            self.building.floor_has_free(self, self.vehicle_types[code])
+
+    def _count(self, vehicle_type, ev_supported, free_delta, total_delta=0):
+        key = (vehicle_type, bool(ev_supported))
+        self.occupancy.update(key, free_delta, total_delta)
+        if self.building and self.position is not None:
+            self.building.occupancy_changed(self, key, free_delta, total_delta)
+
+    def _code_of(self, vehicle_type):
+        try:
+            return self.vehicle_types.index(vehicle_type)
+        except ValueError:
+            return None
+
+    def _type_code(self, vehicle_type):
+        code = self._code_of(vehicle_type)
+        if code is None:
+            code = len(self.vehicle_types)
+            self.vehicle_types.append(vehicle_type)
+            self.free_stacks[code] = array("I")
+            self.free_counts[code] = 0
+        return code
@@ -1,4 +1,6 @@
 class Entrance:
-    def __init__(self, entrance_id, name):
+    def __init__(self, entrance_id, name, location=None):
         self.id = entrance_id
         self.name = name
+        # coordinates used by the nearest-gate allocation strategies
+        self.location = location
@@ -1,4 +1,6 @@
 class Exit:
-    def __init__(self, exit_id, name):
+    def __init__(self, exit_id, name, location=None):
         self.id = exit_id
         self.name = name
+        # coordinates used by the nearest-gate allocation strategies
+        self.location = location
@@ -1,4 +1,5 @@
-from datetime import datetime
+
+from datetime import datetime, time, timedelta
 import math
 
 class FeePolicy:
@@ -8,14 +9,24 @@ class FeePolicy:
     SPECIAL_DATES = {"2025-12-25": 150}
 
     @staticmethod
-    def calculate_fee(start_time, end_time):
-        hours = (end_time - start_time).total_seconds() / 3600
-        today = datetime.now().date().isoformat()
-        if today in FeePolicy.SPECIAL_DATES:
-            rate = FeePolicy.SPECIAL_DATES[today]
-        elif datetime.now().weekday() >= 5:
-            rate = FeePolicy.WEEKEND_RATE
-        else:
-            rate = FeePolicy.WEEKDAY_RATE
+    def rate_for_date(day):
+        if day.isoformat() in FeePolicy.SPECIAL_DATES:
+            return FeePolicy.SPECIAL_DATES[day.isoformat()]
+        elif day.weekday() >= 5:
+            return FeePolicy.WEEKEND_RATE
+        return FeePolicy.WEEKDAY_RATE
 
-        return math.ceil(hours) * rate
+    @staticmethod
+    def calculate_fee(start_time, end_time):
+        # Every started hour is billed at the rate of the day it starts on,
+        # so stays crossing midnight or spanning several days are split.
+        hours = -((start_time - end_time) // timedelta(hours=1))
+        fee = 0
+        block_start = start_time
+        while hours > 0:
+            midnight = datetime.combine(block_start.date() + timedelta(days=1), time.min, block_start.tzinfo)
+            blocks = min(hours, math.ceil((midnight - block_start) / timedelta(hours=1)))
+            fee += blocks * FeePolicy.rate_for_date(block_start.date())
+            hours -= blocks
+            block_start += timedelta(hours=blocks)
+        return fee
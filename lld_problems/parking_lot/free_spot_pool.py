@@ -0,0 +1,52 @@
+import heapq
+
+
+class FreeSpotPool:
+    """Min-heap of free items (spots or floors) ordered by a priority key.
+
+    Removal is lazy: `discard` only forgets the item id and the stale heap
+    entry is dropped once it reaches the top, so add, discard and peek all
+    stay O(log n) without rebuilding the heap.
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._free = set()
+        self._queued = set()
+
+    def add(self, key, item):
+        self._free.add(item.id)
+        if item.id not in self._queued:
+            self._queued.add(item.id)
+            heapq.heappush(self._heap, (key, item.id, item))
+
+    def discard(self, item):
+        self._free.discard(item.id)
+
+    def peek(self):
+        heap = self._heap
+        while heap and heap[0][1] not in self._free:
+            _, item_id, _ = heapq.heappop(heap)
+            self._queued.discard(item_id)
+        return heap[0][2] if heap else None
+
+    def find(self, accept):
+        """Best free item for which `accept(item)` is true, skipping the rest.
+
+        Costs O(k log n) for k rejected items, which are pushed back.
+        """
+        skipped = []
+        while True:
+            item = self.peek()
+            if item is None or accept(item):
+                break
+            skipped.append(heapq.heappop(self._heap))
+        for entry in skipped:
+            heapq.heappush(self._heap, entry)
+        return item
+
+    def __contains__(self, item):
+        return item.id in self._free
+
+    def __len__(self):
+        return len(self._free)
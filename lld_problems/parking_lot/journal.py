@@ -0,0 +1,186 @@
+import json
+import os
+from datetime import datetime
+from threading import Lock
+
+from atomic_counter import AtomicCounter
+from ticket import ParkingTicket
+from vehicle import Vehicle, VehicleType
+
+
+class ParkingJournal:
+    """Write-ahead log and snapshots for a ParkingLot's active tickets.
+
+    Every park and unpark is appended to the current log segment and
+    fsynced once per `fsync_every` records (or on `sync`). After
+    `snapshot_every` records the active tickets are written to a snapshot,
+    a new segment is started and older segments are deleted, so recovery
+    only replays the log written since the last snapshot.
+
+    Spots are stored by ID, so recovery expects the lot layout to be built
+    in the same order as before the restart.
+    """
+
+    SNAPSHOT = "snapshot.json"
+
+    def __init__(self, directory, fsync_every=64, snapshot_every=10_000):
+        self.directory = directory
+        self.fsync_every = fsync_every
+        self.snapshot_every = snapshot_every
+        self.lot = None
+        self.segment = 0
+        self.log_file = None
+        self.unsynced = 0
+        self.records_since_snapshot = 0
+        self.lock = Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def attach(self, lot):
+        """Recover `lot` from disk and start logging its changes."""
+        self.lot = lot
+        self.recover(lot)
+        lot.journal = self
+
+    def record_park(self, ticket):
+        self._append({
+            "op": "park",
+            "ticket_id": ticket.ticket_id,
+            "plate": ticket.vehicle.license_plate,
+            "vehicle_type": ticket.vehicle.vehicle_type.name,
+            "spot_id": ticket.spot.id,
+            "entry_time": ticket.entry_time.isoformat(),
+        })
+
+    def record_unpark(self, ticket):
+        self._append({"op": "unpark", "ticket_id": ticket.ticket_id})
+
+    def sync(self):
+        with self.lock:
+            self._sync()
+
+    def close(self):
+        with self.lock:
+            if self.log_file:
+                self._sync()
+                self.log_file.close()
+                self.log_file = None
+
+    def snapshot(self):
+        with self.lock:
+            self._snapshot()
+
+    def recover(self, lot):
+        spots = {spot.id: spot for building in lot.buildings
+                 for floor in building.floors for spot in floor.spots}
+        next_ticket_id = 1
+        path = os.path.join(self.directory, self.SNAPSHOT)
+        if os.path.exists(path):
+            with open(path) as f:
+                state = json.load(f)
+            self.segment = state["segment"]
+            next_ticket_id = state["ticket_counter"]
+            for record in state["tickets"]:
+                self._replay_park(lot, spots, record)
+
+        # Records can race with a snapshot and land on both sides of it,
+        # so replay is idempotent: known tickets are skipped.
+        for segment in self._segments():
+            if segment < self.segment:
+                continue
+            for record in self._read_segment(segment):
+                if record["op"] == "park":
+                    self._replay_park(lot, spots, record)
+                    next_ticket_id = max(next_ticket_id, record["ticket_id"] + 1)
+                else:
+                    ticket = lot.active_tickets.pop(record["ticket_id"], None)
+                    if ticket:
+                        lot.ticket_index.remove(ticket)
+                        ticket.spot.remove_vehicle()
+                self.records_since_snapshot += 1
+            self.segment = segment
+        lot.ticket_counter = AtomicCounter(max(next_ticket_id, lot.ticket_counter.value))
+        self._open_segment()
+
+    def _append(self, record):
+        with self.lock:
+            self.log_file.write(json.dumps(record) + "\n")
+            self.unsynced += 1
+            self.records_since_snapshot += 1
+            if self.unsynced >= self.fsync_every:
+                self._sync()
+            if self.records_since_snapshot >= self.snapshot_every:
+                self._snapshot()
+
+    def _sync(self):
+        self.log_file.flush()
+        os.fsync(self.log_file.fileno())
+        self.unsynced = 0
+
+    def _snapshot(self):
+        # Roll to a fresh segment first; the snapshot covers everything
+        # before it, and replay starts from the segment it names.
+        self._sync()
+        self.log_file.close()
+        self.segment += 1
+        self._open_segment()
+        state = {
+            "segment": self.segment,
+            "ticket_counter": self.lot.ticket_counter.value,
+            "tickets": [{
+                "ticket_id": t.ticket_id,
+                "plate": t.vehicle.license_plate,
+                "vehicle_type": t.vehicle.vehicle_type.name,
+                "spot_id": t.spot.id,
+                "entry_time": t.entry_time.isoformat(),
+            } for t in list(self.lot.active_tickets.values())],
+        }
+        path = os.path.join(self.directory, self.SNAPSHOT)
+        with open(path + ".tmp", "w") as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(path + ".tmp", path)
+        for segment in self._segments():
+            if segment < self.segment:
+                os.remove(self._segment_path(segment))
+        self.records_since_snapshot = 0
+
+    def _open_segment(self):
+        self.log_file = open(self._segment_path(self.segment), "a")
+
+    def _segment_path(self, segment):
+        return os.path.join(self.directory, f"wal-{segment:08d}.log")
+
+    def _segments(self):
+        return sorted(int(name[4:12]) for name in os.listdir(self.directory)
+                      if name.startswith("wal-") and name.endswith(".log"))
+
+    def _read_segment(self, segment):
+        path = self._segment_path(segment)
+        end = 0
+        with open(path, "rb") as f:
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("unterminated record")
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                end += len(line)
+                yield record
+            else:
+                return
+        # Torn write at the tail of the log after a crash. Cut it off, or the
+        # next record appended after the restart would be glued onto it.
+        with open(path, "r+b") as f:
+            f.truncate(end)
+
+    def _replay_park(self, lot, spots, record):
+        if record["ticket_id"] in lot.active_tickets:
+            return
+        vehicle = Vehicle(record["plate"], VehicleType[record["vehicle_type"]])
+        spot = spots[record["spot_id"]]
+        spot.assign_vehicle(vehicle)
+        ticket = ParkingTicket(record["ticket_id"], vehicle, spot, datetime.fromisoformat(record["entry_time"]))
+        lot.active_tickets[ticket.ticket_id] = ticket
+        lot.ticket_index.add(ticket)
@@ -53,7 +53,7 @@ pk.add_entrance(entrance)
 pk.add_exit(exit_gate)
 
 vehicle = Vehicle("KA-01-AA-1234", "Car")
-ticket = pk.park_vehicle(vehicle)
+ticket = pk.park_vehicle(vehicle, entrance)
 
 # Unpark
 if ticket:
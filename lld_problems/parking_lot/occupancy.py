@@ -0,0 +1,84 @@
+class OccupancyCounter:
+    """Free and total spot counts keyed by (vehicle type, EV support).
+
+    Floors, buildings and the lot each keep one and update it as spots are
+    added, assigned and released, so every query reads at most one entry
+    per vehicle type and EV flag, whatever the number of spots.
+    """
+
+    def __init__(self):
+        self.free = {}
+        self.total = {}
+
+    def update(self, key, free_delta, total_delta=0):
+        self.free[key] = self.free.get(key, 0) + free_delta
+        if total_delta:
+            self.total[key] = self.total.get(key, 0) + total_delta
+
+    def free_count(self, vehicle_type=None, ev_supported=None):
+        return self._sum(self.free, vehicle_type, ev_supported)
+
+    def total_count(self, vehicle_type=None, ev_supported=None):
+        return self._sum(self.total, vehicle_type, ev_supported)
+
+    def occupied_count(self, vehicle_type=None, ev_supported=None):
+        return self.total_count(vehicle_type, ev_supported) - self.free_count(vehicle_type, ev_supported)
+
+    @staticmethod
+    def _sum(counts, vehicle_type, ev_supported):
+        return sum(count for (key_type, key_ev), count in list(counts.items())
+                   if (vehicle_type is None or key_type == vehicle_type)
+                   and (ev_supported is None or key_ev == ev_supported))
+
+
+class OccupancyBoard(OccupancyCounter):
+    """Lot-wide counters plus the query and subscription API for display boards.
+
+    Subscribers are indexed by the floor or building they watch, and are
+    called with the new free count right after a spot in their scope
+    changes. Callbacks run on the gate thread that parked or unparked, so
+    they should hand off anything slow.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.subscriptions = {}  # floor id, building id or None -> [subscription]
+
+    def free_spots(self, building=None, floor=None, vehicle_type=None, ev_supported=None):
+        return self._counter_for(building, floor).free_count(vehicle_type, ev_supported)
+
+    def total_spots(self, building=None, floor=None, vehicle_type=None, ev_supported=None):
+        return self._counter_for(building, floor).total_count(vehicle_type, ev_supported)
+
+    def subscribe(self, callback, building=None, floor=None, vehicle_type=None, ev_supported=None):
+        """Call `callback(free_count)` whenever the watched count changes."""
+        scope = floor or building
+        subscription = (callback, self._counter_for(building, floor), vehicle_type, ev_supported)
+        self.subscriptions.setdefault(scope.id if scope else None, []).append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        for subscriptions in self.subscriptions.values():
+            if subscription in subscriptions:
+                subscriptions.remove(subscription)
+
+    def changed(self, building, floor, key, free_delta, total_delta=0):
+        self.update(key, free_delta, total_delta)
+        if floor is not None:
+            self._notify(floor.id, key)
+        if building is not None:
+            self._notify(building.id, key)
+        self._notify(None, key)
+
+    def _notify(self, scope_id, key):
+        for callback, counter, vehicle_type, ev_supported in self.subscriptions.get(scope_id, ()):
+            if (vehicle_type is None or key[0] == vehicle_type) and \
+                    (ev_supported is None or key[1] == ev_supported):
+                callback(counter.free_count(vehicle_type, ev_supported))
+
+    def _counter_for(self, building, floor):
+        if floor is not None:
+            return floor.occupancy
+        if building is not None:
+            return building.occupancy
+        return self
@@ -1,14 +1,62 @@
+from free_spot_pool import FreeSpotPool
+from occupancy import OccupancyCounter
+
 
 class ParkingFloor:
     def __init__(self, floor_num, building):
         self.id = id(self)
         self.floor_num = floor_num
-        # self.building = building
+        self.building = building
+        # set by ParkingBuilding.add_floor
+        self.position = None
         self.spots = []
+        # vehicle type -> pool of free spots, ordered by position on the floor
+        self.free_spots = {}
+        self.occupancy = OccupancyCounter()
     
     def add_spots(self, spot):
+        spot.floor = self
+        spot.position = len(self.spots)
         self.spots.append(spot)
+        self._count(spot, 0, 1)
+        if not spot.is_occupied:
+            self.mark_free(spot)
+        if self.building and self.position is not None:
+            self.building.layout_changed()
 
     def get_available_spots(self, vehicle_type):
         return [spot for spot in self.spots if spot.is_available_for(vehicle_type)]
 
+    def free_vehicle_types(self):
+        return [vehicle_type for vehicle_type, pool in self.free_spots.items() if pool]
+
+    def find_free_spot(self, vehicle_type, accept=None):
+        pool = self.free_spots.get(vehicle_type)
+        if not pool:
+            return None
+        return pool.find(accept) if accept else pool.peek()
+
+    def mark_free(self, spot):
+        vehicle_type = spot.vehicle_type_supported
+        pool = self.free_spots.setdefault(vehicle_type, FreeSpotPool())
+        was_full = not pool
+        pool.add(spot.position, spot)
+        self._count(spot, 1)
+        if was_full and self.building and self.position is not None:
+            self.building.floor_has_free(self, vehicle_type)
+
+    def mark_occupied(self, spot):
+        vehicle_type = spot.vehicle_type_supported
+        pool = self.free_spots.get(vehicle_type)
+        if pool is None:
+            return
+        pool.discard(spot)
+        self._count(spot, -1)
+        if not pool and self.building and self.position is not None:
+            self.building.floor_is_full(self, vehicle_type)
+
+    def _count(self, spot, free_delta, total_delta=0):
+        key = (spot.vehicle_type_supported, bool(spot.ev_supported))
+        self.occupancy.update(key, free_delta, total_delta)
+        if self.building and self.position is not None:
+            self.building.occupancy_changed(self, key, free_delta, total_delta)
@@ -1,26 +1,40 @@
+from atomic_counter import AtomicCounter
+
+# shared by every spot implementation so IDs stay unique and stable
+spot_ids = AtomicCounter(1)
+
 
 class ParkingSpot:
-    def __init__(self, vehicle_type_supported, ev_supported=False):
-        self.id = id(self)
+    def __init__(self, vehicle_type_supported, ev_supported=False, location=None):
+        self.id = spot_ids.next()
         self.vehicle_type_supported = vehicle_type_supported
         self.is_occupied = False
         self.ev_supported = ev_supported
-        # self.floor = floor
+        self.location = location
+        # set by ParkingFloor.add_spots
+        self.floor = None
+        self.position = None
         self.vehicle = None
 
     def is_available_for(self, vehicle_type):
         return not self.is_occupied and self.vehicle_type_supported == vehicle_type
     
-    # def get_floor_number(self):
-    #     return self.floor.floor_num
+    def get_floor_number(self):
+        return self.floor.floor_num
 
-    # def get_building(self):
-    #     return self.floor.building
+    def get_building(self):
+        return self.floor.building
     
     def assign_vehicle(self, vehicle):
+        was_free = not self.is_occupied
         self.is_occupied = True
         self.vehicle = vehicle
+        if self.floor and was_free:
+            self.floor.mark_occupied(self)
     
     def remove_vehicle(self):
+        was_occupied = self.is_occupied
         self.is_occupied = False
         self.vehicle = None
+        if self.floor and was_occupied:
+            self.floor.mark_free(self)
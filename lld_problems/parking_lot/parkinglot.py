@@ -1,7 +1,11 @@
+from datetime import datetime
 from threading import Lock
+from atomic_counter import AtomicCounter
 from strategy import SpotAllocationStrategy
 from ticket import ParkingTicket
+from ticket_index import TicketIndex
 from fee_policy import FeePolicy
+from occupancy import OccupancyBoard
 
 class ParkingLot:
     instance = None
@@ -15,8 +19,21 @@ class ParkingLot:
         self.entrances = []
         self.exits = []
         self.strategy = SpotAllocationStrategy()
-        self.ticket_counter = 1
+        self.ticket_counter = AtomicCounter(1)
         self.active_tickets = {}
+        # IDs of tickets an exit is taking payment for
+        self.settling = set()
+        self.ticket_index = TicketIndex()
+        self.occupancy = OccupancyBoard()
+        # one lock per vehicle type: every free-spot pool is keyed by vehicle
+        # type, so gates parking different types never contend
+        self.spot_locks = {}
+        self.reservations = None
+        # swapped for a virtual clock by the simulator
+        self.clock = datetime.now
+        self.verbose = True
+        # set by ParkingJournal.attach
+        self.journal = None
         ParkingLot._initialized = True
 
 
@@ -30,7 +47,10 @@ class ParkingLot:
         return cls.instance
 
     def add_building(self, building):
+        building.lot = self
         self.buildings.append(building)
+        for key, total in building.occupancy.total.items():
+            self.occupancy.changed(building, None, key, building.occupancy.free.get(key, 0), total)
     
     def add_entrance(self, entrance):
         self.entrances.append(entrance)
@@ -38,29 +58,95 @@ class ParkingLot:
     def add_exit(self, exit):
         self.exits.append(exit)
 
-    def park_vehicle(self, vehicle):
-        spot = self.strategy.find_available_spot(self.buildings, vehicle.vehicle_type)
+    def set_strategy(self, strategy):
+        strategy.reservations = self.reservations
+        self.strategy = strategy
+
+    def set_reservations(self, reservations):
+        self.reservations = reservations
+        self.strategy.reservations = reservations
+
+    def park_vehicle(self, vehicle, entrance=None):
+        reservation = None
+        if self.reservations:
+            reservation = self.reservations.claim(vehicle.license_plate, vehicle.vehicle_type)
+        with self._lock_for(vehicle.vehicle_type):
+            if reservation and not reservation.spot.is_occupied:
+                spot = reservation.spot
+            else:
+                spot = self.strategy.find_available_spot(self.buildings, vehicle.vehicle_type, entrance)
+            if spot:
+                spot.assign_vehicle(vehicle)
+                ticket = ParkingTicket(self.ticket_counter.next(), vehicle, spot, self.clock())
+                self.active_tickets[ticket.ticket_id] = ticket
+                self.ticket_index.add(ticket)
+                # logged under the same lock as the spot change, so a later
+                # park into this spot can't reach the log first
+                if self.journal:
+                    self.journal.record_park(ticket)
         if not spot:
-            print("No spot available")
+            self._log("No spot available")
             return
-        spot.assign_vehicle(vehicle)
-        ticket = ParkingTicket(self.ticket_counter, vehicle, spot)
-        self.ticket_counter += 1
-        self.active_tickets[ticket.ticket_id] = ticket
-        print(f"Vehicle parked. Ticket ID: {ticket.ticket_id}")
+        self._log(f"Vehicle parked. Ticket ID: {ticket.ticket_id}")
         return ticket
 
     def unpark_vehicle(self, ticket_id, payment_method):
         ticket = self.active_tickets.get(ticket_id)
         if not ticket:
-            print("Invalid ticket ID")
+            self._log("Invalid ticket ID")
             return
-        ticket.close_ticket()
-        fee = FeePolicy.calculate_fee(ticket.entry_time, ticket.exit_time)
-        payment_method.pay(fee)
-        ticket.spot.remove_vehicle()
-        ticket.fee_paid = True
-        del self.active_tickets[ticket_id]
-        print(f"Vehicle unparked. Total Fee: ₹{fee}")
+        lock = self._lock_for(ticket.spot.vehicle_type_supported)
+        # claiming the ticket stops two exits from both settling it; it
+        # stays active and indexed until the payment goes through
+        with lock:
+            if self.active_tickets.get(ticket_id) is not ticket or ticket_id in self.settling:
+                ticket = None
+            else:
+                self.settling.add(ticket_id)
+        if not ticket:
+            self._log("Invalid ticket ID")
+            return
+        try:
+            ticket.close_ticket(self.clock())
+            fee = FeePolicy.calculate_fee(ticket.entry_time, ticket.exit_time)
+            payment_method.pay(fee)
+        except Exception:
+            with lock:
+                self.settling.discard(ticket_id)
+            raise
+        with lock:
+            self.settling.discard(ticket_id)
+            del self.active_tickets[ticket_id]
+            self.ticket_index.remove(ticket)
+            ticket.spot.remove_vehicle()
+            # after the change, so a snapshot the record triggers sees it
+            if self.journal:
+                self.journal.record_unpark(ticket)
+            ticket.fee_paid = True
+            # last: the strategy's pools only speed up the next search, the
+            # spot is already free in the building's own pools
+            self.strategy.release_spot(ticket.spot)
+        self._log(f"Vehicle unparked. Total Fee: ₹{fee}")
+        return fee
+
+    def find_ticket_by_plate(self, license_plate):
+        return self.ticket_index.find_by_plate(license_plate)
+
+    def find_ticket_by_spot(self, spot):
+        return self.ticket_index.find_by_spot(spot)
+
+    def search_plates(self, prefix, limit=20):
+        return self.ticket_index.search_plates(prefix, limit)
+
+    def _lock_for(self, vehicle_type):
+        lock = self.spot_locks.get(vehicle_type)
+        if lock is None:
+            with ParkingLot.lock:
+                lock = self.spot_locks.setdefault(vehicle_type, Lock())
+        return lock
+
+    def _log(self, message):
+        if self.verbose:
+            print(message)
 
 
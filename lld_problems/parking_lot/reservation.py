@@ -0,0 +1,157 @@
+import bisect
+from datetime import datetime, timedelta
+from threading import Lock
+
+from atomic_counter import AtomicCounter
+
+
+class Reservation:
+    def __init__(self, reservation_id, spot, license_plate, start, end):
+        self.id = reservation_id
+        self.spot = spot
+        self.license_plate = license_plate
+        self.start = start
+        self.end = end
+
+
+class SpotSchedule:
+    """Non-overlapping reservations of one spot, sorted by start time.
+
+    Because the intervals never overlap, their ends are sorted too, so a
+    conflict check only has to look at the neighbour found by bisecting
+    the start times: O(log n) per check.
+    """
+
+    def __init__(self):
+        self.starts = []
+        self.reservations = []
+
+    def conflicts(self, start, end):
+        i = bisect.bisect_left(self.starts, end)
+        return i > 0 and self.reservations[i - 1].end > start
+
+    def add(self, reservation):
+        i = bisect.bisect_left(self.starts, reservation.start)
+        self.starts.insert(i, reservation.start)
+        self.reservations.insert(i, reservation)
+
+    def remove(self, reservation):
+        i = bisect.bisect_left(self.starts, reservation.start)
+        if i < len(self.reservations) and self.reservations[i] is reservation:
+            del self.starts[i]
+            del self.reservations[i]
+
+    def prune(self, now):
+        i = 0
+        while i < len(self.reservations) and self.reservations[i].end <= now:
+            i += 1
+        if i:
+            del self.starts[:i]
+            del self.reservations[:i]
+
+    def __len__(self):
+        return len(self.reservations)
+
+
+class ReservationBook:
+    """Advance bookings for parking spots.
+
+    Walk-ins may not take a spot that is booked within the next
+    `walk_in_horizon`; the allocation strategy asks `is_blocked` before
+    handing a spot out. A booked vehicle that arrives up to that horizon
+    early is parked in its own spot by ParkingLot.park_vehicle.
+    """
+
+    def __init__(self, walk_in_horizon=timedelta(minutes=30), clock=datetime.now):
+        self.walk_in_horizon = walk_in_horizon
+        self.clock = clock
+        self.schedules = {}  # spot id -> SpotSchedule
+        self.by_plate = {}  # license plate -> [Reservation]
+        # (vehicle type, EV required) -> spots in lot order; rebuilt when
+        # the layout changes
+        self.candidates = {}
+        self.layout = None
+        self.reservation_ids = AtomicCounter(1)
+        self.lock = Lock()
+
+    def reserve(self, buildings, vehicle_type, license_plate, start, end, ev_required=False):
+        """Book the first spot of `vehicle_type` free for [start, end), or return None."""
+        if end <= start:
+            raise ValueError("Reservation must end after it starts")
+        for spot in self._candidates(buildings, vehicle_type, ev_required):
+            reservation = self.reserve_spot(spot, license_plate, start, end)
+            if reservation:
+                return reservation
+        return None
+
+    def reserve_spot(self, spot, license_plate, start, end):
+        with self.lock:
+            schedule = self.schedules.setdefault(spot.id, SpotSchedule())
+            if schedule.conflicts(start, end):
+                return None
+            reservation = Reservation(self.reservation_ids.next(), spot, license_plate, start, end)
+            schedule.add(reservation)
+            self.by_plate.setdefault(license_plate, []).append(reservation)
+            return reservation
+
+    def cancel(self, reservation):
+        with self.lock:
+            self._cancel(reservation)
+
+    def is_available(self, spot, start, end):
+        schedule = self.schedules.get(spot.id)
+        return not schedule or not schedule.conflicts(start, end)
+
+    def is_blocked(self, spot, now=None):
+        """True if a walk-in parking now would run into a booking."""
+        schedule = self.schedules.get(spot.id)
+        if not schedule:
+            return False
+        now = now or self.clock()
+        return schedule.conflicts(now, now + self.walk_in_horizon)
+
+    def claim(self, license_plate, vehicle_type, now=None):
+        """Take the booking `license_plate` holds for now, if any."""
+        now = now or self.clock()
+        with self.lock:
+            for reservation in self.by_plate.get(license_plate, ()):
+                if reservation.spot.vehicle_type_supported != vehicle_type:
+                    continue
+                if reservation.start - self.walk_in_horizon <= now < reservation.end:
+                    break
+            else:
+                return None
+            self._cancel(reservation)
+        return reservation
+
+    def prune(self, now=None):
+        """Drop bookings that have already ended."""
+        now = now or self.clock()
+        with self.lock:
+            for schedule in self.schedules.values():
+                schedule.prune(now)
+            for plate, bookings in list(self.by_plate.items()):
+                bookings[:] = [r for r in bookings if r.end > now]
+                if not bookings:
+                    del self.by_plate[plate]
+
+    def _cancel(self, reservation):
+        schedule = self.schedules.get(reservation.spot.id)
+        if schedule:
+            schedule.remove(reservation)
+        bookings = self.by_plate.get(reservation.license_plate, [])
+        if reservation in bookings:
+            bookings.remove(reservation)
+
+    def _candidates(self, buildings, vehicle_type, ev_required):
+        with self.lock:
+            layout = (len(buildings), sum(building.layout_version for building in buildings))
+            if layout != self.layout:
+                self.candidates.clear()
+                self.layout = layout
+            spots = self.candidates.get((vehicle_type, ev_required))
+            if spots is None:
+                spots = [spot for building in buildings for floor in building.floors for spot in floor.spots
+                         if spot.vehicle_type_supported == vehicle_type and (spot.ev_supported or not ev_required)]
+                self.candidates[(vehicle_type, ev_required)] = spots
+            return spots
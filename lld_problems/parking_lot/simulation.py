@@ -0,0 +1,174 @@
+import heapq
+import math
+import random
+import time
+from datetime import datetime, timedelta
+
+from payment import Payment
+from vehicle import Vehicle, VehicleType
+
+
+ARRIVAL, DEPARTURE, SAMPLE = 0, 1, 2
+
+
+def poisson_arrivals(per_hour):
+    """Exponential gaps between arrivals, `per_hour` on average."""
+    rate = per_hour / 3600
+    return lambda rng, now: rng.expovariate(rate)
+
+
+def lognormal_stay(median_hours, sigma=0.8):
+    mu = math.log(median_hours * 3600)
+    return lambda rng, vehicle_type: rng.lognormvariate(mu, sigma)
+
+
+class SimulatedPayment(Payment):
+    def pay(self, amount):
+        pass
+
+
+class Sample:
+    def __init__(self, time, occupied, arrivals, rejections, revenue):
+        self.time = time
+        self.occupied = occupied
+        self.arrivals = arrivals
+        self.rejections = rejections
+        self.revenue = revenue
+
+    @property
+    def rejection_rate(self):
+        return self.rejections / self.arrivals if self.arrivals else 0.0
+
+
+class ParkingSimulation:
+    """Discrete-event simulation of traffic through a ParkingLot.
+
+    Arrivals, departures and metric samples sit in one event heap ordered
+    by virtual time; the lot's clock is pointed at that virtual time, so
+    tickets and FeePolicy see simulated timestamps and a week of traffic
+    runs as fast as the events can be processed. Printing is switched
+    off for the run.
+
+    `interarrival(rng, now)` returns seconds until the next arrival and
+    `stay_length(rng, vehicle_type)` how long a vehicle stays; both can be
+    swapped for any distribution. Each sample in `samples` covers one
+    `sample_every` interval.
+    """
+
+    def __init__(self, lot, start=datetime(2025, 1, 6), interarrival=poisson_arrivals(120),
+                 stay_length=lognormal_stay(2), vehicle_mix=None,
+                 sample_every=timedelta(hours=1), seed=0):
+        self.lot = lot
+        self.start = start
+        self.interarrival = interarrival
+        self.stay_length = stay_length
+        self.vehicle_mix = vehicle_mix or {VehicleType.Car: 0.8, VehicleType.BIKE: 0.2}
+        self.sample_every = sample_every.total_seconds()
+        self.rng = random.Random(seed)
+        self.now = 0.0
+        self.events = []
+        self.sequence = 0
+        self.payment = SimulatedPayment()
+        self.samples = []
+        self.events_processed = 0
+        self.arrivals = self.rejections = 0
+        self.revenue = 0
+        self._window_arrivals = self._window_rejections = self._window_revenue = 0
+        self._types = list(self.vehicle_mix)
+        self._weights = list(self.vehicle_mix.values())
+
+    def clock(self):
+        return self.start + timedelta(seconds=self.now)
+
+    def schedule(self, delay, kind, payload=None):
+        self.sequence += 1
+        heapq.heappush(self.events, (self.now + delay, self.sequence, kind, payload))
+
+    def run(self, duration):
+        """Advance the simulation by `duration`; later calls carry on from here."""
+        end = self.now + duration.total_seconds()
+        saved = self.lot.clock, self.lot.verbose
+        self.lot.clock, self.lot.verbose = self.clock, False
+        if self.lot.reservations:
+            saved_reservation_clock, self.lot.reservations.clock = self.lot.reservations.clock, self.clock
+        try:
+            if not self.events:
+                self.schedule(self.interarrival(self.rng, self.now), ARRIVAL)
+                self.schedule(self.sample_every, SAMPLE)
+            while self.events and self.events[0][0] <= end:
+                self.now, _, kind, payload = heapq.heappop(self.events)
+                self.events_processed += 1
+                if kind == ARRIVAL:
+                    self._arrive()
+                elif kind == DEPARTURE:
+                    self._depart(payload)
+                else:
+                    self._sample()
+            self.now = end
+        finally:
+            self.lot.clock, self.lot.verbose = saved
+            if self.lot.reservations:
+                self.lot.reservations.clock = saved_reservation_clock
+        return self
+
+    def _arrive(self):
+        self.schedule(self.interarrival(self.rng, self.now), ARRIVAL)
+        self.arrivals += 1
+        self._window_arrivals += 1
+        vehicle_type = self.rng.choices(self._types, self._weights)[0]
+        vehicle = Vehicle(f"SIM-{self.arrivals}", vehicle_type)
+        entrance = self.rng.choice(self.lot.entrances) if self.lot.entrances else None
+        ticket = self.lot.park_vehicle(vehicle, entrance)
+        if ticket is None:
+            self.rejections += 1
+            self._window_rejections += 1
+            return
+        self.schedule(self.stay_length(self.rng, vehicle_type), DEPARTURE, ticket.ticket_id)
+
+    def _depart(self, ticket_id):
+        fee = self.lot.unpark_vehicle(ticket_id, self.payment)
+        if fee:
+            self.revenue += fee
+            self._window_revenue += fee
+
+    def _sample(self):
+        self.schedule(self.sample_every, SAMPLE)
+        self.samples.append(Sample(self.clock(), self.lot.occupancy.occupied_count(),
+                                   self._window_arrivals, self._window_rejections, self._window_revenue))
+        self._window_arrivals = self._window_rejections = self._window_revenue = 0
+
+    def report(self):
+        rate = self.rejections / self.arrivals if self.arrivals else 0.0
+        peak = max(self.samples, key=lambda s: s.occupied, default=None)
+        print(f"Simulated {self.clock() - self.start} with {self.events_processed} events")
+        print(f"Arrivals: {self.arrivals}  Rejected: {self.rejections} ({rate:.1%})  Revenue: ₹{self.revenue}")
+        if peak:
+            print(f"Peak occupancy: {peak.occupied} at {peak.time}")
+
+
+if __name__ == "__main__":
+    from building import ParkingBuilding
+    from entrance import Entrance
+    from exit import Exit
+    from parking_floor import ParkingFloor
+    from parking_spot import ParkingSpot
+    from parkinglot import ParkingLot
+
+    lot = ParkingLot.get_instance()
+    building = ParkingBuilding(name="building1")
+    lot.add_building(building)
+    for floor_num in range(4):
+        floor = ParkingFloor(floor_num=floor_num, building=building)
+        building.add_floor(floor)
+        for i in range(100):
+            vehicle_type = VehicleType.BIKE if i % 5 == 0 else VehicleType.Car
+            floor.add_spots(ParkingSpot(vehicle_type_supported=vehicle_type, ev_supported=i % 10 == 0))
+    lot.add_entrance(Entrance(1, "Main Gate"))
+    lot.add_exit(Exit(1, "Exit A"))
+
+    simulation = ParkingSimulation(lot, interarrival=poisson_arrivals(200))
+    started = time.perf_counter()
+    simulation.run(timedelta(weeks=4))
+    elapsed = time.perf_counter() - started
+    simulation.report()
+    print(f"{simulation.events_processed / elapsed * 60:,.0f} events per wall-clock minute")
@@ -1,8 +1,152 @@
+from threading import Lock
+
+from free_spot_pool import FreeSpotPool
+
+
+def manhattan_distance(gate, spot):
+    # spots or gates without coordinates sort after every located spot
+    if gate.location is None or spot.location is None:
+        return float("inf")
+    return sum(abs(a - b) for a, b in zip(gate.location, spot.location))
+
+
 class SpotAllocationStrategy:
+    # set by ParkingLot.set_reservations
+    reservations = None
 
-    def find_available_spot(self, buildings, vehicle_type):
+    def find_available_spot(self, buildings, vehicle_type, entrance=None):
+        # Each building keeps free-spot pools per floor and vehicle type,
+        # so this is O(log n) per building instead of a scan of every spot.
+        accept = self.walk_in_filter()
         for building in buildings:
-            spots = building.get_all_spots(vehicle_type)
-            if spots:
-                return spots[0]  # Pick the first available one
+            spot = building.find_free_spot(vehicle_type, accept)
+            if spot:
+                return spot
         return None
+
+    def walk_in_filter(self):
+        """Rejects spots booked within the reservation horizon, if any."""
+        if self.reservations is None:
+            return None
+        now = self.reservations.clock()
+        return lambda spot: not self.reservations.is_blocked(spot, now)
+
+    def release_spot(self, spot):
+        """Called by ParkingLot after a spot has been freed."""
+        pass
+
+
+class NearestGateStrategy(SpotAllocationStrategy):
+    """Hands out the free spot closest to a gate.
+
+    Distances are computed once per (gate, spot) and kept in a FreeSpotPool
+    per gate and vehicle type, so the closest free spot is a heap peek
+    rather than a sort of every candidate. Subclasses decide which gate a
+    request is measured from and how far a spot is from it.
+
+    The pools are shared by every vehicle type, so one lock guards them;
+    ParkingLot's per-type locks don't.
+    """
+
+    def __init__(self, distance=manhattan_distance):
+        self.distance = distance
+        self.pools = {}  # (gate key, vehicle type) -> FreeSpotPool
+        self.distances = {}  # (gate key, spot id) -> distance
+        self.layout = None
+        self.lock = Lock()
+
+    def gate_key(self, entrance):
+        raise NotImplementedError
+
+    def distance_to(self, gate_key, spot):
+        raise NotImplementedError
+
+    def find_available_spot(self, buildings, vehicle_type, entrance=None):
+        gate_key = self.gate_key(entrance)
+        if gate_key is None:
+            return super().find_available_spot(buildings, vehicle_type)
+        accept = self.walk_in_filter()
+        with self.lock:
+            self._check_layout(buildings)
+            pool = self.pools.get((gate_key, vehicle_type))
+            if pool is None:
+                pool = self._build_pool(buildings, gate_key, vehicle_type)
+            while True:
+                spot = pool.peek()
+                # spots taken by another gate's pool are pruned lazily here
+                if spot is None or not spot.is_occupied:
+                    break
+                pool.discard(spot)
+            if spot is None or accept is None or accept(spot):
+                return spot
+            return pool.find(lambda candidate: not candidate.is_occupied and accept(candidate))
+
+    def release_spot(self, spot):
+        with self.lock:
+            for (gate_key, vehicle_type), pool in self.pools.items():
+                if vehicle_type != spot.vehicle_type_supported:
+                    continue
+                # a spot added after this pool was built (and parked in
+                # through a reservation, which skips the strategy) has no
+                # distance yet; the pool itself is rebuilt on the next find
+                key = (gate_key, spot.id)
+                distance = self.distances.get(key)
+                if distance is None:
+                    distance = self.distances[key] = self.distance_to(gate_key, spot)
+                pool.add(distance, spot)
+
+    def _build_pool(self, buildings, gate_key, vehicle_type):
+        pool = FreeSpotPool()
+        for building in buildings:
+            for floor in building.floors:
+                for spot in floor.spots:
+                    if spot.vehicle_type_supported != vehicle_type:
+                        continue
+                    distance = self.distance_to(gate_key, spot)
+                    self.distances[(gate_key, spot.id)] = distance
+                    pool.add(distance, spot)
+                    if spot.is_occupied:
+                        pool.discard(spot)
+        self.pools[(gate_key, vehicle_type)] = pool
+        return pool
+
+    def _check_layout(self, buildings):
+        # Adding buildings, floors or spots invalidates the precomputed
+        # distances; the versions only grow, so their sum changes with them.
+        layout = (len(buildings), sum(building.layout_version for building in buildings))
+        if layout != self.layout:
+            self.pools.clear()
+            self.distances.clear()
+            self.layout = layout
+
+
+class NearestToEntranceStrategy(NearestGateStrategy):
+    """Closest free spot to the entrance the vehicle came in by."""
+
+    def __init__(self, distance=manhattan_distance):
+        super().__init__(distance)
+        self.entrances = {}
+
+    def gate_key(self, entrance):
+        if entrance is None:
+            return None
+        self.entrances.setdefault(entrance.id, entrance)
+        return entrance.id
+
+    def distance_to(self, gate_key, spot):
+        return self.distance(self.entrances[gate_key], spot)
+
+
+class NearestToExitStrategy(NearestGateStrategy):
+    """Free spot with the shortest walk or drive to any exit."""
+
+    def __init__(self, exits, distance=manhattan_distance):
+        super().__init__(distance)
+        self.exits = list(exits)
+
+    def gate_key(self, entrance):
+        # without exits there is nothing to measure from
+        return "exits" if self.exits else None
+
+    def distance_to(self, gate_key, spot):
+        return min(self.distance(exit_gate, spot) for exit_gate in self.exits)
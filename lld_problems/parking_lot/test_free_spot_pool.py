@@ -0,0 +1,143 @@
+"""Checks for FreeSpotPool and the per-floor and per-building pools built on it.
+
+Run with `python -m pytest test_free_spot_pool.py` or `python test_free_spot_pool.py`.
+"""
+import random
+
+from building import ParkingBuilding
+from free_spot_pool import FreeSpotPool
+from parking_floor import ParkingFloor
+from parking_spot import ParkingSpot
+from parkinglot import ParkingLot
+from payment import Payment
+from vehicle import Vehicle, VehicleType
+
+
+class NoOpPayment(Payment):
+    def pay(self, amount):
+        pass
+
+
+class Item:
+    def __init__(self, id):
+        self.id = id
+
+
+def build_building(layout):
+    """One floor per entry of `layout`, a list of vehicle types per floor."""
+    building = ParkingBuilding(name="test")
+    for floor_num, types in enumerate(layout):
+        floor = ParkingFloor(floor_num=floor_num, building=building)
+        for vehicle_type in types:
+            floor.add_spots(ParkingSpot(vehicle_type_supported=vehicle_type))
+        building.add_floor(floor)
+    return building
+
+
+def first_free(building, vehicle_type):
+    """What the pools replace: a scan of every floor in order."""
+    for floor in building.floors:
+        spots = floor.get_available_spots(vehicle_type)
+        if spots:
+            return spots[0]
+    return None
+
+
+def test_pool_orders_by_key_and_forgets_discarded_items():
+    pool = FreeSpotPool()
+    items = [Item(i) for i in range(5)]
+    for key, item in zip([3, 1, 4, 0, 2], items):
+        pool.add(key, item)
+    assert len(pool) == 5 and pool.peek() is items[3]
+    pool.discard(items[3])
+    pool.discard(items[1])
+    assert items[3] not in pool and len(pool) == 3
+    assert pool.peek() is items[4]
+    # re-adding an item whose stale entry is still queued keeps one entry
+    pool.add(2, items[4])
+    pool.add(0, items[1])
+    assert pool.peek() is items[1]
+    pool.discard(items[1])
+    pool.discard(items[4])
+    assert pool.peek() is items[0]
+    pool.discard(items[0])
+    pool.discard(items[2])
+    assert pool.peek() is None and not pool
+
+
+def test_find_skips_rejected_items_and_keeps_them():
+    pool = FreeSpotPool()
+    items = [Item(i) for i in range(6)]
+    for key, item in enumerate(items):
+        pool.add(key, item)
+    assert pool.find(lambda item: item.id % 3 == 2) is items[2]
+    assert pool.find(lambda item: False) is None
+    assert len(pool) == 6 and pool.peek() is items[0]
+    assert [pool.find(lambda item, i=i: item.id >= i) for i in range(6)] == items
+
+
+def test_floor_hands_out_spots_by_position_per_type():
+    building = build_building([[VehicleType.Car, VehicleType.BIKE, VehicleType.Car, VehicleType.Car]])
+    floor = building.floors[0]
+    cars = [spot for spot in floor.spots if spot.vehicle_type_supported == VehicleType.Car]
+    assert floor.find_free_spot(VehicleType.Car) is cars[0]
+    assert floor.find_free_spot(VehicleType.BUS) is None
+    cars[0].assign_vehicle(Vehicle("A", VehicleType.Car))
+    assert floor.find_free_spot(VehicleType.Car) is cars[1]
+    assert floor.find_free_spot(VehicleType.Car, lambda spot: spot is not cars[1]) is cars[2]
+    cars[0].remove_vehicle()
+    assert floor.find_free_spot(VehicleType.Car) is cars[0]
+    assert floor.find_free_spot(VehicleType.BIKE) is floor.spots[1]
+
+
+def test_building_skips_full_floors_and_takes_them_back():
+    building = build_building([[VehicleType.Car] * 2, [VehicleType.BIKE], [VehicleType.Car] * 2])
+    first, _, third = building.floors
+    for spot in first.spots:
+        spot.assign_vehicle(Vehicle("A", VehicleType.Car))
+    assert building.find_free_spot(VehicleType.Car) is third.spots[0]
+    assert first not in building.floors_with_free[VehicleType.Car]
+    first.spots[1].remove_vehicle()
+    assert building.find_free_spot(VehicleType.Car) is first.spots[1]
+    assert building.find_free_spot(VehicleType.Car, lambda spot: spot.floor is third) is third.spots[0]
+    assert building.find_free_spot(VehicleType.BUS) is None
+
+
+def test_pools_match_a_full_scan_under_random_churn():
+    rng = random.Random(4)
+    types = [VehicleType.Car, VehicleType.BIKE, VehicleType.BUS]
+    building = build_building([[rng.choice(types) for _ in range(8)] for _ in range(5)])
+    spots = [spot for floor in building.floors for spot in floor.spots]
+    for step in range(3000):
+        spot = rng.choice(spots)
+        if spot.is_occupied:
+            spot.remove_vehicle()
+        else:
+            spot.assign_vehicle(Vehicle(f"V-{step}", spot.vehicle_type_supported))
+        for vehicle_type in types:
+            assert building.find_free_spot(vehicle_type) is first_free(building, vehicle_type)
+
+
+def test_lot_parks_into_the_first_free_spot():
+    ParkingLot.instance = None
+    ParkingLot._initialized = False
+    lot = ParkingLot.get_instance()
+    lot.verbose = False
+    full = build_building([[VehicleType.Car]])
+    spare = build_building([[VehicleType.Car, VehicleType.Car]])
+    lot.add_building(full)
+    lot.add_building(spare)
+    first = lot.park_vehicle(Vehicle("A", VehicleType.Car))
+    assert first.spot is full.floors[0].spots[0]
+    assert lot.park_vehicle(Vehicle("B", VehicleType.Car)).spot is spare.floors[0].spots[0]
+    lot.unpark_vehicle(first.ticket_id, NoOpPayment())
+    assert lot.park_vehicle(Vehicle("C", VehicleType.Car)).spot is full.floors[0].spots[0]
+    assert lot.park_vehicle(Vehicle("D", VehicleType.Car)).spot is spare.floors[0].spots[1]
+    assert lot.park_vehicle(Vehicle("E", VehicleType.Car)) is None
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+    print("ok")
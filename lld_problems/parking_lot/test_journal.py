@@ -0,0 +1,108 @@
+"""Recovery checks for ParkingJournal.
+
+Run with `python -m pytest test_journal.py` or `python test_journal.py`.
+"""
+import os
+import tempfile
+
+from building import ParkingBuilding
+from journal import ParkingJournal
+from parking_floor import ParkingFloor
+from parking_spot import ParkingSpot
+from parkinglot import ParkingLot
+from payment import Payment
+from vehicle import Vehicle, VehicleType
+
+
+class NoOpPayment(Payment):
+    def pay(self, amount):
+        pass
+
+
+def fresh_lot(spots=10):
+    ParkingLot.instance = None
+    ParkingLot._initialized = False
+    lot = ParkingLot.get_instance()
+    lot.verbose = False
+    building = ParkingBuilding(name="test")
+    lot.add_building(building)
+    floor = ParkingFloor(floor_num=0, building=building)
+    building.add_floor(floor)
+    for _ in range(spots):
+        floor.add_spots(ParkingSpot(vehicle_type_supported=VehicleType.Car))
+    return lot
+
+
+def restart(lot, directory, **options):
+    """Drop the lot's in-memory tickets and recover them from `directory`."""
+    lot.journal.close()
+    lot.journal = None
+    for ticket in list(lot.active_tickets.values()):
+        lot.ticket_index.remove(ticket)
+        ticket.spot.remove_vehicle()
+    lot.active_tickets.clear()
+    ParkingJournal(directory, **options).attach(lot)
+
+
+def parked_plates(lot):
+    return sorted(ticket.vehicle.license_plate for ticket in lot.active_tickets.values())
+
+
+def test_recovery_replays_parks_and_unparks():
+    with tempfile.TemporaryDirectory() as directory:
+        lot = fresh_lot()
+        ParkingJournal(directory, fsync_every=1).attach(lot)
+        first = lot.park_vehicle(Vehicle("A", VehicleType.Car))
+        lot.park_vehicle(Vehicle("B", VehicleType.Car))
+        lot.unpark_vehicle(first.ticket_id, NoOpPayment())
+        restart(lot, directory)
+        assert parked_plates(lot) == ["B"]
+        assert lot.find_ticket_by_plate("B").spot.is_occupied
+        assert lot.find_ticket_by_plate("A") is None
+        assert lot.park_vehicle(Vehicle("C", VehicleType.Car)).ticket_id == 3
+        lot.journal.close()
+
+
+def test_recovery_truncates_a_torn_tail():
+    with tempfile.TemporaryDirectory() as directory:
+        lot = fresh_lot()
+        ParkingJournal(directory, fsync_every=1).attach(lot)
+        first = lot.park_vehicle(Vehicle("A", VehicleType.Car))
+        lot.park_vehicle(Vehicle("B", VehicleType.Car))
+        lot.journal.close()
+        segment = next(name for name in os.listdir(directory) if name.startswith("wal-"))
+        path = os.path.join(directory, segment)
+        with open(path, "a") as f:
+            f.write('{"op": "park", "tick')
+
+        restart(lot, directory, fsync_every=1)
+        assert parked_plates(lot) == ["A", "B"]
+        with open(path, "rb") as f:
+            assert f.read().endswith(b"}\n")
+
+        # records written after the restart must survive the next one
+        lot.park_vehicle(Vehicle("C", VehicleType.Car))
+        lot.unpark_vehicle(first.ticket_id, NoOpPayment())
+        restart(lot, directory)
+        assert parked_plates(lot) == ["B", "C"]
+        lot.journal.close()
+
+
+def test_recovery_from_snapshot_and_newer_segments():
+    with tempfile.TemporaryDirectory() as directory:
+        lot = fresh_lot()
+        ParkingJournal(directory, snapshot_every=3).attach(lot)
+        tickets = [lot.park_vehicle(Vehicle(f"P-{i}", VehicleType.Car)) for i in range(5)]
+        lot.unpark_vehicle(tickets[1].ticket_id, NoOpPayment())
+        restart(lot, directory, snapshot_every=3)
+        assert parked_plates(lot) == ["P-0", "P-2", "P-3", "P-4"]
+        assert len([name for name in os.listdir(directory) if name.startswith("wal-")]) == 1
+        assert lot.park_vehicle(Vehicle("P-5", VehicleType.Car)).ticket_id == 6
+        lot.journal.close()
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+    print("ok")
@@ -0,0 +1,84 @@
+"""Checks for the nearest-gate allocation strategies.
+
+Run with `python -m pytest test_strategy.py` or `python test_strategy.py`.
+"""
+from datetime import datetime, timedelta
+
+from building import ParkingBuilding
+from entrance import Entrance
+from exit import Exit
+from parking_floor import ParkingFloor
+from parking_spot import ParkingSpot
+from parkinglot import ParkingLot
+from payment import Payment
+from reservation import ReservationBook
+from strategy import NearestToEntranceStrategy, NearestToExitStrategy
+from vehicle import Vehicle, VehicleType
+
+
+class NoOpPayment(Payment):
+    def pay(self, amount):
+        pass
+
+
+def fresh_lot(locations):
+    """One building, one floor, a car spot at each location."""
+    ParkingLot.instance = None
+    ParkingLot._initialized = False
+    lot = ParkingLot.get_instance()
+    lot.verbose = False
+    building = ParkingBuilding(name="test")
+    lot.add_building(building)
+    floor = ParkingFloor(floor_num=0, building=building)
+    building.add_floor(floor)
+    for location in locations:
+        floor.add_spots(ParkingSpot(vehicle_type_supported=VehicleType.Car, location=location))
+    return lot, floor
+
+
+def test_nearest_to_entrance_and_back_after_unpark():
+    lot, floor = fresh_lot([(0, 0), (5, 0), (9, 0)])
+    lot.set_strategy(NearestToEntranceStrategy())
+    east = Entrance(1, "east", location=(10, 0))
+    west = Entrance(2, "west", location=(0, 0))
+    first = lot.park_vehicle(Vehicle("A", VehicleType.Car), east)
+    assert first.spot is floor.spots[2]
+    assert lot.park_vehicle(Vehicle("B", VehicleType.Car), west).spot is floor.spots[0]
+    lot.unpark_vehicle(first.ticket_id, NoOpPayment())
+    assert lot.park_vehicle(Vehicle("C", VehicleType.Car), east).spot is floor.spots[2]
+    assert lot.park_vehicle(Vehicle("D", VehicleType.Car), east).spot is floor.spots[1]
+    assert lot.park_vehicle(Vehicle("E", VehicleType.Car), east) is None
+
+
+def test_spots_without_location_and_exitless_lots_still_park():
+    lot, floor = fresh_lot([None, (3, 0)])
+    lot.set_strategy(NearestToExitStrategy([]))
+    assert lot.park_vehicle(Vehicle("A", VehicleType.Car)).spot is floor.spots[0]
+    lot.set_strategy(NearestToExitStrategy([Exit(1, "gate", location=(0, 0))]))
+    assert lot.park_vehicle(Vehicle("B", VehicleType.Car)).spot is floor.spots[1]
+
+
+def test_spot_added_later_and_freed_through_a_reservation():
+    lot, floor = fresh_lot([(9, 0)])
+    now = datetime(2024, 1, 1, 9)
+    lot.set_reservations(ReservationBook(clock=lambda: now))
+    lot.set_strategy(NearestToEntranceStrategy())
+    gate = Entrance(1, "gate", location=(0, 0))
+    lot.park_vehicle(Vehicle("A", VehicleType.Car), gate)
+
+    # the gate's pool was built before this spot existed
+    late = ParkingSpot(vehicle_type_supported=VehicleType.Car, location=(1, 0))
+    floor.add_spots(late)
+    assert lot.reservations.reserve_spot(late, "B", now, now + timedelta(hours=1))
+    ticket = lot.park_vehicle(Vehicle("B", VehicleType.Car), gate)
+    assert ticket.spot is late
+    lot.unpark_vehicle(ticket.ticket_id, NoOpPayment())
+    assert ticket.fee_paid and ticket.ticket_id not in lot.active_tickets
+    assert lot.park_vehicle(Vehicle("C", VehicleType.Car), gate).spot is late
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+    print("ok")
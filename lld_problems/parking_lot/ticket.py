@@ -1,13 +1,13 @@
 import datetime
 
 class ParkingTicket:
-    def __init__(self, ticket_id, vehicle, spot):
+    def __init__(self, ticket_id, vehicle, spot, entry_time=None):
         self.ticket_id = ticket_id
         self.vehicle = vehicle
         self.spot = spot
-        self.entry_time = datetime.datetime.now()
+        self.entry_time = entry_time or datetime.datetime.now()
         self.exit_time = None
         self.fee_paid = False
 
-    def close_ticket(self):
-        self.exit_time = datetime.datetime.now()
\ No newline at end of file
+    def close_ticket(self, exit_time=None):
+        self.exit_time = exit_time or datetime.datetime.now()
\ No newline at end of file
@@ -0,0 +1,59 @@
+import bisect
+from threading import Lock
+
+
+def normalize_plate(plate):
+    # plate cameras drop or misread separators, so index letters and digits only
+    return "".join(ch for ch in plate.upper() if ch.isalnum())
+
+
+class TicketIndex:
+    """Secondary indexes over the active tickets of a ParkingLot.
+
+    Maps license plate and spot ID to the open ticket, and keeps the plates
+    in a sorted list so a prefix search is a bisect plus the matches. Plate
+    and spot lookups are O(1); keeping the list sorted costs an O(n) memmove
+    per park and unpark, which stays cheap up to a few hundred thousand
+    active tickets. One lock keeps the three structures consistent with
+    each other while gates park and unpark concurrently.
+    """
+
+    def __init__(self):
+        self.by_plate = {}
+        self.by_spot = {}
+        self.sorted_plates = []
+        self.lock = Lock()
+
+    def add(self, ticket):
+        plate = normalize_plate(ticket.vehicle.license_plate)
+        with self.lock:
+            if plate not in self.by_plate:
+                bisect.insort(self.sorted_plates, plate)
+            self.by_plate[plate] = ticket
+            self.by_spot[ticket.spot.id] = ticket
+
+    def remove(self, ticket):
+        plate = normalize_plate(ticket.vehicle.license_plate)
+        with self.lock:
+            if self.by_plate.get(plate) is ticket:
+                del self.by_plate[plate]
+                del self.sorted_plates[bisect.bisect_left(self.sorted_plates, plate)]
+            if self.by_spot.get(ticket.spot.id) is ticket:
+                del self.by_spot[ticket.spot.id]
+
+    def find_by_plate(self, plate):
+        return self.by_plate.get(normalize_plate(plate))
+
+    def find_by_spot(self, spot):
+        return self.by_spot.get(spot.id)
+
+    def search_plates(self, prefix, limit=20):
+        prefix = normalize_plate(prefix)
+        with self.lock:
+            start = bisect.bisect_left(self.sorted_plates, prefix)
+            tickets = []
+            for plate in self.sorted_plates[start:start + limit]:
+                if not plate.startswith(prefix):
+                    break
+                tickets.append(self.by_plate[plate])
+            return tickets
@@ -1,37 +1,49 @@
 from datetime import datetime
-from vote import Vote
+from vote import VoteTally
 from votable import Votable
 from commentable import Commentable
+from ids import ids
+from pagination import ListView
+from list_slot import ListSlot
 
 class Answer(Votable, Commentable):
+    __slots__ = ("id", "content", "author", "question", "creation_date", "votes", "_comments",
+                 "is_accepted", "__weakref__")
+    comments = ListSlot()
+
     def __init__(self, content, author, question):
-        self.id = id(self)
+        self.id = ids.next("answers")
         self.content = content
         self.author = author
         self.question = question
         self.creation_date = datetime.now()
-        self.votes = []
-        self.comments = []
+        self.votes = VoteTally()
         self.is_accepted = False
     
     def vote(self, user, value):
         if value not in [-1, 1]:
             raise ValueError("Vote value must be either 1 or -1")
-        self.votes = [v for v in self.votes if v.user != user]
-        self.votes.append(Vote(user, value))
-        self.author.update_reputation(value * 10)
+        previous = self.votes.cast(user.id, value)
+        if self.author:
+            self.author.update_reputation((value - previous) * 10)
 
     def accept(self):
         if self.is_accepted:
             raise ValueError("This answer is already accepted")
         self.is_accepted = True
-        self.author.update_reputation(15)
+        if self.author:
+            self.author.update_reputation(15)
 
     def get_vote_count(self) -> int:
-        return sum(v.value for v in self.votes)
+        return self.votes.score
+
+    def retract_vote(self, user):
+        previous = self.votes.retract(user.id)
+        if self.author:
+            self.author.update_reputation(-previous * 10)
 
     def add_comment(self, comment):
         self.comments.append(comment)
     
     def get_comments(self):
-        return self.comments.copy()
+        return ListView(self.comments)
@@ -0,0 +1,111 @@
+"""Multi-threaded voting stress test for StackOverflow's thread-safe mode.
+
+Worker threads cast and retract votes on a shared set of questions and
+answers. Each thread votes as its own set of users, so the final vote of
+every (user, post) pair is known and the expected post scores and author
+reputations can be computed exactly afterwards. Throughput is reported per
+thread count; the run fails loudly on any mismatch.
+
+The same workload is also run once without thread_safe to show the lost
+updates the locks prevent.
+"""
+import random
+import sys
+import time
+from threading import Thread
+
+from question import Question
+from stack_overflow import StackOverflow
+
+
+POSTS = 200
+USERS_PER_THREAD = 25
+OPERATIONS = 20_000  # per run, split across the threads
+
+
+def build_forum(thread_safe):
+    system = StackOverflow(thread_safe=thread_safe)
+    authors = [system.create_user(f"author{i}", f"author{i}@example.com") for i in range(20)]
+    questions = [system.ask_question(authors[i % len(authors)], f"question {i}", "body", ["stress"])
+                 for i in range(POSTS)]
+    answers = [system.answer_question(authors[(i + 1) % len(authors)], question, "answer")
+               for i, question in enumerate(questions)]
+    return system, questions, answers
+
+
+def run_worker(system, voters, posts, operations, seed, final, crashes):
+    rng = random.Random(seed)
+    try:
+        for _ in range(operations):
+            voter = rng.choice(voters)
+            post = rng.choice(posts)
+            value = rng.choice((1, 1, -1, 0))
+            if isinstance(post, Question):
+                vote, retract = system.vote_question, system.retract_question_vote
+            else:
+                vote, retract = system.vote_answer, system.retract_answer_vote
+            if value:
+                vote(voter, post, value)
+            else:
+                retract(voter, post)
+            final[(voter.id, id(post))] = value
+    except Exception as e:
+        # only expected without thread_safe: a corrupted index
+        crashes.append(e)
+
+
+def check(system, posts, final, base_reputation):
+    errors = []
+    expected_score = {id(post): 0 for post in posts}
+    for (_, post_key), value in final.items():
+        expected_score[post_key] += value
+    expected_reputation = dict(base_reputation)
+    for post in posts:
+        if post.get_vote_count() != expected_score[id(post)]:
+            errors.append(f"post {post.id}: score {post.get_vote_count()} != {expected_score[id(post)]}")
+        weight = 5 if isinstance(post, Question) else 10
+        expected_reputation[post.author.id] += weight * expected_score[id(post)]
+    for user_id, reputation in expected_reputation.items():
+        if system.users[user_id].reputation != reputation:
+            errors.append(f"user {user_id}: reputation {system.users[user_id].reputation} != {reputation}")
+    top = system.top_users(1)[0]
+    if top[1] != max(user.reputation for user in system.users.values()):
+        errors.append("leaderboard out of step with reputation")
+    return errors
+
+
+def run(threads, thread_safe=True):
+    system, questions, answers = build_forum(thread_safe)
+    posts = questions + answers
+    base_reputation = {user.id: user.reputation for user in system.users.values()}
+    voters = [[system.create_user(f"voter{t}-{i}", "") for i in range(USERS_PER_THREAD)] for t in range(threads)]
+    final, crashes = {}, []
+    workers = [Thread(target=run_worker, args=(system, voters[t], posts, OPERATIONS // threads, t, final, crashes))
+               for t in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+    errors = [f"worker crashed: {e!r}" for e in crashes] + check(system, posts, final, base_reputation)
+    return OPERATIONS / elapsed, errors
+
+
+def main():
+    # switch threads as often as possible to shake out races
+    sys.setswitchinterval(1e-6)
+    print(f"{'threads':>8} {'votes/sec':>12}  result")
+    for threads in (1, 2, 4, 8, 16):
+        throughput, errors = run(threads)
+        print(f"{threads:>8} {throughput:>12.0f}  {'OK' if not errors else errors[:3]}")
+        if errors:
+            sys.exit(1)
+    _, errors = run(8, thread_safe=False)
+    crashed = sum(error.startswith("worker crashed") for error in errors)
+    print(f"without thread_safe, 8 threads: {crashed} workers crashed, "
+          f"{len(errors) - crashed} mismatched totals")
+
+
+if __name__ == "__main__":
+    main()
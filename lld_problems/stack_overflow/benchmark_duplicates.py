@@ -0,0 +1,85 @@
+"""Precision, recall and latency of MinHash/LSH duplicate detection.
+
+Builds a synthetic corpus of random questions, then asks edited copies of
+some of them (a fraction of the words replaced) and unrelated new
+questions. A lookup is a hit if it returns the question the copy was made
+from; any result for an unrelated question is a false positive. Lookup
+latency is compared with an exact Jaccard scan over the whole corpus.
+
+Run with `python benchmark_duplicates.py`.
+"""
+import random
+import time
+
+from duplicates import shingles
+from stack_overflow import StackOverflow
+
+
+WORDS = [f"word{i}" for i in range(5000)]
+QUERIES = 200
+
+
+def random_question(rng):
+    return " ".join(rng.choices(WORDS, k=8)), " ".join(rng.choices(WORDS, k=60))
+
+
+def edited(rng, title, content, fraction):
+    words = content.split()
+    for i in rng.sample(range(len(words)), int(len(words) * fraction)):
+        words[i] = rng.choice(WORDS)
+    return title, " ".join(words)
+
+
+def jaccard_scan(corpus, title, content, threshold):
+    query = shingles(f"{title} {content}")
+    matches = []
+    for question_id, other in corpus.items():
+        similarity = len(query & other) / len(query | other)
+        if similarity >= threshold:
+            matches.append((similarity, question_id))
+    return sorted(matches, reverse=True)
+
+
+def build_corpus(size, seed=7):
+    rng = random.Random(seed)
+    system = StackOverflow()
+    author = system.create_user("author", "author@example.com")
+    questions = [system.ask_question(author, *random_question(rng), ["bench"]) for _ in range(size)]
+    return system, questions
+
+
+def evaluate(system, questions, fraction, seed=99):
+    rng = random.Random(seed)
+    detector = system.duplicates
+    sources = rng.sample(questions, QUERIES)
+
+    found = 0
+    start = time.perf_counter()
+    for source in sources:
+        title, content = edited(rng, source.title, source.content, fraction)
+        if any(qid == source.id for qid, _ in detector.find(title, content)):
+            found += 1
+    lsh_latency = (time.perf_counter() - start) / QUERIES * 1e6
+
+    false_positives = sum(bool(detector.find(*random_question(rng))) for _ in range(QUERIES))
+
+    corpus = {q.id: shingles(f"{q.title} {q.content}") for q in questions}
+    start = time.perf_counter()
+    for source in sources[:20]:
+        jaccard_scan(corpus, source.title, source.content, detector.threshold)
+    scan_latency = (time.perf_counter() - start) / 20 * 1e6
+    precision = found / (found + false_positives) if found + false_positives else 1.0
+    return found / QUERIES, precision, lsh_latency, scan_latency
+
+
+def main():
+    print(f"{'questions':>10} {'edited':>7} {'recall':>7} {'precision':>10} {'lsh us':>9} {'scan us':>10}")
+    for size in (1_000, 10_000, 50_000):
+        system, questions = build_corpus(size)
+        for fraction in (0.05, 0.1, 0.15):
+            recall, precision, lsh, scan = evaluate(system, questions, fraction)
+            print(f"{size:>10} {fraction:>7.0%} {recall:>7.1%} {precision:>10.1%} {lsh:>9.0f} {scan:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Import throughput and parser memory for synthetic Stack Exchange dumps.
+
+Writes XML dumps of growing size to a temporary directory, imports each
+into a fresh StackOverflow and reports rows/sec, once with duplicate
+indexing and once with it skipped (index_duplicates=False). Parser memory
+is measured separately by streaming Posts.xml without building the model:
+it should stay flat as the file grows.
+
+Run with `python benchmark_import.py`.
+"""
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from xml.sax.saxutils import quoteattr
+
+from importer import DumpImporter, iter_rows
+from stack_overflow import StackOverflow
+
+
+WORDS = [f"word{i}" for i in range(5000)]
+TAGS = [f"tag{i}" for i in range(300)]
+
+
+def write_dump(directory, posts, seed=5):
+    rng = random.Random(seed)
+    users = max(posts // 20, 10)
+
+    def write(kind, rows):
+        with open(os.path.join(directory, kind + ".xml"), "w", encoding="utf-8") as f:
+            f.write(f"<?xml version=\"1.0\" encoding=\"utf-8\"?>\n<{kind.lower()}>\n")
+            for row in rows:
+                f.write("  <row " + " ".join(f"{key}={quoteattr(str(value))}" for key, value in row.items()) + " />\n")
+            f.write(f"</{kind.lower()}>\n")
+
+    write("Tags", ({"Id": i, "TagName": tag} for i, tag in enumerate(TAGS, 1)))
+    write("Users", ({"Id": i, "DisplayName": f"user{i}", "Reputation": rng.randint(1, 5000)}
+                    for i in range(1, users + 1)))
+
+    def post_rows():
+        questions = []
+        for post_id in range(1, posts + 1):
+            row = {"Id": post_id, "OwnerUserId": rng.randint(1, users),
+                   "CreationDate": f"2020-01-01T00:00:{post_id % 60:02d}.000",
+                   "Body": " ".join(rng.choices(WORDS, k=60))}
+            if not questions or rng.random() < 0.4:
+                row.update(PostTypeId=1, Title=" ".join(rng.choices(WORDS, k=8)),
+                           Tags="".join(f"<{tag}>" for tag in rng.sample(TAGS, 3)))
+                questions.append(post_id)
+            else:
+                row.update(PostTypeId=2, ParentId=rng.choice(questions[-1000:]))
+            yield row
+
+    write("Posts", post_rows())
+    write("Comments", ({"Id": i, "PostId": rng.randint(1, posts), "UserId": rng.randint(1, users),
+                        "Text": " ".join(rng.choices(WORDS, k=12))} for i in range(1, posts // 2)))
+    write("Votes", ({"Id": i, "PostId": rng.randint(1, posts), "VoteTypeId": rng.choice((2, 2, 2, 3))}
+                    for i in range(1, posts * 2)))
+
+
+def parser_peak(path):
+    tracemalloc.start()
+    rows = sum(1 for _ in iter_rows(path))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return rows, peak
+
+
+def main():
+    print(f"{'posts':>8} {'duplicates':>10} {'rows':>10} {'rows/s':>10} {'posts/s':>10} {'parser peak KiB':>16}")
+    for posts in (10_000, 50_000, 200_000):
+        with tempfile.TemporaryDirectory() as directory:
+            write_dump(directory, posts)
+            _, peak = parser_peak(os.path.join(directory, "Posts.xml"))
+            for index_duplicates in (True, False):
+                start = time.perf_counter()
+                importer = DumpImporter(StackOverflow(), verbose=False, index_duplicates=index_duplicates)
+                stats = importer.import_directory(directory)
+                elapsed = time.perf_counter() - start
+                print(f"{posts:>8} {'indexed' if index_duplicates else 'skipped':>10} {stats.total_rows:>10,} "
+                      f"{stats.total_rows / elapsed:>10,.0f} {stats.rows_per_second('Posts'):>10,.0f} "
+                      f"{peak / 1024:>16,.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Bytes per vote, comment and post: dict-backed layout versus __slots__.
+
+The Legacy* classes reproduce the dict-backed objects the model used
+before: a Vote object per vote kept in a list on the post, and a __dict__
+on every comment, question and answer. Each kind is allocated N times
+under tracemalloc, sharing the same strings and authors, so the numbers
+are the per-object overhead only.
+
+Run with `python benchmark_memory.py`.
+"""
+import tracemalloc
+from datetime import datetime
+
+from answer import Answer
+from comment import Comment
+from question import Question
+from user import User
+from vote import VoteTally
+
+
+N = 100_000
+
+
+class LegacyVote:
+    def __init__(self, user, value):
+        self.user = user
+        self.value = value
+
+
+class LegacyComment:
+    def __init__(self, content, author):
+        self.id = id(self)
+        self.content = content
+        self.author = author
+        self.creation_date = datetime.now()
+
+
+class LegacyQuestion:
+    def __init__(self, author, title, content, tags):
+        self.id = id(self)
+        self.author = author
+        self.title = title
+        self.content = content
+        self.creation_date = datetime.now()
+        self.answers = []
+        self.tags = list(tags)
+        self.comments = []
+        self.votes = []
+
+
+class LegacyAnswer:
+    def __init__(self, content, author, question):
+        self.id = id(self)
+        self.content = content
+        self.author = author
+        self.question = question
+        self.creation_date = datetime.now()
+        self.votes = []
+        self.comments = []
+        self.is_accepted = False
+
+
+def bytes_per(build):
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    kept = build()
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return (after - before) / N
+
+
+def main():
+    author = User("author", "author@example.com")
+    voters = [User(f"voter{i}", "") for i in range(N)]
+    question = Question(author, "title", "content", [])
+    tags = []
+
+    def legacy_votes():
+        votes = []
+        for voter in voters:
+            votes.append(LegacyVote(voter, 1))
+        return votes
+
+    def votes():
+        tally = VoteTally()
+        for voter in voters:
+            tally.cast(voter.id, 1)
+        return tally
+
+    rows = [
+        ("vote", bytes_per(legacy_votes), bytes_per(votes)),
+        ("comment", bytes_per(lambda: [LegacyComment("text", author) for _ in range(N)]),
+         bytes_per(lambda: [Comment("text", author) for _ in range(N)])),
+        ("question", bytes_per(lambda: [LegacyQuestion(author, "title", "content", tags) for _ in range(N)]),
+         bytes_per(lambda: [Question(author, "title", "content", tags) for _ in range(N)])),
+        ("answer", bytes_per(lambda: [LegacyAnswer("content", author, question) for _ in range(N)]),
+         bytes_per(lambda: [Answer("content", author, question) for _ in range(N)])),
+    ]
+    print(f"{'object':>10} {'before B':>10} {'after B':>10} {'saved':>7}")
+    for name, before, after in rows:
+        print(f"{name:>10} {before:>10.0f} {after:>10.0f} {1 - after / before:>7.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Query latency of the inverted index versus the original linear scan.
+
+Also times BM25 top-10 ranking, cold and served from the result cache.
+
+Run with `python benchmark_search.py`.
+"""
+import random
+import time
+
+from stack_overflow import StackOverflow
+
+
+WORDS = [f"word{i}" for i in range(5000)]
+TAGS = [f"tag{i}" for i in range(300)]
+
+
+def build_forum(questions, seed=11):
+    rng = random.Random(seed)
+    system = StackOverflow()
+    users = [system.create_user(f"user{i}", f"user{i}@example.com") for i in range(100)]
+    for _ in range(questions):
+        system.ask_question(rng.choice(users),
+                            " ".join(rng.choices(WORDS, k=8)),
+                            " ".join(rng.choices(WORDS, k=60)),
+                            rng.sample(TAGS, 3))
+    return system
+
+
+def linear_scan(system, query):
+    """The original StackOverflow.search_questions."""
+    return [q for q in system.questions.values() if
+            query.lower() in q.title.lower() or
+            query.lower() in q.content.lower() or
+            any(query.lower() == tag.name.lower() for tag in q.tags)]
+
+
+def main():
+    rng = random.Random(3)
+    queries = [rng.choice(WORDS) for _ in range(50)]
+    print(f"{'questions':>10} {'index us':>10} {'and us':>10} {'bm25 us':>10} {'cached us':>10} {'scan us':>12}")
+    for size in (1_000, 10_000, 50_000):
+        system = build_forum(size)
+        start = time.perf_counter()
+        for query in queries:
+            system.search_questions(query)
+        indexed = (time.perf_counter() - start) / len(queries) * 1e6
+        start = time.perf_counter()
+        for query in queries:
+            system.search_questions(f"{query} {rng.choice(TAGS)}")
+        conjunctive = (time.perf_counter() - start) / len(queries) * 1e6
+        start = time.perf_counter()
+        for query in queries:
+            system.search_ranked(query)
+        ranked = (time.perf_counter() - start) / len(queries) * 1e6
+        start = time.perf_counter()
+        for query in queries:
+            system.search_ranked(query)
+        cached = (time.perf_counter() - start) / len(queries) * 1e6
+        start = time.perf_counter()
+        for query in queries[:10]:
+            linear_scan(system, query)
+        scan = (time.perf_counter() - start) / 10 * 1e6
+        print(f"{size:>10} {indexed:>10.1f} {conjunctive:>10.1f} {ranked:>10.1f} {cached:>10.1f} {scan:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,12 @@
 from datetime import datetime
 
+from ids import ids
+
 class Comment:
+    __slots__ = ("id", "content", "author", "creation_date")
+
     def __init__(self, content, author):
-        self.id = id(self)
+        self.id = ids.next("comments")
         self.content = content
         self.author = author
         self.creation_date = datetime.now()
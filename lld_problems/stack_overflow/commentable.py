@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
 
 class Commentable(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def add_comment(self, comment):
         pass
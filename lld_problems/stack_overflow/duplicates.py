@@ -0,0 +1,112 @@
+import random
+import zlib
+
+try:
+    import numpy as np
+except ImportError:  # optional: signatures are then computed in pure Python
+    np = None
+
+from search_index import tokenize
+
+
+# small enough that a * h + b stays below 2 ** 63, so NumPy can do it in uint64
+MERSENNE = (1 << 31) - 1
+
+
+def shingles(text, size=2):
+    """Hashes of the overlapping `size`-word runs in `text`."""
+    words = tokenize(text)
+    if len(words) < size:
+        return {zlib.crc32(" ".join(words).encode())} if words else set()
+    return {zlib.crc32(" ".join(words[i:i + size]).encode()) for i in range(len(words) - size + 1)}
+
+
+class DuplicateDetector:
+    """Near-duplicate questions by MinHash with locality-sensitive hashing.
+
+    Each question's title and body are reduced to a signature of
+    `bands * rows` MinHash values; two signatures agree in a position with
+    probability equal to the Jaccard similarity of the two shingle sets.
+    Signatures are split into bands and every band is a key into its own
+    bucket table, so a lookup only compares against questions that share
+    at least one whole band: likely above about (1 / bands) ** (1 / rows)
+    similarity, unlikely below it. Candidates are then filtered by their
+    estimated similarity against `threshold`.
+    """
+
+    def __init__(self, bands=16, rows=4, threshold=0.5, seed=1):
+        self.bands = bands
+        self.rows = rows
+        self.threshold = threshold
+        # signatures are only comparable if made with the same settings
+        self.scheme = f"{bands}x{rows}, seed {seed}, mod {MERSENNE}"
+        rng = random.Random(seed)
+        self.permutations = [(rng.randrange(1, MERSENNE), rng.randrange(MERSENNE))
+                             for _ in range(bands * rows)]
+        if np is not None:
+            self.a = np.array([a for a, _ in self.permutations], dtype=np.uint64)[:, None]
+            self.b = np.array([b for _, b in self.permutations], dtype=np.uint64)[:, None]
+        self.buckets = [{} for _ in range(bands)]  # band key -> set of question ids
+        self.signatures = {}  # question id -> signature
+
+    def signature(self, title, content):
+        hashes = shingles(f"{title} {content}")
+        if not hashes:
+            return None
+        if np is not None:
+            # all permutations of all shingles in one (permutations x shingles) pass
+            h = np.fromiter(hashes, dtype=np.uint64, count=len(hashes)) % MERSENNE
+            return tuple(((self.a * h + self.b) % MERSENNE).min(axis=1).tolist())
+        hashes = [h % MERSENNE for h in hashes]
+        return tuple(min((a * h + b) % MERSENNE for h in hashes) for a, b in self.permutations)
+
+    def add(self, question):
+        self.add_signature(question.id, self.signature(question.title, question.content))
+
+    def add_signature(self, question_id, signature):
+        """Index a signature computed earlier, e.g. outside a lock."""
+        if signature is None:
+            return
+        self.signatures[question_id] = signature
+        for band, key in enumerate(self._band_keys(signature)):
+            self.buckets[band].setdefault(key, set()).add(question_id)
+
+    def remove(self, question_id):
+        signature = self.signatures.pop(question_id, None)
+        if signature is None:
+            return
+        for band, key in enumerate(self._band_keys(signature)):
+            bucket = self.buckets[band][key]
+            bucket.discard(question_id)
+            if not bucket:
+                del self.buckets[band][key]
+
+    def update(self, question, signature=None):
+        self.remove(question.id)
+        if signature is None:
+            signature = self.signature(question.title, question.content)
+        self.add_signature(question.id, signature)
+
+    def find(self, title, content, k=5):
+        """Up to `k` (question id, estimated similarity) pairs, most similar first."""
+        return self.find_signature(self.signature(title, content), k)
+
+    def find_signature(self, signature, k=5):
+        if signature is None:
+            return []
+        candidates = set()
+        for band, key in enumerate(self._band_keys(signature)):
+            candidates.update(self.buckets[band].get(key, ()))
+        size = len(signature)
+        scored = []
+        for question_id in candidates:
+            other = self.signatures[question_id]
+            similarity = sum(x == y for x, y in zip(signature, other)) / size
+            if similarity >= self.threshold:
+                scored.append((similarity, question_id))
+        scored.sort(key=lambda pair: (-pair[0], pair[1]))
+        return [(question_id, similarity) for similarity, question_id in scored[:k]]
+
+    def _band_keys(self, signature):
+        rows = self.rows
+        return [signature[i:i + rows] for i in range(0, len(signature), rows)]
@@ -0,0 +1,106 @@
+import heapq
+import math
+from datetime import datetime, timedelta
+
+from skiplist import IndexableSkipList
+
+
+# seconds of age that cost one order of magnitude of activity in "hot"
+HOT_DECAY = 45000
+EPOCH = datetime(2008, 9, 15)
+
+
+def activity(question):
+    score = question.get_vote_count() + 2 * len(question.answers)
+    if any(answer.is_accepted for answer in question.answers):
+        score += 3
+    return score
+
+
+def hot_score(question):
+    # Decay is expressed as a bonus for being newer instead of a penalty for
+    # getting older, so a question's hot score only changes when it gets
+    # activity, never because the clock moved.
+    score = activity(question)
+    order = math.log10(max(abs(score), 1))
+    sign = (score > 0) - (score < 0)
+    return sign * order + (question.creation_date - EPOCH).total_seconds() / HOT_DECAY
+
+
+class QuestionFeeds:
+    """Front-page rankings kept up to date as questions change.
+
+    "hot" and "top this week" are IndexableSkipLists keyed by
+    (-score, sequence, question id), so an update is O(log n) and the
+    top K is an O(K) walk from the head. Questions leave the weekly window
+    lazily, oldest first by creation date, whenever that feed is touched.
+    "unanswered" is a third skip list keyed by (-creation time, -question id),
+    read newest first. Every order comes from creation_date, not from the
+    order questions were added in, which imports and repository loads
+    don't keep.
+    """
+
+    def __init__(self, window=timedelta(days=7), clock=datetime.now):
+        self.window = window
+        self.clock = clock
+        self.hot = IndexableSkipList()
+        self.week = IndexableSkipList()
+        self.week_order = []  # heap of (creation date, question id)
+        self.unanswered = IndexableSkipList()
+        self.hot_keys = {}
+        self.week_keys = {}
+        self.unanswered_keys = {}
+        self.sequence = 0
+
+    def add(self, question):
+        self.sequence += 1
+        key = (-hot_score(question), self.sequence, question.id)
+        self.hot_keys[question.id] = key
+        self.hot.insert(key)
+        if question.creation_date > self.clock() - self.window:
+            key = (-question.get_vote_count(), self.sequence, question.id)
+            self.week_keys[question.id] = key
+            self.week.insert(key)
+            heapq.heappush(self.week_order, (question.creation_date, question.id))
+        if not question.answers:
+            key = (-(question.creation_date - EPOCH).total_seconds(), -question.id)
+            self.unanswered_keys[question.id] = key
+            self.unanswered.insert(key)
+
+    def update(self, question):
+        """Re-rank after a vote, answer or accept."""
+        old = self.hot_keys.get(question.id)
+        if old is None:
+            return
+        key = (-hot_score(question), old[1], question.id)
+        if key != old:
+            self.hot.remove(old)
+            self.hot.insert(key)
+            self.hot_keys[question.id] = key
+        old = self.week_keys.get(question.id)
+        if old is not None:
+            key = (-question.get_vote_count(), old[1], question.id)
+            if key != old:
+                self.week.remove(old)
+                self.week.insert(key)
+                self.week_keys[question.id] = key
+        if question.answers:
+            key = self.unanswered_keys.pop(question.id, None)
+            if key is not None:
+                self.unanswered.remove(key)
+
+    def top_hot(self, k=20):
+        return [key[2] for key in self.hot.slice(0, k)]
+
+    def top_this_week(self, k=20):
+        self._expire()
+        return [key[2] for key in self.week.slice(0, k)]
+
+    def newest_unanswered(self, k=20):
+        return [-key[1] for key in self.unanswered.slice(0, k)]
+
+    def _expire(self):
+        cutoff = self.clock() - self.window
+        while self.week_order and self.week_order[0][0] <= cutoff:
+            _, qid = heapq.heappop(self.week_order)
+            self.week.remove(self.week_keys.pop(qid))
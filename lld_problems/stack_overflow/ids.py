@@ -0,0 +1,28 @@
+from threading import Lock
+
+
+class IdAllocator:
+    """Monotonically increasing IDs, one sequence per kind of object.
+
+    IDs are never reused, unlike id(self), so they are safe to store and to
+    key indexes by after the object is gone.
+    """
+
+    def __init__(self):
+        self.next_ids = {}  # kind -> next ID to hand out
+        self.lock = Lock()
+
+    def next(self, kind):
+        with self.lock:
+            value = self.next_ids.get(kind, 1)
+            self.next_ids[kind] = value + 1
+            return value
+
+    def advance(self, kind, last):
+        """Make sure IDs up to `last` are never handed out for `kind`."""
+        with self.lock:
+            self.next_ids[kind] = max(self.next_ids.get(kind, 1), last + 1)
+
+
+# shared by every model object in the process
+ids = IdAllocator()
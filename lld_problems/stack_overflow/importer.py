@@ -0,0 +1,239 @@
+"""Bulk import of Stack Exchange-style data dumps into a StackOverflow.
+
+A dump is a directory holding any of Tags, Users, Posts, Comments and
+Votes, each either as the Stack Exchange XML (`<row .../>` elements) or as
+JSON Lines with the same field names. Files are streamed row by row, so
+memory grows with the model being built, not with the file.
+
+Run with `python importer.py <dump directory>`.
+"""
+import json
+import os
+import re
+import sys
+import time
+import xml.etree.ElementTree as ET
+from datetime import datetime
+
+from answer import Answer
+from comment import Comment
+from question import Question
+from user import User
+
+
+QUESTION, ANSWER = "1", "2"
+UPVOTE, DOWNVOTE = "2", "3"
+TAG_NAME = re.compile(r"[^<>|]+")
+
+
+def iter_rows(path):
+    """Yield each row of an XML or JSONL dump file as a dict of strings."""
+    if path.endswith(".jsonl"):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield {key: str(value) for key, value in json.loads(line).items() if value is not None}
+        return
+    events = ET.iterparse(path, events=("start", "end"))
+    _, root = next(events)
+    for event, element in events:
+        if event == "end" and element.tag == "row":
+            yield element.attrib
+            # drop parsed rows so the tree never holds more than one
+            root.clear()
+
+
+def parse_date(value):
+    return datetime.fromisoformat(value) if value else datetime.now()
+
+
+class ImportStats:
+    def __init__(self):
+        self.rows = {}
+        self.skipped = {}
+        self.seconds = {}
+
+    @property
+    def total_rows(self):
+        return sum(self.rows.values())
+
+    def rows_per_second(self, kind=None):
+        rows = self.rows.get(kind, 0) if kind else self.total_rows
+        seconds = self.seconds.get(kind, 0) if kind else sum(self.seconds.values())
+        return rows / seconds if seconds else 0.0
+
+    def report(self):
+        for kind, rows in self.rows.items():
+            print(f"{kind}: {rows:,} rows, {self.skipped.get(kind, 0):,} skipped, "
+                  f"{self.rows_per_second(kind):,.0f} rows/s")
+        print(f"Total: {self.total_rows:,} rows at {self.rows_per_second():,.0f} rows/s")
+
+
+class DumpImporter:
+    """Loads dump files straight into a StackOverflow's model and indexes.
+
+    Objects are built directly instead of through ask_question and friends:
+    reputation comes from the dump rather than being replayed, votes go
+    into the tallies without touching reputation, and questions whose
+    score or answers changed are re-ranked once in `finish` instead of on
+    every row. Rows that point at a missing parent post are skipped.
+    Anonymous votes, which is most of them in real dumps, are keyed in the
+    tally by the negated vote Id.
+
+    MinHash signatures for duplicate detection are the costliest part of a
+    question row. With `index_duplicates=False` they are skipped: imported
+    questions then stay out of the duplicate detector, until a
+    SqliteRepository holding them is next attached, which hashes them once.
+    """
+
+    KINDS = ("Tags", "Users", "Posts", "Comments", "Votes")
+
+    def __init__(self, system, verbose=True, progress_every=100_000, index_duplicates=True):
+        self.system = system
+        self.index_duplicates = index_duplicates
+        self.verbose = verbose
+        self.progress_every = progress_every
+        self.stats = ImportStats()
+        self.users = {}  # dump user Id -> User
+        self.posts = {}  # dump post Id -> Question or Answer
+        self.accepted_ids = set()  # dump Ids of accepted answers not yet seen
+        self.touched = set()  # questions to re-rank in finish()
+
+    def import_directory(self, directory):
+        for kind in self.KINDS:
+            for extension in (".xml", ".jsonl"):
+                path = os.path.join(directory, kind + extension)
+                if os.path.exists(path):
+                    getattr(self, "import_" + kind.lower())(path)
+                    break
+        self.finish()
+        return self.stats
+
+    def import_tags(self, path):
+        for row in self._rows("Tags", path):
+            self.system.tag_registry.intern(row["TagName"])
+
+    def import_users(self, path):
+        system = self.system
+        for row in self._rows("Users", path):
+            user = User(username=row.get("DisplayName", ""), email=row.get("EmailHash", ""))
+            user.reputation = int(row.get("Reputation", 0))
+            system.repository.add_user(user)
+            system.leaderboard.add_user(user)
+            self.users[row["Id"]] = user
+
+    def import_posts(self, path):
+        for row in self._rows("Posts", path):
+            post_type = row.get("PostTypeId")
+            if post_type == QUESTION:
+                self._add_question(row)
+            elif post_type == ANSWER:
+                if not self._add_answer(row):
+                    self._skip("Posts")
+            else:
+                self._skip("Posts")
+
+    def import_comments(self, path):
+        for row in self._rows("Comments", path):
+            post = self.posts.get(row.get("PostId"))
+            if post is None:
+                self._skip("Comments")
+                continue
+            author = self.users.get(row.get("UserId"))
+            comment = Comment(content=row.get("Text", ""), author=author)
+            comment.creation_date = parse_date(row.get("CreationDate"))
+            post.add_comment(comment)
+            self.system.repository.add_comment(post, comment)
+            if author:
+                author.comments.append(comment)
+
+    def import_votes(self, path):
+        for row in self._rows("Votes", path):
+            vote_type = row.get("VoteTypeId")
+            post = self.posts.get(row.get("PostId"))
+            if post is None or vote_type not in (UPVOTE, DOWNVOTE):
+                self._skip("Votes")
+                continue
+            voter = self.users.get(row.get("UserId"))
+            voter_id = voter.id if voter else -int(row["Id"])
+            value = 1 if vote_type == UPVOTE else -1
+            post.votes.cast(voter_id, value)
+            self.system.repository.save_vote(post, voter_id, value)
+            if isinstance(post, Question):
+                self.touched.add(post)
+
+    def finish(self):
+        system = self.system
+        for question in self.touched:
+            system.tag_index.rescore(question)
+            system.feeds.update(question)
+            system.ranker.update(question)
+        self.touched.clear()
+        system.search_cache.clear()
+        system.answer_rankings.clear()
+        system.repository.flush()
+
+    def _add_question(self, row):
+        system = self.system
+        # Deleted owners are missing from dumps. Their posts keep author None,
+        # and votes on them change nobody's reputation.
+        author = self.users.get(row.get("OwnerUserId"))
+        tags = system.tag_registry.intern_all(TAG_NAME.findall(row.get("Tags", "")))
+        question = Question(author, row.get("Title", ""), row.get("Body", ""), tags)
+        question.creation_date = parse_date(row.get("CreationDate"))
+        if row.get("AcceptedAnswerId"):
+            self.accepted_ids.add(row["AcceptedAnswerId"])
+        system.repository.add_question(question)
+        if author:
+            author.question.append(question)
+        system.tag_index.add(question)
+        system.feeds.add(question)
+        system.search_index.add(question)
+        if self.index_duplicates:
+            signature = system.duplicates.signature(question.title, question.content)
+            system.repository.save_signature(question.id, signature)
+            system.duplicates.add_signature(question.id, signature)
+        self.posts[row["Id"]] = question
+
+    def _add_answer(self, row):
+        question = self.posts.get(row.get("ParentId"))
+        if not isinstance(question, Question):
+            return False
+        author = self.users.get(row.get("OwnerUserId"))
+        answer = Answer(row.get("Body", ""), author, question)
+        answer.creation_date = parse_date(row.get("CreationDate"))
+        if row["Id"] in self.accepted_ids:
+            self.accepted_ids.discard(row["Id"])
+            answer.is_accepted = True
+        question.add_answer(answer)
+        self.system.repository.add_answer(answer)
+        if author:
+            author.answer.append(answer)
+        self.posts[row["Id"]] = answer
+        self.touched.add(question)
+        return True
+
+    def _rows(self, kind, path):
+        rows = self.stats.rows.get(kind, 0)
+        start = time.perf_counter()
+        try:
+            for row in iter_rows(path):
+                yield row
+                rows += 1
+                if self.verbose and rows % self.progress_every == 0:
+                    rate = rows / (time.perf_counter() - start)
+                    print(f"{kind}: {rows:,} rows ({rate:,.0f} rows/s)")
+        finally:
+            self.stats.rows[kind] = rows
+            self.stats.seconds[kind] = self.stats.seconds.get(kind, 0) + time.perf_counter() - start
+
+    def _skip(self, kind):
+        self.stats.skipped[kind] = self.stats.skipped.get(kind, 0) + 1
+
+
+if __name__ == "__main__":
+    from stack_overflow import StackOverflow
+
+    if len(sys.argv) != 2:
+        sys.exit("usage: python importer.py <dump directory>")
+    DumpImporter(StackOverflow()).import_directory(sys.argv[1]).report()
@@ -0,0 +1,123 @@
+from collections import deque
+from datetime import datetime, timedelta
+from threading import Lock
+
+from lock_stripes import NoLocks
+from skiplist import IndexableSkipList
+
+
+class ReputationWindow:
+    """Reputation earned over the last `days` days, ranked.
+
+    Changes are bucketed per day. When a day falls out of the window only
+    the users active on that day are re-keyed, so the window slides without
+    a recompute. Users with no net change in the window are not ranked.
+    """
+
+    def __init__(self, days):
+        self.days = days
+        self.ranked = IndexableSkipList()
+        self.scores = {}  # user id -> reputation earned in the window
+        self.buckets = deque()  # (day, {user id: change}), oldest first
+
+    def record(self, user_id, change, day):
+        self.expire(day)
+        if not self.buckets or self.buckets[-1][0] != day:
+            self.buckets.append((day, {}))
+        bucket = self.buckets[-1][1]
+        bucket[user_id] = bucket.get(user_id, 0) + change
+        self._adjust(user_id, change)
+
+    def expire(self, today):
+        oldest = today - timedelta(days=self.days - 1)
+        while self.buckets and self.buckets[0][0] < oldest:
+            _, bucket = self.buckets.popleft()
+            for user_id, change in bucket.items():
+                self._adjust(user_id, -change)
+
+    def _adjust(self, user_id, change):
+        old = self.scores.pop(user_id, 0)
+        if old:
+            self.ranked.remove((-old, user_id))
+        score = old + change
+        if score:
+            self.scores[user_id] = score
+            self.ranked.insert((-score, user_id))
+
+
+class Leaderboard:
+    """Users ranked by reputation, all time and over sliding windows.
+
+    Every ranking is an IndexableSkipList keyed by (-reputation, user id),
+    so a reputation change, the top K, a user's rank and the users around
+    a rank are all O(log n) (plus K for the listings). Ranks are 1-based.
+    """
+
+    ALL_TIME = None
+
+    def __init__(self, windows=None, clock=datetime.now, reputation_locks=None):
+        self.clock = clock
+        # taken by User.update_reputation around each change
+        self.reputation_locks = reputation_locks or NoLocks()
+        self.users = {}
+        self.ranked = IndexableSkipList()
+        self.keys = {}  # user id -> all-time key
+        if windows is None:
+            windows = {"week": 7, "month": 30}
+        self.windows = {name: ReputationWindow(days) for name, days in windows.items()}
+        self.lock = Lock()
+
+    def add_user(self, user):
+        with self.lock:
+            self.users[user.id] = user
+            key = (-user.reputation, user.id)
+            self.keys[user.id] = key
+            self.ranked.insert(key)
+        user.leaderboard = self
+
+    def record(self, user, change):
+        """Called by User.update_reputation after the reputation changed."""
+        day = self.clock().date()
+        with self.lock:
+            old = self.keys.get(user.id)
+            if old is None:
+                return
+            key = (-user.reputation, user.id)
+            if key != old:
+                self.ranked.remove(old)
+                self.ranked.insert(key)
+                self.keys[user.id] = key
+            for window in self.windows.values():
+                window.record(user.id, change, day)
+
+    def top(self, k=10, window=ALL_TIME):
+        """The `k` highest ranked users as (user, reputation) pairs."""
+        with self.lock:
+            return self._entries(self._ranking(window), 0, k)
+
+    def rank(self, user, window=ALL_TIME):
+        """1-based rank of `user`, or None if not ranked in `window`."""
+        with self.lock:
+            ranked = self._ranking(window)
+            if window is self.ALL_TIME:
+                key = self.keys.get(user.id)
+            else:
+                score = self.windows[window].scores.get(user.id)
+                key = (-score, user.id) if score else None
+            return ranked.rank(key) + 1 if key else None
+
+    def around(self, rank, radius=5, window=ALL_TIME):
+        """Users ranked within `radius` places of `rank`."""
+        with self.lock:
+            return self._entries(self._ranking(window), rank - 1 - radius, rank + radius)
+
+    def _ranking(self, window):
+        if window is self.ALL_TIME:
+            return self.ranked
+        if window not in self.windows:
+            raise ValueError(f"Unknown leaderboard window: {window}")
+        self.windows[window].expire(self.clock().date())
+        return self.windows[window].ranked
+
+    def _entries(self, ranked, start, stop):
+        return [(self.users[user_id], -score) for score, user_id in ranked.slice(start, stop)]
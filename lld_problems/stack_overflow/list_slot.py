@@ -0,0 +1,25 @@
+class ListSlot:
+    """A list attribute backed by the slot `_<name>`, allocated on first use.
+
+    Reading it always gives a real list that can be appended to, but a post
+    whose answers or comments nobody touches never allocates one.
+    """
+
+    def __set_name__(self, owner, name):
+        self.slot = owner.__dict__["_" + name]
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        try:
+            return self.slot.__get__(obj, owner)
+        except AttributeError:
+            items = self.fill(obj)
+            self.slot.__set__(obj, items)
+            return items
+
+    def __set__(self, obj, items):
+        self.slot.__set__(obj, items)
+
+    def fill(self, obj):
+        return []
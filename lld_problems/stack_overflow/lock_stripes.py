@@ -0,0 +1,26 @@
+from contextlib import nullcontext
+from threading import Lock
+
+
+class LockStripes:
+    """A fixed pool of locks shared out by hashing keys onto them.
+
+    Keys that land on different stripes never contend, and memory stays
+    at `stripes` locks however many keys there are.
+    """
+
+    def __init__(self, stripes=64):
+        self.locks = [Lock() for _ in range(stripes)]
+
+    def lock_for(self, key):
+        return self.locks[hash(key) % len(self.locks)]
+
+
+class NoLocks:
+    """Stand-in for LockStripes when only one thread touches the data."""
+
+    def __init__(self):
+        self.lock = nullcontext()
+
+    def lock_for(self, key):
+        return self.lock
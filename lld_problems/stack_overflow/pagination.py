@@ -0,0 +1,80 @@
+from collections.abc import Sequence
+
+from skiplist import IndexableSkipList
+
+
+class ListView(Sequence):
+    """Read-only window onto a list; nothing is copied."""
+
+    __slots__ = ("items",)
+
+    def __init__(self, items):
+        self.items = items
+
+    def __getitem__(self, index):
+        return self.items[index]
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __reversed__(self):
+        return reversed(self.items)
+
+
+def page_by_position(items, order="oldest", cursor=None, limit=20):
+    """One page of an append-only list and the cursor for the next page.
+
+    The cursor is the position to continue from, so appends never shift a
+    page and a page costs O(limit). It is None after the last page.
+    """
+    if order == "oldest":
+        start = cursor or 0
+        page = list(items[start:start + limit])
+        following = start + len(page)
+        return page, following if following < len(items) else None
+    if order == "newest":
+        start = len(items) - 1 if cursor is None else cursor
+        page = [items[i] for i in range(start, max(start - limit, -1), -1)]
+        following = start - len(page)
+        return page, following if following >= 0 else None
+    raise ValueError("order must be 'oldest' or 'newest'")
+
+
+class AnswerRanking:
+    """One question's answers sorted by votes, kept sorted as votes change.
+
+    Keys are (-score, answer id) in a skip list, so ties go to the older
+    answer and a vote re-keys an answer in O(log n). A cursor is the last
+    key returned, which keeps pages stable while votes move other answers
+    around.
+    """
+
+    def __init__(self, answers=()):
+        self.keys = {}
+        self.ranked = IndexableSkipList()
+        for answer in answers:
+            self.add(answer)
+
+    def add(self, answer):
+        key = (-answer.get_vote_count(), answer.id)
+        self.keys[answer.id] = key
+        self.ranked.insert(key)
+
+    def rescore(self, answer):
+        old = self.keys.get(answer.id)
+        key = (-answer.get_vote_count(), answer.id)
+        if old is None or key == old:
+            return
+        self.ranked.remove(old)
+        self.ranked.insert(key)
+        self.keys[answer.id] = key
+
+    def page(self, cursor=None, limit=20):
+        """Answer IDs, most votes first, and the next cursor."""
+        start = 0 if cursor is None else self.ranked.rank(cursor, inclusive=True)
+        keys = self.ranked.slice(start, start + limit)
+        more = start + limit < len(self.ranked)
+        return [answer_id for _, answer_id in keys], keys[-1] if keys and more else None
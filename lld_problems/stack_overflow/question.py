@@ -1,34 +1,58 @@
 from datetime import datetime
 from answer import Answer
 from tag import Tag
-from vote import Vote
+from vote import VoteTally
 from votable import Votable
 from commentable import Commentable
+from ids import ids
+from pagination import ListView
+from list_slot import ListSlot
 
 
 class Question(Votable, Commentable):
+    __slots__ = ("id", "author", "title", "content", "creation_date", "_answers", "tags", "_comments",
+                 "votes", "possible_duplicates", "__weakref__")
+    # lists allocated on first use; most posts never get any comments
+    answers = ListSlot()
+    comments = ListSlot()
+
     def __init__(self, author, title, content, tag_names):
-        self.id = id(self)
+        self.id = ids.next("questions")
         self.author = author
         self.title = title
         self.content = content
         self.creation_date = datetime.now()
-        self.answers = []
         # TODO understand
-        self.tags = [Tag(name) for name in tag_names]
+        # StackOverflow passes interned Tag objects; bare names still work
+        self.tags = [name if isinstance(name, Tag) else Tag(name) for name in tag_names]
+
+        self.votes = VoteTally()
+        # filled in by StackOverflow.ask_question; an empty tuple until then
+        self.possible_duplicates = ()
 
-        self.comments = []
-        self.votes = []
+    def edit(self, title=None, content=None, tag_names=None):
+        if title is not None:
+            self.title = title
+        if content is not None:
+            self.content = content
+        if tag_names is not None:
+            self.tags = [name if isinstance(name, Tag) else Tag(name) for name in tag_names]
 
     def vote(self, user, value):
         if value not in [-1, 1]:
             raise ValueError("Vote value must be either 1 or -1")
-        self.votes = [v for v in self.votes if v.user != user]
-        self.votes.append(Vote(user, value))
-        self.author.update_reputation(value * 5)  # +5 for upvote, -5 for downvote
+        previous = self.votes.cast(user.id, value)
+        # +5 for upvote, -5 for downvote; a changed vote only applies the difference
+        if self.author:
+            self.author.update_reputation((value - previous) * 5)
 
     def get_vote_count(self):
-        return sum(v.value for v in self.votes)
+        return self.votes.score
+
+    def retract_vote(self, user):
+        previous = self.votes.retract(user.id)
+        if self.author:
+            self.author.update_reputation(-previous * 5)
 
     def add_answer(self, answer:Answer):
         if answer not in self.answers:
@@ -38,4 +62,4 @@ class Question(Votable, Commentable):
         self.comments.append(comment)
     
     def get_comments(self):
-        return self.comments.copy()
+        return ListView(self.comments)
@@ -0,0 +1,113 @@
+import heapq
+import math
+from collections import OrderedDict
+
+from search_index import tokenize
+
+
+class BM25Ranker:
+    """Okapi BM25 over an InvertedIndex, with optional popularity boosts.
+
+    Scores are accumulated only over the postings of the query terms, then
+    multiplied by a boost from the question's vote count and whether it has
+    an accepted answer. Both are kept here by question ID and updated on
+    vote and accept, so ranking never loads a question. The best `k` come
+    out of a bounded heap, so nothing sorts the full candidate set.
+    """
+
+    def __init__(self, index, k1=1.2, b=0.75, vote_boost=0.1, accepted_boost=0.2):
+        self.index = index
+        self.k1 = k1
+        self.b = b
+        self.vote_boost = vote_boost
+        self.accepted_boost = accepted_boost
+        self.votes = {}  # question id -> vote count, when not 0
+        self.accepted = set()  # ids of questions with an accepted answer
+
+    def top_k(self, query, k=10):
+        index = self.index
+        total = len(index)
+        average_length = index.average_length or 1
+        scores = {}
+        for term in set(tokenize(query)):
+            posting = index.postings.get(term)
+            if not posting:
+                continue
+            idf = math.log(1 + (total - len(posting) + 0.5) / (len(posting) + 0.5))
+            for qid, frequency in posting.items():
+                norm = frequency + self.k1 * (1 - self.b + self.b * index.doc_length[qid] / average_length)
+                scores[qid] = scores.get(qid, 0) + idf * frequency * (self.k1 + 1) / norm
+        ranked = heapq.nlargest(k, ((score * self.boost(qid), qid) for qid, score in scores.items()))
+        return [qid for _, qid in ranked]
+
+    def boost(self, question_id):
+        boost = 1 + self.vote_boost * math.log1p(max(self.votes.get(question_id, 0), 0))
+        if question_id in self.accepted:
+            boost += self.accepted_boost
+        return boost
+
+    def set_votes(self, question_id, votes):
+        if votes:
+            self.votes[question_id] = votes
+        else:
+            self.votes.pop(question_id, None)
+
+    def set_accepted(self, question_id):
+        self.accepted.add(question_id)
+
+    def update(self, question):
+        """Read both signals off a loaded question, for bulk loads."""
+        self.set_votes(question.id, question.get_vote_count())
+        if any(answer.is_accepted for answer in question.answers):
+            self.accepted.add(question.id)
+
+
+class QueryCache:
+    """LRU cache of ranked results that is invalidated term by term.
+
+    Each entry is linked from every term in its query, so a new or edited
+    question only evicts the cached queries that share one of its terms;
+    everything else stays warm.
+    """
+
+    def __init__(self, capacity=1024):
+        self.capacity = capacity
+        self.entries = OrderedDict()  # (terms, k) -> question ids
+        self.by_term = {}  # term -> set of keys
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        results = self.entries.get(key)
+        if results is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return results
+
+    def put(self, key, results):
+        self.entries[key] = results
+        self.entries.move_to_end(key)
+        for term in key[0]:
+            self.by_term.setdefault(term, set()).add(key)
+        if len(self.entries) > self.capacity:
+            self._drop(next(iter(self.entries)))
+
+    def invalidate(self, terms):
+        for term in terms:
+            for key in list(self.by_term.get(term, ())):
+                self._drop(key)
+
+    def clear(self):
+        self.entries.clear()
+        self.by_term.clear()
+
+    def _drop(self, key):
+        self.entries.pop(key, None)
+        for term in key[0]:
+            keys = self.by_term.get(term)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.by_term[term]
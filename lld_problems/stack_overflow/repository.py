@@ -0,0 +1,547 @@
+import itertools
+import json
+from array import array
+import sqlite3
+import threading
+from threading import RLock
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime
+
+from answer import Answer
+from comment import Comment
+from question import Question
+from user import User
+from ids import ids
+from list_slot import ListSlot
+from vote import VoteTally, voters
+
+
+QUESTION, ANSWER = "question", "answer"
+
+
+def post_type(post):
+    return QUESTION if isinstance(post, Question) else ANSWER
+
+
+class Repository:
+    """Where StackOverflow keeps its users, questions, answers and comments.
+
+    This default keeps everything in dicts. Storage backends override the
+    `add_*` and `save_*` hooks StackOverflow calls after each change and
+    expose `users`, `questions` and `answers` as read-only mappings by ID.
+    """
+
+    def __init__(self):
+        self.users = {}
+        self.questions = {}
+        self.answers = {}
+
+    def attach(self, system):
+        """Load what is already stored into `system`'s indexes."""
+
+    def add_user(self, user):
+        self.users[user.id] = user
+
+    def add_question(self, question):
+        self.questions[question.id] = question
+
+    def add_answer(self, answer):
+        self.answers[answer.id] = answer
+
+    def add_comment(self, post, comment):
+        pass
+
+    def save_question(self, question):
+        pass
+
+    def save_reputation(self, user):
+        pass
+
+    def save_vote(self, post, user_id, value):
+        pass
+
+    def delete_vote(self, post, user_id):
+        pass
+
+    def save_accepted(self, answer):
+        pass
+
+    def save_signature(self, question_id, signature):
+        pass
+
+    @contextmanager
+    def transaction(self):
+        yield
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class IdentityMap:
+    """At most one live object per ID.
+
+    The `capacity` most recently used objects are held strongly; anything
+    else is found through a weak map for as long as some other object still
+    references it, so a post that is in use is never loaded twice.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.recent = OrderedDict()
+        self.live = weakref.WeakValueDictionary()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        obj = self.recent.get(key)
+        if obj is not None:
+            self.recent.move_to_end(key)
+        else:
+            obj = self.live.get(key)
+            if obj is None:
+                self.misses += 1
+                return None
+            self.put(key, obj)
+        self.hits += 1
+        return obj
+
+    def put(self, key, obj):
+        self.recent[key] = obj
+        self.recent.move_to_end(key)
+        self.live[key] = obj
+        if len(self.recent) > self.capacity:
+            self.recent.popitem(last=False)
+
+    def clear(self):
+        self.recent.clear()
+        self.live.clear()
+
+
+class LazyList(ListSlot):
+    """A list slot filled by `repository.<loader>(obj)` on first use.
+
+    Wraps the base class's slot of the same name, or the slot behind its
+    ListSlot, so a loaded object is no bigger than one built in memory.
+    """
+
+    def __init__(self, loader):
+        self.loader = loader
+
+    def __set_name__(self, owner, name):
+        slot = next(base.__dict__[name] for base in owner.__mro__[1:] if name in base.__dict__)
+        self.slot = slot.slot if isinstance(slot, ListSlot) else slot
+
+    def fill(self, obj):
+        return getattr(obj._repository, self.loader)(obj)
+
+
+class StoredUser(User):
+    __slots__ = ("_repository",)
+    question = LazyList("load_user_questions")
+    answer = LazyList("load_user_answers")
+    comments = LazyList("load_user_comments")
+
+
+class StoredQuestion(Question):
+    __slots__ = ("_repository",)
+    answers = LazyList("load_answers")
+    comments = LazyList("load_comments")
+
+
+class StoredAnswer(Answer):
+    __slots__ = ("_repository",)
+    comments = LazyList("load_comments")
+
+
+class StoredTable:
+    """Read-only mapping from ID to object, backed by one table."""
+
+    def __init__(self, repository, table, cache):
+        self.repository = repository
+        self.table = table
+        self.cache = cache
+
+    def get(self, key, default=None):
+        obj = self.cache.get(key)
+        if obj is None:
+            obj = self.repository.load(self.table, key)
+        return default if obj is None else obj
+
+    def __getitem__(self, key):
+        obj = self.get(key)
+        if obj is None:
+            raise KeyError(key)
+        return obj
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __len__(self):
+        return self.repository.count(self.table)
+
+    def __iter__(self):
+        return iter(self.repository.ids_of(self.table))
+
+    def values(self):
+        return iter(self.repository.load_all(self.table))
+
+
+class SqliteRepository(Repository):
+    """Repository in a local SQLite file.
+
+    Writes are queued and executed in batches of `batch_size` with
+    executemany, one transaction per batch; `transaction()` widens that to
+    everything written inside the block, rolled back if it raises. Every
+    statement is a constant, so sqlite3's per-connection statement cache
+    prepares each one once. Pending writes are flushed before any read.
+
+    Any thread may use the repository. A transaction() block belongs to the
+    thread that opened it: its writes are held aside, seen only by that
+    thread's reads, and written in one SQLite transaction when the block
+    ends, after whatever other threads wrote meanwhile. A rollback discards
+    them, but the StackOverflow built on this repository still holds the
+    block's changes in its objects and indexes. The identity maps are
+    emptied, so attach a new StackOverflow to the repository after a
+    rollback and drop the old one.
+
+    Loaded objects go through an LRU identity map of `cache_size` per kind.
+    Answers and comments of a loaded post, and a loaded user's posts, are
+    only queried when first accessed. attach() is the exception: it reads
+    each table, votes included, with one query to rebuild the indexes.
+    MinHash signatures are stored too, so attach() only hashes questions
+    that have none yet for the duplicate detector's current settings.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY, username TEXT, email TEXT, reputation INTEGER);
+        CREATE TABLE IF NOT EXISTS questions (
+            id INTEGER PRIMARY KEY, author_id INTEGER, title TEXT, content TEXT,
+            tags TEXT, created TEXT);
+        CREATE TABLE IF NOT EXISTS answers (
+            id INTEGER PRIMARY KEY, question_id INTEGER, author_id INTEGER, content TEXT,
+            created TEXT, accepted INTEGER);
+        CREATE TABLE IF NOT EXISTS comments (
+            id INTEGER PRIMARY KEY, post_type TEXT, post_id INTEGER, author_id INTEGER,
+            content TEXT, created TEXT);
+        CREATE TABLE IF NOT EXISTS votes (
+            post_type TEXT, post_id INTEGER, user_id INTEGER, value INTEGER,
+            PRIMARY KEY (post_type, post_id, user_id)) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS signatures (question_id INTEGER PRIMARY KEY, minhash BLOB);
+        CREATE TABLE IF NOT EXISTS settings (name TEXT PRIMARY KEY, value TEXT);
+        CREATE INDEX IF NOT EXISTS questions_by_author ON questions (author_id);
+        CREATE INDEX IF NOT EXISTS answers_by_question ON answers (question_id);
+        CREATE INDEX IF NOT EXISTS answers_by_author ON answers (author_id);
+        CREATE INDEX IF NOT EXISTS comments_by_post ON comments (post_type, post_id);
+        CREATE INDEX IF NOT EXISTS comments_by_author ON comments (author_id);
+    """
+
+    INSERT_USER = "INSERT INTO users VALUES (?, ?, ?, ?)"
+    INSERT_QUESTION = "INSERT INTO questions VALUES (?, ?, ?, ?, ?, ?)"
+    INSERT_ANSWER = "INSERT INTO answers VALUES (?, ?, ?, ?, ?, ?)"
+    INSERT_COMMENT = "INSERT INTO comments VALUES (?, ?, ?, ?, ?, ?)"
+    UPDATE_QUESTION = "UPDATE questions SET title = ?, content = ?, tags = ? WHERE id = ?"
+    UPDATE_REPUTATION = "UPDATE users SET reputation = ? WHERE id = ?"
+    UPDATE_ACCEPTED = "UPDATE answers SET accepted = 1 WHERE id = ?"
+    UPSERT_VOTE = "INSERT OR REPLACE INTO votes VALUES (?, ?, ?, ?)"
+    DELETE_VOTE = "DELETE FROM votes WHERE post_type = ? AND post_id = ? AND user_id = ?"
+    SELECT_VOTES = "SELECT user_id, value FROM votes WHERE post_type = ? AND post_id = ?"
+    UPSERT_SIGNATURE = "INSERT OR REPLACE INTO signatures VALUES (?, ?)"
+    UPSERT_SETTING = "INSERT OR REPLACE INTO settings VALUES (?, ?)"
+    CLEAR_SIGNATURES = "DELETE FROM signatures"
+
+    def __init__(self, path, batch_size=1000, cache_size=10_000):
+        # shared by all threads; every use of it holds self.lock
+        self.connection = sqlite3.connect(path, cached_statements=256, check_same_thread=False)
+        self.lock = RLock()
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+        self.connection.executescript(self.SCHEMA)
+        self.batch_size = batch_size
+        self.pending = []  # (statement, parameters) made outside transaction(), in order
+        # per thread: transaction() depth and the block's writes, applied on commit
+        self.local = threading.local()
+        self.tag_registry = None
+        self.caches = {table: IdentityMap(cache_size) for table in ("users", "questions", "answers")}
+        self.users = StoredTable(self, "users", self.caches["users"])
+        self.questions = StoredTable(self, "questions", self.caches["questions"])
+        self.answers = StoredTable(self, "answers", self.caches["answers"])
+        # stored users skip User.__init__, so tallies find their voters here
+        voters.sources.append(self.users.get)
+        for kind in ("users", "questions", "answers", "comments"):
+            last = self.connection.execute(f"SELECT MAX(id) FROM {kind}").fetchone()[0]
+            ids.advance(kind, last or 0)
+
+    def attach(self, system):
+        self.tag_registry = system.tag_registry
+        with self.lock:
+            votes = {}
+            for kind, post_id, user_id, value in self._read("SELECT * FROM votes"):
+                tally = votes.get((kind, post_id))
+                if tally is None:
+                    tally = votes[(kind, post_id)] = VoteTally()
+                tally.cast(user_id, value)
+            users = self.load_all("users")
+            questions = {}
+            for row in self._read("SELECT * FROM questions ORDER BY id"):
+                question = self.caches["questions"].get(row[0])
+                if question is None:
+                    question = self._question_from_row(row, votes.get((QUESTION, row[0]), VoteTally()))
+                questions[question.id] = question
+            answers = {}
+            for row in self._read("SELECT * FROM answers ORDER BY id"):
+                question = questions.get(row[1])
+                if question is None:
+                    continue
+                answer = self.caches["answers"].get(row[0])
+                if answer is None:
+                    answer = self._answer_from_row(row, question, votes.get((ANSWER, row[0]), VoteTally()))
+                answers.setdefault(question.id, []).append(answer)
+            # fill the lazy answer lists now, so the indexes below don't query
+            for question in questions.values():
+                question.answers = answers.get(question.id) or []
+        for user in users:
+            system.leaderboard.add_user(user)
+        signatures = self._load_signatures(system.duplicates.scheme)
+        for question in questions.values():
+            system.tag_index.add(question)
+            system.feeds.add(question)
+            system.search_index.add(question)
+            system.ranker.update(question)
+            if question.id in signatures:
+                signature = signatures[question.id]
+            else:
+                # stored before signatures were, or with other detector settings
+                signature = system.duplicates.signature(question.title, question.content)
+                self.save_signature(question.id, signature)
+            system.duplicates.add_signature(question.id, signature)
+
+    def add_user(self, user):
+        self.caches["users"].put(user.id, user)
+        self._write(self.INSERT_USER, (user.id, user.username, user.email, user.reputation))
+
+    def add_question(self, question):
+        self.caches["questions"].put(question.id, question)
+        self._write(self.INSERT_QUESTION, (
+            question.id, self._id_of(question.author), question.title, question.content,
+            json.dumps([tag.name for tag in question.tags]), question.creation_date.isoformat()))
+
+    def add_answer(self, answer):
+        self.caches["answers"].put(answer.id, answer)
+        self._write(self.INSERT_ANSWER, (
+            answer.id, answer.question.id, self._id_of(answer.author), answer.content,
+            answer.creation_date.isoformat(), int(answer.is_accepted)))
+
+    def add_comment(self, post, comment):
+        self._write(self.INSERT_COMMENT, (
+            comment.id, post_type(post), post.id, self._id_of(comment.author),
+            comment.content, comment.creation_date.isoformat()))
+
+    def save_question(self, question):
+        self._write(self.UPDATE_QUESTION, (
+            question.title, question.content, json.dumps([tag.name for tag in question.tags]), question.id))
+
+    def save_reputation(self, user):
+        if user is None:
+            return
+        # read under the lock so the last queued write carries the latest value
+        with self.lock:
+            self._write(self.UPDATE_REPUTATION, (user.reputation, user.id))
+
+    def save_vote(self, post, user_id, value):
+        self._write(self.UPSERT_VOTE, (post_type(post), post.id, user_id, value))
+
+    def delete_vote(self, post, user_id):
+        self._write(self.DELETE_VOTE, (post_type(post), post.id, user_id))
+
+    def save_accepted(self, answer):
+        self._write(self.UPDATE_ACCEPTED, (answer.id,))
+
+    def save_signature(self, question_id, signature):
+        # NULL records a question with no words, so it isn't hashed again
+        minhash = None if signature is None else array("Q", signature).tobytes()
+        self._write(self.UPSERT_SIGNATURE, (question_id, minhash))
+
+    @contextmanager
+    def transaction(self):
+        local = self.local
+        depth = getattr(local, "depth", 0)
+        if depth == 0:
+            local.writes = []
+        local.depth = depth + 1
+        try:
+            yield
+        except BaseException:
+            local.depth = depth
+            if depth == 0:
+                local.writes = None
+                self._rolled_back()
+            raise
+        local.depth = depth
+        if depth == 0:
+            writes, local.writes = local.writes, None
+            with self.lock:
+                self.flush()
+                self._execute(writes)
+                self.connection.commit()
+
+    def flush(self):
+        with self.lock:
+            pending, self.pending = self.pending, []
+            self._execute(pending)
+            self.connection.commit()
+
+    def close(self):
+        voters.sources.remove(self.users.get)
+        with self.lock:
+            self.flush()
+            self.connection.close()
+
+    def _load_signatures(self, scheme):
+        """Stored MinHash signatures by question ID, if made with `scheme`."""
+        with self.lock:
+            stored = self._read("SELECT value FROM settings WHERE name = 'minhash'")
+            if stored != [(scheme,)]:
+                self._write(self.CLEAR_SIGNATURES, ())
+                self._write(self.UPSERT_SETTING, ("minhash", scheme))
+                return {}
+            return {question_id: None if minhash is None else tuple(array("Q", minhash))
+                    for question_id, minhash in self._read("SELECT * FROM signatures")}
+
+    def count(self, table):
+        return self._read(f"SELECT COUNT(*) FROM {table}")[0][0]
+
+    def ids_of(self, table):
+        return [row[0] for row in self._read(f"SELECT id FROM {table} ORDER BY id")]
+
+    def load_all(self, table):
+        """Every object in `table`, read with one query."""
+        cache = self.caches[table]
+        build = getattr(self, "_" + table[:-1] + "_from_row")
+        with self.lock:
+            return [cache.get(row[0]) or build(row) for row in self._read(f"SELECT * FROM {table} ORDER BY id")]
+
+    def load(self, table, key):
+        with self.lock:
+            # another thread may have loaded it while we waited
+            obj = self.caches[table].get(key)
+            if obj is not None:
+                return obj
+            rows = self._read(f"SELECT * FROM {table} WHERE id = ?", (key,))
+            if not rows:
+                return None
+            return getattr(self, "_" + table[:-1] + "_from_row")(rows[0])
+
+    def load_user_questions(self, user):
+        rows = self._read("SELECT id FROM questions WHERE author_id = ? ORDER BY id", (user.id,))
+        return [self.questions[question_id] for question_id, in rows]
+
+    def load_user_answers(self, user):
+        rows = self._read("SELECT id FROM answers WHERE author_id = ? ORDER BY id", (user.id,))
+        return [self.answers[answer_id] for answer_id, in rows]
+
+    def load_user_comments(self, user):
+        rows = self._read("SELECT * FROM comments WHERE author_id = ? ORDER BY id", (user.id,))
+        return [self._comment_from_row(row, user) for row in rows]
+
+    def load_answers(self, question):
+        cache = self.caches["answers"]
+        rows = self._read("SELECT * FROM answers WHERE question_id = ? ORDER BY id", (question.id,))
+        return [cache.get(row[0]) or self._answer_from_row(row, question) for row in rows]
+
+    def load_comments(self, post):
+        rows = self._read("SELECT * FROM comments WHERE post_type = ? AND post_id = ? ORDER BY id",
+                          (post_type(post), post.id))
+        return [self._comment_from_row(row) for row in rows]
+
+    def _user_from_row(self, row):
+        user = StoredUser.__new__(StoredUser)
+        user._repository = self
+        user.id, user.username, user.email, user.reputation = row
+        user.leaderboard = None
+        self.caches["users"].put(user.id, user)
+        return user
+
+    def _question_from_row(self, row, votes=None):
+        question = StoredQuestion.__new__(StoredQuestion)
+        question._repository = self
+        question.id, author_id, question.title, question.content, tags, created = row
+        question.author = self.users.get(author_id)
+        question.tags = self.tag_registry.intern_all(json.loads(tags))
+        question.creation_date = datetime.fromisoformat(created)
+        question.votes = self._votes(QUESTION, question.id) if votes is None else votes
+        question.possible_duplicates = ()
+        self.caches["questions"].put(question.id, question)
+        return question
+
+    def _answer_from_row(self, row, question=None, votes=None):
+        answer = StoredAnswer.__new__(StoredAnswer)
+        answer._repository = self
+        answer.id, question_id, author_id, answer.content, created, accepted = row
+        answer.question = question or self.questions[question_id]
+        answer.author = self.users.get(author_id)
+        answer.creation_date = datetime.fromisoformat(created)
+        answer.is_accepted = bool(accepted)
+        answer.votes = self._votes(ANSWER, answer.id) if votes is None else votes
+        self.caches["answers"].put(answer.id, answer)
+        return answer
+
+    def _comment_from_row(self, row, author=None):
+        comment_id, _, _, author_id, content, created = row
+        comment = Comment.__new__(Comment)
+        comment.id, comment.content = comment_id, content
+        comment.author = author or self.users.get(author_id)
+        comment.creation_date = datetime.fromisoformat(created)
+        return comment
+
+    def _votes(self, kind, post_id):
+        votes = VoteTally()
+        for user_id, value in self._read(self.SELECT_VOTES, (kind, post_id)):
+            votes.cast(user_id, value)
+        return votes
+
+    def _write(self, statement, parameters):
+        writes = getattr(self.local, "writes", None)
+        if writes is not None:
+            writes.append((statement, parameters))
+            return
+        with self.lock:
+            self.pending.append((statement, parameters))
+            if len(self.pending) >= self.batch_size:
+                self.flush()
+
+    def _read(self, query, parameters=()):
+        writes = getattr(self.local, "writes", None)
+        with self.lock:
+            if self.pending:
+                self.flush()
+            if not writes:
+                return self.connection.execute(query, parameters).fetchall()
+            # this thread's open transaction is applied for the read only, so
+            # it sees its own writes and nobody else does
+            self._execute(writes)
+            try:
+                return self.connection.execute(query, parameters).fetchall()
+            finally:
+                self.connection.rollback()
+
+    def _execute(self, writes):
+        for statement, rows in itertools.groupby(writes, key=lambda write: write[0]):
+            self.connection.executemany(statement, [parameters for _, parameters in rows])
+
+    def _rolled_back(self):
+        # Objects changed in the block, and every index built from them, no
+        # longer match the database. Forget them all, so attaching a new
+        # StackOverflow rebuilds from what is stored.
+        with self.lock:
+            for cache in self.caches.values():
+                cache.clear()
+
+    @staticmethod
+    def _id_of(user):
+        return user.id if user else None
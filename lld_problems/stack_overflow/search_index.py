@@ -0,0 +1,91 @@
+import re
+
+
+TOKEN = re.compile(r"[a-z0-9+#]+")
+# a term in the title or a tag says more about a question than one in the body
+TITLE_WEIGHT = 3
+TAG_WEIGHT = 2
+
+
+def tokenize(text):
+    return TOKEN.findall(text.lower())
+
+
+class InvertedIndex:
+    """Term -> questions index over titles, bodies and tag names.
+
+    Postings are insertion-ordered dicts from question ID to the term's
+    field-weighted frequency, so they keep the order questions were asked
+    in, answer membership in O(1) and carry what BM25 ranking needs.
+    An AND query walks the shortest posting list and probes the others; an
+    OR query merges the lists. Either way the work is proportional to the
+    postings touched, not to the number of questions.
+    """
+
+    def __init__(self):
+        self.postings = {}  # term -> {question id: weighted term frequency}
+        self.doc_terms = {}  # question id -> terms, for re-indexing
+        self.doc_length = {}  # question id -> sum of weighted frequencies
+        self.doc_order = {}  # question id -> insertion sequence
+        self.total_length = 0
+
+    def add(self, question):
+        frequencies = self.term_frequencies(question)
+        self.doc_order.setdefault(question.id, len(self.doc_order))
+        self.doc_terms[question.id] = list(frequencies)
+        self.doc_length[question.id] = sum(frequencies.values())
+        self.total_length += self.doc_length[question.id]
+        for term, frequency in frequencies.items():
+            self.postings.setdefault(term, {})[question.id] = frequency
+        return set(frequencies)
+
+    def remove(self, question_id):
+        terms = self.doc_terms.pop(question_id, ())
+        self.total_length -= self.doc_length.pop(question_id, 0)
+        for term in terms:
+            posting = self.postings[term]
+            del posting[question_id]
+            if not posting:
+                del self.postings[term]
+        return set(terms)
+
+    def update(self, question):
+        """Re-index an edited question; returns every term it had or has."""
+        return self.remove(question.id) | self.add(question)
+
+    def __len__(self):
+        return len(self.doc_terms)
+
+    @property
+    def average_length(self):
+        return self.total_length / len(self.doc_terms) if self.doc_terms else 0
+
+    def search(self, query, match="all"):
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+        if match == "all":
+            if any(term not in self.postings for term in terms):
+                return []
+            lists = sorted((self.postings[term] for term in terms), key=len)
+            shortest, rest = lists[0], lists[1:]
+            found = [qid for qid in shortest if all(qid in posting for posting in rest)]
+        elif match == "any":
+            found = set()
+            for term in terms:
+                found.update(self.postings.get(term, ()))
+        else:
+            raise ValueError("match must be 'all' or 'any'")
+        return sorted(found, key=self.doc_order.__getitem__)
+
+    @staticmethod
+    def term_frequencies(question):
+        frequencies = {}
+        for term in tokenize(question.content):
+            frequencies[term] = frequencies.get(term, 0) + 1
+        for term in tokenize(question.title):
+            frequencies[term] = frequencies.get(term, 0) + TITLE_WEIGHT
+        for tag in question.tags:
+            for term in {tag.name.lower(), *tokenize(tag.name)}:
+                frequencies[term] = frequencies.get(term, 0) + TAG_WEIGHT
+        return frequencies
@@ -0,0 +1,126 @@
+import random
+
+
+class _Node:
+    __slots__ = ("key", "next", "width")
+
+    def __init__(self, key, level):
+        self.key = key
+        self.next = [None] * level
+        self.width = [1] * level
+
+
+class IndexableSkipList:
+    """Sorted collection of unique keys with positional access.
+
+    Every link records how many bottom-level steps it skips, so insert,
+    remove, rank lookup and "the i-th key" are all O(log n) expected, and
+    reading K consecutive keys from any rank is O(log n + K).
+    """
+
+    MAX_LEVEL = 32
+
+    def __init__(self, seed=None):
+        self.tail = _Node(None, 0)
+        self.head = _Node(None, self.MAX_LEVEL)
+        self.head.next = [self.tail] * self.MAX_LEVEL
+        self.size = 0
+        self.random = random.Random(seed)
+
+    def __len__(self):
+        return self.size
+
+    def insert(self, key):
+        chain, steps_at_level = self._find(key)
+        level = 1
+        while level < self.MAX_LEVEL and self.random.random() < 0.5:
+            level += 1
+        node = _Node(key, level)
+        steps = 0
+        for i in range(level):
+            prev = chain[i]
+            node.next[i] = prev.next[i]
+            prev.next[i] = node
+            node.width[i] = prev.width[i] - steps
+            prev.width[i] = steps + 1
+            steps += steps_at_level[i]
+        for i in range(level, self.MAX_LEVEL):
+            chain[i].width[i] += 1
+        self.size += 1
+
+    def remove(self, key):
+        chain, _ = self._find(key)
+        node = chain[0].next[0]
+        if node is self.tail or node.key != key:
+            raise KeyError(key)
+        for i in range(len(node.next)):
+            prev = chain[i]
+            prev.width[i] += node.width[i] - 1
+            prev.next[i] = node.next[i]
+        for i in range(len(node.next), self.MAX_LEVEL):
+            chain[i].width[i] -= 1
+        self.size -= 1
+
+    def rank(self, key, inclusive=False):
+        """Number of keys smaller than `key`, or not larger if `inclusive`.
+
+        Like bisect_left and bisect_right on a sorted list.
+        """
+        if not inclusive:
+            _, steps_at_level = self._find(key)
+            return sum(steps_at_level)
+        steps = 0
+        node = self.head
+        tail = self.tail
+        for i in range(self.MAX_LEVEL - 1, -1, -1):
+            while node.next[i] is not tail and node.next[i].key <= key:
+                steps += node.width[i]
+                node = node.next[i]
+        return steps
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError(index)
+        return self._node_at(index).key
+
+    def slice(self, start, stop):
+        """Keys at ranks start .. stop-1."""
+        start = max(start, 0)
+        stop = min(stop, self.size)
+        if start >= stop:
+            return []
+        node = self._node_at(start)
+        keys = []
+        for _ in range(stop - start):
+            keys.append(node.key)
+            node = node.next[0]
+        return keys
+
+    def __iter__(self):
+        node = self.head.next[0]
+        while node is not self.tail:
+            yield node.key
+            node = node.next[0]
+
+    def _find(self, key):
+        chain = [None] * self.MAX_LEVEL
+        steps_at_level = [0] * self.MAX_LEVEL
+        node = self.head
+        tail = self.tail
+        for i in range(self.MAX_LEVEL - 1, -1, -1):
+            while node.next[i] is not tail and node.next[i].key < key:
+                steps_at_level[i] += node.width[i]
+                node = node.next[i]
+            chain[i] = node
+        return chain, steps_at_level
+
+    def _node_at(self, index):
+        node = self.head
+        remaining = index + 1
+        for i in range(self.MAX_LEVEL - 1, -1, -1):
+            while node.width[i] <= remaining and node.next[i] is not self.tail:
+                remaining -= node.width[i]
+                node = node.next[i]
+        return node
@@ -1,49 +1,205 @@
+from contextlib import nullcontext
+from threading import Lock
+
 from user import User
 from question import Question
 from answer import Answer
+from duplicates import DuplicateDetector
+from feeds import QuestionFeeds
+from leaderboard import Leaderboard
+from lock_stripes import LockStripes, NoLocks
+from pagination import AnswerRanking, page_by_position
+from repository import Repository
+from ranking import BM25Ranker, QueryCache
+from search_index import InvertedIndex, tokenize
+from tag import TagRegistry
+from tag_index import TagIndex
 
 class StackOverflow:
-    def __init__(self):
-        self.users = {}
-        self.questions = {}
-        self.answers = {}
-        self.tags = {}
+    def __init__(self, repository=None, thread_safe=False, stripes=64):
+        # a Repository keeps the posts; pass a SqliteRepository to store them on disk
+        self.repository = repository or Repository()
+        self.users = self.repository.users
+        self.questions = self.repository.questions
+        self.answers = self.repository.answers
+        self.tag_registry = TagRegistry()
+        self.tags = self.tag_registry.tags
+        self.tag_index = TagIndex()
+        self.search_index = InvertedIndex()
+        self.ranker = BM25Ranker(self.search_index)
+        self.search_cache = QueryCache()
+        self.feeds = QuestionFeeds()
+        self.duplicates = DuplicateDetector()
+        self.leaderboard = Leaderboard(reputation_locks=LockStripes(stripes) if thread_safe else None)
+        self.answer_rankings = {}  # question id -> AnswerRanking, built on first use
+        # In thread-safe mode a post's votes, answers and accept flag change
+        # under that post's stripe lock, so writers on different posts run in
+        # parallel; the shared search, tag and feed indexes take one lock for
+        # the short time it takes to re-key a post. Reputation changes take a
+        # striped lock per user, and the leaderboard locks itself.
+        self.post_locks = LockStripes(stripes) if thread_safe else NoLocks()
+        self.index_lock = Lock() if thread_safe else nullcontext()
+        self.repository.attach(self)
     
     def create_user(self, username, email):
-        user_id = len(self.users) + 1
         user = User(email=email, username=username)
-        self.users[user_id] = user
+        self.repository.add_user(user)
+        self.leaderboard.add_user(user)
         return user
     
     def ask_question(self, user:User, title, content, tags):
-        question = user.ask_question(title, content, tags)
-        self.questions[question.id] = question
-        for tag in question.tags:
-            self.tags.setdefault(tag.name, tag)
+        question = user.ask_question(title, content, self.tag_registry.intern_all(tags))
+        self.repository.add_question(question)
+        self.repository.save_reputation(user)
+        # MinHash is the slow part, so it runs before taking the index lock
+        signature = self.duplicates.signature(title, content)
+        self.repository.save_signature(question.id, signature)
+        with self.index_lock:
+            # looked up before the question is indexed, so it can't match itself
+            matches = self.duplicates.find_signature(signature)
+            self.duplicates.add_signature(question.id, signature)
+            self.tag_index.add(question)
+            self.feeds.add(question)
+            self.search_cache.invalidate(self.search_index.add(question))
+        question.possible_duplicates = [self.questions[qid] for qid, _ in matches]
+        return question
+
+    def edit_question(self, question: Question, title=None, content=None, tags=None):
+        if tags is not None:
+            tags = self.tag_registry.intern_all(tags)
+        with self.post_locks.lock_for(question.id):
+            question.edit(title, content, tags)
+            self.repository.save_question(question)
+            signature = self.duplicates.signature(question.title, question.content)
+            self.repository.save_signature(question.id, signature)
+        with self.index_lock:
+            self.duplicates.update(question, signature)
+            self.tag_index.update_tags(question)
+            self.search_cache.invalidate(self.search_index.update(question))
         return question
 
     def answer_question(self, user, question, content):
-        answer = user.answer_question(question, content)
-        self.answers[answer.id] = answer
+        with self.post_locks.lock_for(question.id):
+            answer = user.answer_question(question, content)
+            self.repository.add_answer(answer)
+        self.repository.save_reputation(user)
+        with self.index_lock:
+            self.feeds.update(question)
+            if question.id in self.answer_rankings:
+                self.answer_rankings[question.id].add(answer)
         return answer
 
     def add_comment(self, user:User, commentable, content):
-        return user.comment_on(commentable, content)
+        with self.post_locks.lock_for(commentable.id):
+            comment = user.comment_on(commentable, content)
+            self.repository.add_comment(commentable, comment)
+        self.repository.save_reputation(user)
+        return comment
 
     def vote_question(self, user:User, question: Question, value):
-        question.vote(user, value)
+        with self.post_locks.lock_for(question.id):
+            question.vote(user, value)
+            self.repository.save_vote(question, user.id, value)
+        self.repository.save_reputation(question.author)
+        self._rescore_question(question)
+
+    def retract_question_vote(self, user:User, question: Question):
+        with self.post_locks.lock_for(question.id):
+            question.retract_vote(user)
+            self.repository.delete_vote(question, user.id)
+        self.repository.save_reputation(question.author)
+        self._rescore_question(question)
 
     def vote_answer(self, user:User, answer:Answer, value):
-        answer.vote(user, value)
+        with self.post_locks.lock_for(answer.id):
+            answer.vote(user, value)
+            self.repository.save_vote(answer, user.id, value)
+        self.repository.save_reputation(answer.author)
+        self._rescore_answer(answer)
+
+    def retract_answer_vote(self, user:User, answer:Answer):
+        with self.post_locks.lock_for(answer.id):
+            answer.retract_vote(user)
+            self.repository.delete_vote(answer, user.id)
+        self.repository.save_reputation(answer.author)
+        self._rescore_answer(answer)
 
     def accept_answer(self, answer:Answer):
-        answer.accept()
+        with self.post_locks.lock_for(answer.id):
+            answer.accept()
+            self.repository.save_accepted(answer)
+        self.repository.save_reputation(answer.author)
+        with self.index_lock:
+            self.feeds.update(answer.question)
+            self.ranker.set_accepted(answer.question.id)
+            self.search_cache.invalidate(self.search_index.doc_terms.get(answer.question.id, ()))
     
-    def search_questions(self, query):
-        return [q for q in self.questions.values() if 
-                query.lower() in q.title.lower() or
-                query.lower() in q.content.lower() or
-                any(query.lower() == tag.name.lower() for tag in q.tags)]
+    def search_questions(self, query, match="all"):
+        # match="all" needs every query term, match="any" at least one
+        with self.index_lock:
+            ids = self.search_index.search(query, match)
+        return [self.questions[qid] for qid in ids]
+
+    def search_ranked(self, query, k=10):
+        """Top `k` questions by BM25 relevance, best first."""
+        key = (tuple(sorted(set(tokenize(query)))), k)
+        with self.index_lock:
+            ids = self.search_cache.get(key)
+            if ids is None:
+                ids = self.ranker.top_k(query, k)
+                self.search_cache.put(key, ids)
+        return [self.questions[qid] for qid in ids]
+
+    def find_duplicates(self, title, content, k=5):
+        """Existing questions that look like near-duplicates, as (question, similarity)."""
+        with self.index_lock:
+            matches = self.duplicates.find(title, content, k)
+        return [(self.questions[qid], similarity) for qid, similarity in matches]
+
+    def hot_questions(self, k=20):
+        with self.index_lock:
+            ids = self.feeds.top_hot(k)
+        return [self.questions[qid] for qid in ids]
+
+    def top_questions_this_week(self, k=20):
+        with self.index_lock:
+            ids = self.feeds.top_this_week(k)
+        return [self.questions[qid] for qid in ids]
+
+    def unanswered_questions(self, k=20):
+        """Newest `k` questions that have no answer yet."""
+        with self.index_lock:
+            ids = self.feeds.newest_unanswered(k)
+        return [self.questions[qid] for qid in ids]
+
+    def top_users(self, k=10, window=None):
+        """Highest reputation users as (user, reputation); window is None, "week" or "month"."""
+        return self.leaderboard.top(k, window)
+
+    def user_rank(self, user, window=None):
+        return self.leaderboard.rank(user, window)
+
+    def users_around_rank(self, rank, radius=5, window=None):
+        return self.leaderboard.around(rank, radius, window)
+
+    def get_answers(self, question, order="oldest", cursor=None, limit=20):
+        """One page of `question`'s answers and the cursor for the next page.
+
+        `order` is "oldest", "newest" or "votes"; the cursor is None on the
+        last page.
+        """
+        if order != "votes":
+            return page_by_position(question.answers, order, cursor, limit)
+        with self.index_lock:
+            ranking = self.answer_rankings.get(question.id)
+            if ranking is None:
+                ranking = self.answer_rankings[question.id] = AnswerRanking(question.answers)
+            ids, cursor = ranking.page(cursor, limit)
+        return [self.answers[answer_id] for answer_id in ids], cursor
+
+    def get_comments(self, post, order="oldest", cursor=None, limit=20):
+        """One page of comments on a question or answer, "oldest" or "newest" first."""
+        return page_by_position(post.comments, order, cursor, limit)
 
     def get_questions_by_user(self, user: User):
         return user.question
@@ -58,4 +214,44 @@ class StackOverflow:
         return self.answers.get(answer_id)
 
     def get_tag(self, name: str):
-        return self.tags.get(name)
+        return self.tag_registry.get(name)
+
+    def get_questions_by_tag(self, name, order="newest", cursor=None, limit=20):
+        """One page of questions tagged `name` and the cursor for the next page.
+
+        `order` is "newest" or "score"; pass the returned cursor back to
+        continue, it is None on the last page.
+        """
+        tag = self.tag_registry.get(name)
+        if tag is None:
+            return [], None
+        if order not in ("newest", "score"):
+            raise ValueError("order must be 'newest' or 'score'")
+        with self.index_lock:
+            if order == "newest":
+                ids, cursor = self.tag_index.newest(tag.name, cursor, limit)
+            else:
+                ids, cursor = self.tag_index.top_scored(tag.name, cursor, limit)
+        return [self.questions[qid] for qid in ids], cursor
+
+    def related_tags(self, name, k=10):
+        """Tags most often used alongside `name`, as (name, count) pairs."""
+        tag = self.tag_registry.get(name)
+        if tag is None:
+            return []
+        with self.index_lock:
+            return self.tag_index.related(tag.name, k)
+
+    def _rescore_question(self, question):
+        with self.index_lock:
+            self.tag_index.rescore(question)
+            self.feeds.update(question)
+            self.ranker.set_votes(question.id, question.get_vote_count())
+            # the vote boost moves this question within every query it matches
+            self.search_cache.invalidate(self.search_index.doc_terms.get(question.id, ()))
+
+    def _rescore_answer(self, answer):
+        with self.index_lock:
+            ranking = self.answer_rankings.get(answer.question.id)
+            if ranking:
+                ranking.rescore(answer)
@@ -1,4 +1,38 @@
+from ids import ids
+
+
 class Tag:
+    __slots__ = ("id", "name")
+
     def __init__(self, name: str):
-        self.id = id(self)
+        self.id = ids.next("tags")
         self.name = name
+
+
+def normalize_tag(name):
+    return name.strip().lower()
+
+
+class TagRegistry:
+    """Hands out one shared Tag per (case-insensitive) name."""
+
+    def __init__(self):
+        self.tags = {}  # normalized name -> Tag
+
+    def intern(self, tag):
+        if isinstance(tag, Tag):
+            return self.tags.setdefault(normalize_tag(tag.name), tag)
+        name = normalize_tag(tag)
+        # setdefault so two threads interning a new name agree on one Tag
+        return self.tags.get(name) or self.tags.setdefault(name, Tag(name))
+
+    def intern_all(self, tags):
+        interned = []
+        for tag in tags:
+            tag = self.intern(tag)
+            if tag not in interned:
+                interned.append(tag)
+        return interned
+
+    def get(self, name):
+        return self.tags.get(normalize_tag(name))
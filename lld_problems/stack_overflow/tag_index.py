@@ -0,0 +1,108 @@
+import bisect
+import heapq
+
+from skiplist import IndexableSkipList
+
+
+class TagIndex:
+    """Questions per tag, by recency and by score, plus tag co-occurrence.
+
+    Recency keys are (sequence, question id) in a sorted list per tag;
+    new questions only ever append to it. Score keys are (-score, sequence,
+    question id) in a skip list per tag, re-keyed on every vote in
+    O(log n). A page cursor is the last key returned, so pages stay stable
+    while new questions arrive.
+    """
+
+    def __init__(self):
+        self.recent = {}  # tag name -> sorted [(sequence, question id)]
+        self.by_score = {}  # tag name -> IndexableSkipList of (-score, sequence, question id)
+        self.score_keys = {}  # question id -> current score key
+        self.co_occurrence = {}  # tag name -> {other tag name: questions with both}
+        self.question_tags = {}  # question id -> tag names
+        self.sequence = 0
+
+    def add(self, question):
+        self.sequence += 1
+        key = (-question.get_vote_count(), self.sequence, question.id)
+        self.score_keys[question.id] = key
+        names = [tag.name for tag in question.tags]
+        self.question_tags[question.id] = names
+        for name in names:
+            self._link(name, question.id, key)
+        self._count_pairs(names, 1)
+
+    def update_tags(self, question):
+        old = self.question_tags.get(question.id, [])
+        new = [tag.name for tag in question.tags]
+        key = self.score_keys[question.id]
+        for name in old:
+            if name not in new:
+                self._unlink(name, question.id, key)
+        for name in new:
+            if name not in old:
+                self._link(name, question.id, key)
+        self._count_pairs(old, -1)
+        self._count_pairs(new, 1)
+        self.question_tags[question.id] = new
+
+    def rescore(self, question):
+        old = self.score_keys.get(question.id)
+        if old is None:
+            return
+        key = (-question.get_vote_count(), old[1], question.id)
+        if key == old:
+            return
+        self.score_keys[question.id] = key
+        for name in self.question_tags[question.id]:
+            ranked = self.by_score[name]
+            ranked.remove(old)
+            ranked.insert(key)
+
+    def newest(self, name, cursor=None, limit=20):
+        """Question IDs tagged `name`, newest first, and the next cursor."""
+        recent = self.recent.get(name, [])
+        end = len(recent) if cursor is None else bisect.bisect_left(recent, cursor)
+        keys = recent[max(end - limit, 0):end][::-1]
+        next_cursor = keys[-1] if keys and end > limit else None
+        return [key[1] for key in keys], next_cursor
+
+    def top_scored(self, name, cursor=None, limit=20):
+        """Question IDs tagged `name`, highest score first, and the next cursor."""
+        ranked = self.by_score.get(name)
+        if ranked is None:
+            return [], None
+        start = 0 if cursor is None else ranked.rank(cursor, inclusive=True)
+        keys = ranked.slice(start, start + limit)
+        next_cursor = keys[-1] if keys and start + limit < len(ranked) else None
+        return [key[2] for key in keys], next_cursor
+
+    def count(self, name):
+        return len(self.recent.get(name, ()))
+
+    def related(self, name, k=10):
+        """The `k` tags most often used together with `name`."""
+        counts = self.co_occurrence.get(name, {})
+        return heapq.nlargest(k, counts.items(), key=lambda item: item[1])
+
+    def _link(self, name, qid, key):
+        bisect.insort(self.recent.setdefault(name, []), (key[1], qid))
+        ranked = self.by_score.get(name)
+        if ranked is None:
+            ranked = self.by_score[name] = IndexableSkipList()
+        ranked.insert(key)
+
+    def _unlink(self, name, qid, key):
+        recent = self.recent[name]
+        del recent[bisect.bisect_left(recent, (key[1], qid))]
+        self.by_score[name].remove(key)
+
+    def _count_pairs(self, names, delta):
+        for name in names:
+            counts = self.co_occurrence.setdefault(name, {})
+            for other in names:
+                if other == name:
+                    continue
+                counts[other] = counts.get(other, 0) + delta
+                if not counts[other]:
+                    del counts[other]
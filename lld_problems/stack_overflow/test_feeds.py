@@ -0,0 +1,44 @@
+"""Checks for QuestionFeeds when questions arrive out of creation order.
+
+Run with `python -m pytest test_feeds.py` or `python test_feeds.py`.
+"""
+from datetime import datetime, timedelta
+
+from answer import Answer
+from feeds import QuestionFeeds
+from question import Question
+
+
+def test_weekly_window_and_unanswered_follow_creation_dates():
+    now = datetime(2024, 1, 31, 12)
+    feeds = QuestionFeeds(clock=lambda: now)
+    # as an importer or a repository might hand them over
+    ages = [2, 6, 1, 5, 3]
+    questions = []
+    for days in ages:
+        question = Question(None, f"{days} days old", "", [])
+        question.creation_date = now - timedelta(days=days)
+        feeds.add(question)
+        questions.append(question)
+    by_age = [question.id for _, question in sorted(zip(ages, questions), key=lambda pair: pair[0])]
+    assert feeds.newest_unanswered(3) == by_age[:3]
+    assert sorted(feeds.top_this_week()) == sorted(by_age)
+
+    # a day later only the six-day-old question has left the week, even
+    # though it was not the first one added
+    now += timedelta(days=1, hours=1)
+    assert sorted(feeds.top_this_week()) == sorted(by_age[:4])
+    now += timedelta(days=1)
+    assert sorted(feeds.top_this_week()) == sorted(by_age[:3])
+
+    newest = questions[2]
+    newest.add_answer(Answer("answer", None, newest))
+    feeds.update(newest)
+    assert feeds.newest_unanswered() == by_age[1:]
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+    print("ok")
@@ -0,0 +1,71 @@
+"""Checks for DumpImporter on a small JSON Lines dump.
+
+Run with `python -m pytest test_importer.py` or `python test_importer.py`.
+"""
+import json
+import os
+import tempfile
+
+from importer import DumpImporter
+from stack_overflow import StackOverflow
+
+
+DUMP = {
+    "Users": [{"Id": 1, "DisplayName": "alice", "Reputation": 10},
+              {"Id": 2, "DisplayName": "bob", "Reputation": 20}],
+    "Posts": [
+        {"Id": 10, "PostTypeId": 1, "OwnerUserId": 1, "Title": "merge sorted lists",
+         "Body": "how do I merge two sorted lists", "Tags": "<python><lists>",
+         "AcceptedAnswerId": 12, "CreationDate": "2020-01-01T10:00:00"},
+        # owner deleted from the dump
+        {"Id": 11, "PostTypeId": 1, "OwnerUserId": 99, "Title": "orphan question",
+         "Body": "nobody owns this", "Tags": "<python>", "CreationDate": "2020-01-02T10:00:00"},
+        {"Id": 12, "PostTypeId": 2, "ParentId": 10, "OwnerUserId": 2, "Body": "use heapq.merge",
+         "CreationDate": "2020-01-01T11:00:00"},
+        {"Id": 13, "PostTypeId": 2, "ParentId": 404, "OwnerUserId": 2, "Body": "lost answer"},
+    ],
+    "Votes": [{"Id": 1, "PostId": 10, "VoteTypeId": 2, "UserId": 2},
+              {"Id": 2, "PostId": 11, "VoteTypeId": 2},
+              {"Id": 3, "PostId": 11, "VoteTypeId": 3}],
+}
+
+
+def import_dump(**options):
+    system = StackOverflow()
+    with tempfile.TemporaryDirectory() as directory:
+        for kind, rows in DUMP.items():
+            with open(os.path.join(directory, kind + ".jsonl"), "w") as f:
+                f.writelines(json.dumps(row) + "\n" for row in rows)
+        stats = DumpImporter(system, verbose=False, **options).import_directory(directory)
+    return system, stats
+
+
+def test_import_builds_posts_votes_and_indexes():
+    system, stats = import_dump()
+    assert stats.rows == {"Users": 2, "Posts": 4, "Votes": 3}
+    assert stats.skipped == {"Posts": 1}
+    merge, orphan = sorted(system.questions.values(), key=lambda question: question.title)
+    assert merge.author.username == "alice" and orphan.author is None
+    assert merge.get_vote_count() == 1 and orphan.get_vote_count() == 0
+    assert [answer.content for answer in merge.answers] == ["use heapq.merge"]
+    assert merge.answers[0].is_accepted
+    assert system.search_ranked("merge") == [merge]
+    assert system.get_questions_by_tag("python")[0] == [orphan, merge]
+    assert system.find_duplicates("merge sorted lists", "how do I merge two sorted lists")[0][0] is merge
+
+    # a later vote on the ownerless question changes nobody's reputation
+    system.vote_question(system.get_user(merge.author.id), orphan, 1)
+    assert orphan.get_vote_count() == 1
+
+
+def test_duplicate_indexing_can_be_skipped():
+    system, _ = import_dump(index_duplicates=False)
+    assert system.find_duplicates("merge sorted lists", "how do I merge two sorted lists") == []
+    assert system.search_ranked("merge")
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+    print("ok")
@@ -0,0 +1,41 @@
+"""Checks for the slotted posts: answer and comment lists, and vote tallies.
+
+Run with `python -m pytest test_posts.py` or `python test_posts.py`.
+"""
+from answer import Answer
+from question import Question
+from stack_overflow import StackOverflow
+from user import User
+
+
+def test_answers_and_comments_are_always_lists():
+    alice = User("alice", "a@example.com")
+    question = Question(alice, "title", "content", [])
+    assert question.answers == [] and question.comments == []
+    answer = Answer("content", alice, question)
+    question.answers.append(answer)
+    answer.comments.append("first")
+    assert question.answers == [answer] and answer.comments == ["first"]
+    question.add_answer(answer)
+    assert question.answers == [answer]
+    assert list(question.get_comments()) == []
+
+
+def test_iterating_a_tally_gives_back_users():
+    system = StackOverflow()
+    alice = system.create_user("alice", "a@example.com")
+    bob = system.create_user("bob", "b@example.com")
+    question = system.ask_question(alice, "title", "content", [])
+    system.vote_question(alice, question, 1)
+    system.vote_question(bob, question, -1)
+    assert [(vote.user, vote.value) for vote in question.votes] == [(alice, 1), (bob, -1)]
+    # anonymous votes, as imported from a dump, have no user
+    question.votes.cast(-7, 1)
+    assert [vote.user for vote in question.votes][-1] is None
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+    print("ok")
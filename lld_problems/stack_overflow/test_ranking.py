@@ -0,0 +1,37 @@
+"""Checks for BM25 ranking and its vote and accepted-answer boosts.
+
+Run with `python -m pytest test_ranking.py` or `python test_ranking.py`.
+"""
+from stack_overflow import StackOverflow
+
+
+def test_relevance_then_votes_then_accepted_answer():
+    system = StackOverflow()
+    alice = system.create_user("alice", "a@example.com")
+    voters = [system.create_user(f"voter{i}", "v@example.com") for i in range(2)]
+    titles = ["python list sort", "python dict", "python list comprehension list", "rust borrow"]
+    questions = [system.ask_question(alice, title, "", []) for title in titles]
+
+    assert system.search_ranked("list", k=2) == [questions[2], questions[0]]
+    assert questions[3] not in system.search_ranked("python")
+
+    # the shorter title wins on BM25 alone; votes and an accepted answer
+    # re-rank it, and each change drops the cached result
+    assert system.search_ranked("dict sort", k=2) == [questions[1], questions[0]]
+    for voter in voters:
+        system.vote_question(voter, questions[0], 1)
+    assert system.search_ranked("dict sort", k=2) == [questions[0], questions[1]]
+    system.accept_answer(system.answer_question(voters[0], questions[1], "use a dict"))
+    assert system.search_ranked("dict sort", k=2) == [questions[1], questions[0]]
+
+    for voter in voters:
+        system.retract_question_vote(voter, questions[0])
+    assert system.ranker.votes == {}
+    assert system.ranker.accepted == {questions[1].id}
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+    print("ok")
@@ -0,0 +1,139 @@
+"""Checks for SqliteRepository: reopening, transactions and rollback.
+
+Run with `python -m pytest test_repository.py` or `python test_repository.py`.
+"""
+import os
+import tempfile
+import threading
+
+from repository import SqliteRepository
+from stack_overflow import StackOverflow
+
+
+def open_system(path, **options):
+    return StackOverflow(SqliteRepository(path, **options))
+
+
+def test_reopen_restores_posts_votes_and_indexes():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "so.db")
+        system = open_system(path)
+        alice = system.create_user("alice", "a@example.com")
+        bob = system.create_user("bob", "b@example.com")
+        question = system.ask_question(alice, "python sort list", "how?", ["python"])
+        answer = system.answer_question(bob, question, "use sorted()")
+        system.vote_question(bob, question, 1)
+        system.vote_answer(alice, answer, 1)
+        system.accept_answer(answer)
+        system.repository.close()
+
+        system = open_system(path)
+        stored = system.get_question(question.id)
+        assert stored.title == "python sort list" and stored.get_vote_count() == 1
+        assert [a.id for a in stored.answers] == [answer.id] and stored.answers[0].is_accepted
+        assert system.search_ranked("sort") == [stored]
+        assert system.get_questions_by_tag("python")[0] == [stored]
+        assert system.get_user(bob.id).reputation == bob.reputation
+        assert [vote.user.username for vote in stored.votes] == ["bob"]
+        assert isinstance(stored.answers, list) and isinstance(stored.comments, list)
+        system.repository.close()
+
+
+def test_rollback_discards_the_block_and_reattach_rebuilds():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "so.db")
+        system = open_system(path)
+        alice = system.create_user("alice", "a@example.com")
+        question = system.ask_question(alice, "first", "body", ["python"])
+        repository = system.repository
+        try:
+            with repository.transaction():
+                system.ask_question(alice, "second", "body", ["python"])
+                system.vote_question(system.create_user("bob", "b@example.com"), question, 1)
+                # the block sees its own writes
+                assert len(system.questions) == 2 and len(system.users) == 2
+                raise RuntimeError("abort")
+        except RuntimeError:
+            pass
+        assert len(system.questions) == 1 and len(system.users) == 1
+
+        system = StackOverflow(repository)
+        stored = system.get_question(question.id)
+        assert stored is not question and stored.get_vote_count() == 0
+        assert system.search_ranked("second") == []
+        assert system.get_questions_by_tag("python")[0] == [stored]
+        repository.close()
+
+
+def test_other_threads_do_not_join_an_open_block():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "so.db")
+        system = open_system(path, batch_size=1)
+        alice = system.create_user("alice", "a@example.com")
+        repository = system.repository
+        inside = threading.Event()
+        written = threading.Event()
+
+        def other_writer():
+            inside.wait()
+            system.create_user("carol", "c@example.com")
+            written.set()
+
+        thread = threading.Thread(target=other_writer)
+        thread.start()
+        try:
+            with repository.transaction():
+                system.ask_question(alice, "never stored", "body", [])
+                inside.set()
+                written.wait()
+                # the other thread's write is committed, this block's is not
+                stored = repository.connection.execute
+                assert stored("SELECT COUNT(*) FROM users").fetchone() == (2,)
+                assert stored("SELECT COUNT(*) FROM questions").fetchone() == (0,)
+                assert len(repository.questions) == 1
+                raise RuntimeError("abort")
+        except RuntimeError:
+            pass
+        thread.join()
+        assert [user.username for user in repository.users.values()] == ["alice", "carol"]
+        assert len(repository.questions) == 0
+
+        with repository.transaction():
+            with repository.transaction():
+                system.ask_question(alice, "stored", "body", [])
+            assert repository.connection.execute("SELECT COUNT(*) FROM questions").fetchone() == (0,)
+        assert len(repository.questions) == 1
+        repository.close()
+
+
+
+def test_signatures_are_stored_and_dropped_when_settings_change():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "so.db")
+        system = open_system(path)
+        alice = system.create_user("alice", "a@example.com")
+        question = system.ask_question(alice, "merge two sorted lists", "in linear time please", [])
+        empty = system.ask_question(alice, "", "", [])
+        repository = system.repository
+        stored = repository._load_signatures(system.duplicates.scheme)
+        assert stored == {question.id: system.duplicates.signatures[question.id], empty.id: None}
+        repository.close()
+
+        system = open_system(path)
+        assert system.find_duplicates("merge two sorted lists", "in linear time please")[0][0].id == question.id
+        repository = system.repository
+        assert repository._load_signatures("other settings") == {}
+        assert repository._read("SELECT COUNT(*) FROM signatures") == [(0,)]
+        repository.close()
+
+        # attaching with the original settings hashes and stores them again
+        system = open_system(path)
+        assert system.find_duplicates("merge two sorted lists", "in linear time please")[0][0].id == question.id
+        assert len(system.repository._load_signatures(system.duplicates.scheme)) == 2
+        system.repository.close()
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+    print("ok")
@@ -0,0 +1,76 @@
+"""Rank checks for IndexableSkipList against bisect on a sorted list.
+
+Run with `python -m pytest test_skiplist.py` or `python test_skiplist.py`.
+"""
+import bisect
+import random
+
+from skiplist import IndexableSkipList
+
+
+def check(skiplist, keys):
+    assert len(skiplist) == len(keys)
+    assert list(skiplist) == keys
+    for i, key in enumerate(keys):
+        assert skiplist[i] == key
+    if keys:
+        assert skiplist[-1] == keys[-1]
+
+
+def test_matches_sorted_list_under_inserts_and_removes():
+    rng = random.Random(3)
+    skiplist = IndexableSkipList(seed=3)
+    keys = []
+    for _ in range(2000):
+        key = rng.randrange(500)
+        position = bisect.bisect_left(keys, key)
+        if position < len(keys) and keys[position] == key:
+            skiplist.remove(key)
+            del keys[position]
+        else:
+            skiplist.insert(key)
+            keys.insert(position, key)
+    check(skiplist, keys)
+
+
+def test_rank_is_bisect_left_or_right():
+    skiplist = IndexableSkipList(seed=1)
+    keys = list(range(0, 200, 2))
+    for key in reversed(keys):
+        skiplist.insert(key)
+    for probe in range(-1, 202):
+        assert skiplist.rank(probe) == bisect.bisect_left(keys, probe)
+        assert skiplist.rank(probe, inclusive=True) == bisect.bisect_right(keys, probe)
+
+
+def test_slice_and_index_bounds():
+    skiplist = IndexableSkipList(seed=2)
+    for key in range(50):
+        skiplist.insert((-key, key))
+    keys = sorted((-key, key) for key in range(50))
+    assert skiplist.slice(10, 15) == keys[10:15]
+    assert skiplist.slice(-5, 3) == keys[:3]
+    assert skiplist.slice(45, 99) == keys[45:]
+    assert skiplist.slice(20, 20) == []
+    start = skiplist.rank(keys[7], inclusive=True)
+    assert skiplist.slice(start, start + 2) == keys[8:10]
+    for index in (50, -51):
+        try:
+            skiplist[index]
+        except IndexError:
+            pass
+        else:
+            raise AssertionError(f"index {index} should be out of range")
+    try:
+        skiplist.remove((1, -1))
+    except KeyError:
+        pass
+    else:
+        raise AssertionError("removing a missing key should raise KeyError")
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+    print("ok")
@@ -1,17 +1,23 @@
 from question import Question
 from answer import Answer
 from comment import Comment
+from ids import ids
+from vote import voters
 
 class User:
+    __slots__ = ("id", "username", "email", "reputation", "question", "answer", "comments",
+                 "leaderboard", "__weakref__")
 
     def __init__(self, username, email):
-        self.id = id(self)
+        self.id = ids.next("users")
         self.username = username
         self.email = email
         self.reputation = 0
         self.question = []
         self.answer = []
         self.comments = []
+        self.leaderboard = None
+        voters.add(self)
 
 
     def ask_question(self, title, content, tags):
@@ -28,7 +34,7 @@ class User:
         return answer
 
     def comment_on(self, commentable, content):
-        comment = Comment(self, content)
+        comment = Comment(content=content, author=self)
         self.comments.append(comment)
         commentable.add_comment(comment)
         self.update_reputation(2)  # Gain 2 reputation for commenting
@@ -37,4 +43,12 @@ class User:
 
 
     def update_reputation(self, val):
-        self.reputation += val
+        leaderboard = self.leaderboard
+        if leaderboard is None:
+            self.reputation += val
+            return
+        # votes on any post change reputation, so the leaderboard hands out
+        # the locks (no-ops unless the system is thread-safe)
+        with leaderboard.reputation_locks.lock_for(self.id):
+            self.reputation += val
+            leaderboard.record(self, val)
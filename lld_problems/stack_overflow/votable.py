@@ -1,6 +1,8 @@
 from abc import abstractmethod, ABC
 
 class Votable(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def vote(self, user, value):
         pass
@@ -8,3 +10,7 @@ class Votable(ABC):
     @abstractmethod
     def get_vote_count(self):
         pass
+
+    @abstractmethod
+    def retract_vote(self, user):
+        pass
@@ -0,0 +1,82 @@
+"""Moves per second for the list-backed Board and the BitBoard.
+
+Each game replays a pre-shuffled move order through the public API: set
+the cell, ask the Referee for a winner and a draw, and stop at the end of
+the game; then every move is undone by setting its cell back to EMPTY.
+Both backends replay the same games, and a move or an undo counts as one.
+The last column replays them once more on the BitBoard through play() and
+undo() on cell indices, the path a search takes.
+
+Run with `python benchmark_boards.py`.
+"""
+import random
+import time
+
+from main import BitBoard, Board, Referee, Symbol
+
+
+CONFIGS = [(3, 3, 20_000), (7, 4, 2_000), (15, 5, 300)]
+
+
+def make_games(size, count, seed=7):
+    rng = random.Random(seed)
+    cells = [(r, c) for r in range(size) for c in range(size)]
+    games = []
+    for _ in range(count):
+        order = cells[:]
+        rng.shuffle(order)
+        games.append(order)
+    return games
+
+
+def replay(board, games):
+    referee = Referee()
+    moves = 0
+    start = time.perf_counter()
+    for order in games:
+        played = []
+        symbol = Symbol.X
+        for r, c in order:
+            board.set(r, c, symbol)
+            played.append((r, c))
+            if referee.check_winner(board) is not None or referee.is_draw(board):
+                break
+            symbol = Symbol.O if symbol == Symbol.X else Symbol.X
+        for r, c in reversed(played):
+            board.set(r, c, Symbol.EMPTY)
+        moves += 2 * len(played)
+    return moves / (time.perf_counter() - start)
+
+
+def replay_cells(board, games):
+    size = board.size
+    moves = 0
+    start = time.perf_counter()
+    for order in games:
+        played = []
+        symbol = Symbol.X
+        for r, c in order:
+            cell = r * size + c
+            board.play(cell, symbol)
+            played.append(cell)
+            if board.winner() is not None or board.is_full():
+                break
+            symbol = Symbol.O if symbol == Symbol.X else Symbol.X
+        for cell in reversed(played):
+            board.undo(cell)
+        moves += 2 * len(played)
+    return moves / (time.perf_counter() - start)
+
+
+def main():
+    print(f"{'board':>8} {'k':>3} {'Board mv/s':>12} {'BitBoard mv/s':>14} {'play/undo mv/s':>15}")
+    for size, k, count in CONFIGS:
+        games = make_games(size, count)
+        grid = replay(Board(size, k), games)
+        bits = replay(BitBoard(size, k), games)
+        cells = replay_cells(BitBoard(size, k), games)
+        print(f"{size:>4}x{size:<3} {k:>3} {grid:>12,.0f} {bits:>14,.0f} {cells:>15,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Self-play profile of AIPlayer: nodes, speed, TT hit rate and depth reached.
+
+Two AIPlayers play one game per board on a BitBoard, each with the same
+per-move time budget. The per-move SearchStats are summed over the game.
+
+Run with `python benchmark_search.py`.
+"""
+from main import AIPlayer, BitBoard, Referee, Symbol, UI
+
+
+CONFIGS = [(3, 3, 1.0), (4, 3, 1.0), (7, 4, 0.5), (15, 5, 0.5)]
+
+
+def self_play(size, k, budget):
+    board = BitBoard(size, k)
+    players = [AIPlayer("X", Symbol.X, time_budget=budget), AIPlayer("O", Symbol.O, time_budget=budget)]
+    for player in players:
+        player.watch(board)
+    referee = Referee()
+    ui = UI()
+    totals = {"moves": 0, "nodes": 0, "probes": 0, "hits": 0, "depth": 0, "seconds": 0.0}
+    turn = 0
+    while referee.check_winner(board) is None and not board.is_full():
+        player = players[turn]
+        move = player.get_move(ui)
+        board.set(move.row, move.col, player.symbol)
+        stats = player.stats
+        totals["moves"] += 1
+        totals["nodes"] += stats.nodes
+        totals["probes"] += stats.tt_probes
+        totals["hits"] += stats.tt_hits
+        totals["depth"] += stats.depth
+        totals["seconds"] += stats.seconds
+        turn = 1 - turn
+    winner = referee.check_winner(board)
+    return totals, winner.value if winner else "draw"
+
+
+def main():
+    print(f"{'board':>8} {'k':>3} {'moves':>6} {'nodes':>9} {'nodes/s':>9} {'TT hits':>8} {'avg depth':>10} {'result':>7}")
+    for size, k, budget in CONFIGS:
+        totals, result = self_play(size, k, budget)
+        rate = totals["nodes"] / totals["seconds"] if totals["seconds"] else 0
+        hits = totals["hits"] / totals["probes"] if totals["probes"] else 0
+        depth = totals["depth"] / totals["moves"]
+        print(f"{size:>4}x{size:<3} {k:>3} {totals['moves']:>6} {totals['nodes']:>9} {rate:>9,.0f} "
+              f"{hits:>8.1%} {depth:>10.1f} {result:>7}")
+
+
+if __name__ == "__main__":
+    main()
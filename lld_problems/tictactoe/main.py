@@ -1,6 +1,8 @@
 from __future__ import annotations
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
+from functools import lru_cache
+import time
 from typing import Optional, List, Tuple
 
 class Symbol(Enum):
@@ -14,42 +16,280 @@ class Move:
     col: int
 
 class Board:
-    def __init__(self, size: int = 3) -> None:
+    """Grid plus incremental win bookkeeping for k-in-a-row on an n x n board.
+
+    Every run of `win_length` consecutive cells along a row, column or
+    diagonal is a window, and each player has a count per window. `set`
+    only touches the windows through the changed cell (at most 4k of them,
+    4 when k == n), so winner() and is_full() are O(1) lookups. Setting a
+    cell back to EMPTY undoes a move.
+    """
+
+    def __init__(self, size: int = 3, win_length: Optional[int] = None) -> None:
         self.size = size
+        self.win_length = win_length or size
+        if not 1 <= self.win_length <= size:
+            raise ValueError(f"win_length must be between 1 and {size}")
         self.grid: List[List[Symbol]] = [[Symbol.EMPTY for _ in range(size)] for _ in range(size)]
+        self.filled = 0
+        span = size - self.win_length + 1
+        self._window_total = 2 * size * span + 2 * span * span
+        # window indices through each cell, built the first time the cell is set
+        self._windows: List[Optional[Tuple[int, ...]]] = [None] * (size * size)
+        self._counts = {Symbol.X: [0] * self._window_total, Symbol.O: [0] * self._window_total}
+        self._completed = {Symbol.X: 0, Symbol.O: 0}
 
     def get(self, r: int, c: int) -> Symbol:
         return self.grid[r][c]
 
     def set(self, r: int, c: int, symbol: Symbol) -> None:
+        previous = self.grid[r][c]
+        if previous == symbol:
+            return
         self.grid[r][c] = symbol
+        windows = self._windows_through(r, c)
+        k = self.win_length
+        if previous != Symbol.EMPTY:
+            self.filled -= 1
+            counts = self._counts[previous]
+            for w in windows:
+                if counts[w] == k:
+                    self._completed[previous] -= 1
+                counts[w] -= 1
+        if symbol != Symbol.EMPTY:
+            self.filled += 1
+            counts = self._counts[symbol]
+            for w in windows:
+                counts[w] += 1
+                if counts[w] == k:
+                    self._completed[symbol] += 1
 
     def is_empty(self, r: int, c: int) -> bool:
         return self.get(r, c) == Symbol.EMPTY
 
     def is_full(self) -> bool:
-        return all(cell != Symbol.EMPTY for row in self.grid for cell in row)
+        return self.filled == self.size * self.size
+
+    def winner(self) -> Optional[Symbol]:
+        if self._completed[Symbol.X]:
+            return Symbol.X
+        if self._completed[Symbol.O]:
+            return Symbol.O
+        return None
 
     def reset(self) -> None:
         for r in range(self.size):
             for c in range(self.size):
                 self.grid[r][c] = Symbol.EMPTY
+        self.filled = 0
+        for counts in self._counts.values():
+            counts[:] = [0] * self._window_total
+        for symbol in self._completed:
+            self._completed[symbol] = 0
+
+    def _windows_through(self, r: int, c: int) -> Tuple[int, ...]:
+        cell = r * self.size + c
+        windows = self._windows[cell]
+        if windows is None:
+            n, k = self.size, self.win_length
+            span = n - k + 1
+            # windows are numbered rows, then columns, then both diagonals,
+            # each by the cell it starts from
+            cols = n * span
+            diags = 2 * n * span
+            antidiags = diags + span * span
+            found = []
+            for start in range(max(0, c - k + 1), min(c, n - k) + 1):
+                found.append(r * span + start)
+            for start in range(max(0, r - k + 1), min(r, n - k) + 1):
+                found.append(cols + c * span + start)
+            for t in range(k):
+                sr = r - t
+                if not 0 <= sr < span:
+                    continue
+                if 0 <= c - t < span:
+                    found.append(diags + sr * span + c - t)
+                if k - 1 <= c + t < n:
+                    found.append(antidiags + sr * span + c + t - (k - 1))
+            windows = self._windows[cell] = tuple(found)
+        return windows
 
     def get_lines(self) -> List[List[Tuple[int, int]]]:
-        """Return all winning lines as lists of (r,c) tuples."""
-        n = self.size
+        """Return all winning lines as lists of (r,c) tuples.
+
+        One line per window of win_length cells, built on every call; the
+        Referee reads winner() instead.
+        """
+        n, k = self.size, self.win_length
+        span = n - k + 1
         lines = []
         # Rows and columns
         for i in range(n):
-            lines.append([(i, j) for j in range(n)])
-            lines.append([(j, i) for j in range(n)])
+            for start in range(span):
+                lines.append([(i, start + j) for j in range(k)])
+                lines.append([(start + j, i) for j in range(k)])
         # Diagonals
-        lines.append([(i, i) for i in range(n)])
-        lines.append([(i, n - 1 - i) for i in range(n)])
+        for r in range(span):
+            for c in range(span):
+                lines.append([(r + i, c + i) for i in range(k)])
+                lines.append([(r + i, c + k - 1 - i) for i in range(k)])
         return lines
 
+@lru_cache(maxsize=None)
+def win_masks(size: int, win_length: int) -> Tuple[Tuple[int, ...], ...]:
+    """Bitmask of every k-in-a-row window, grouped by the cells it covers."""
+    n, k = size, win_length
+    through: List[List[int]] = [[] for _ in range(n * n)]
+    for r in range(n):
+        for c in range(n):
+            for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                if not (0 <= r + (k - 1) * dr < n and 0 <= c + (k - 1) * dc < n):
+                    continue
+                cells = [(r + i * dr) * n + c + i * dc for i in range(k)]
+                mask = 0
+                for cell in cells:
+                    mask |= 1 << cell
+                for cell in cells:
+                    through[cell].append(mask)
+    return tuple(tuple(masks) for masks in through)
+
+@lru_cache(maxsize=None)
+def win_runs(size: int, win_length: int) -> Tuple[Tuple[int, Tuple[int, ...]], ...]:
+    """(valid starts, shifts) per direction for finding k-in-a-row on a bitmask.
+
+    ANDing a bitmask with itself shifted by d, 2d, 4d ... leaves a bit set
+    at every start of a run of k stones in direction d. Runs that wrap off
+    the edge of a row are dropped by masking with the cells a window of
+    that direction can start from.
+    """
+    n, k = size, win_length
+    runs = []
+    for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+        starts = 0
+        for r in range(n):
+            for c in range(n):
+                if 0 <= r + (k - 1) * dr < n and 0 <= c + (k - 1) * dc < n:
+                    starts |= 1 << (r * n + c)
+        step = dr * n + dc
+        shifts = []
+        length = 1
+        while 2 * length <= k:
+            shifts.append(length * step)
+            length *= 2
+        if length < k:
+            shifts.append((k - length) * step)
+        runs.append((starts, tuple(shifts)))
+    return tuple(runs)
+
+class BitBoard:
+    """Board backed by one bitmask per player; cell (r, c) is bit r * size + c.
+
+    Drop-in for Board. play sets one bit and undo clears it with one XOR;
+    the win test is a few shifts and ANDs per direction over a player's
+    whole bitmask (see win_runs), and key() is the position as one int.
+    """
+
+    def __init__(self, size: int = 3, win_length: Optional[int] = None) -> None:
+        self.size = size
+        self.win_length = win_length or size
+        if not 1 <= self.win_length <= size:
+            raise ValueError(f"win_length must be between 1 and {size}")
+        self.cells = size * size
+        self.full_mask = (1 << self.cells) - 1
+        self._runs = win_runs(size, self.win_length)
+        self.reset()
+
+    def get(self, r: int, c: int) -> Symbol:
+        bit = 1 << (r * self.size + c)
+        if self.x_bits & bit:
+            return Symbol.X
+        if self.o_bits & bit:
+            return Symbol.O
+        return Symbol.EMPTY
+
+    def set(self, r: int, c: int, symbol: Symbol) -> None:
+        cell = r * self.size + c
+        self.undo(cell)
+        if symbol != Symbol.EMPTY:
+            self.play(cell, symbol)
+
+    def play(self, cell: int, symbol: Symbol) -> None:
+        """Put symbol on an empty cell."""
+        bit = 1 << cell
+        if (self.x_bits | self.o_bits) & bit:
+            raise ValueError(f"cell {cell} is already taken")
+        if symbol == Symbol.X:
+            bits = self.x_bits = self.x_bits | bit
+        elif symbol == Symbol.O:
+            bits = self.o_bits = self.o_bits | bit
+        else:
+            raise ValueError("cannot play Symbol.EMPTY; use undo to clear a cell")
+        self.filled += 1
+        # only the mover can complete a line; X wins ties, as on Board
+        if self._winner is None or symbol == Symbol.X and self._winner == Symbol.O:
+            if self._wins(bits):
+                self._winner = symbol
+
+    def undo(self, cell: int) -> None:
+        """Clear a cell; a no-op if it is already empty."""
+        bit = 1 << cell
+        if self.x_bits & bit:
+            self.x_bits ^= bit
+        elif self.o_bits & bit:
+            self.o_bits ^= bit
+        else:
+            return
+        self.filled -= 1
+        if self._winner is not None:
+            self._winner = self._scan()
+
+    def is_empty(self, r: int, c: int) -> bool:
+        return not ((self.x_bits | self.o_bits) >> (r * self.size + c)) & 1
+
+    def is_full(self) -> bool:
+        return self.filled == self.cells
+
+    def winner(self) -> Optional[Symbol]:
+        return self._winner
+
+    def empty_cells(self) -> List[int]:
+        free = self.full_mask & ~(self.x_bits | self.o_bits)
+        cells = []
+        while free:
+            low = free & -free
+            cells.append(low.bit_length() - 1)
+            free ^= low
+        return cells
+
+    def key(self) -> int:
+        return self.x_bits | self.o_bits << self.cells
+
+    def reset(self) -> None:
+        self.x_bits = 0
+        self.o_bits = 0
+        self.filled = 0
+        self._winner: Optional[Symbol] = None
+
+    def _wins(self, bits: int) -> bool:
+        for starts, shifts in self._runs:
+            run = bits
+            for shift in shifts:
+                run &= run >> shift
+            if run & starts:
+                return True
+        return False
+
+    def _scan(self) -> Optional[Symbol]:
+        if self._wins(self.x_bits):
+            return Symbol.X
+        if self._wins(self.o_bits):
+            return Symbol.O
+        return None
+
+    get_lines = Board.get_lines
+
 class MoveValidator:
-    def validate(self, board: Board, move: Move) -> Optional[str]:
+    def validate(self, board: Board | BitBoard, move: Move) -> Optional[str]:
         n = board.size
         if not (0 <= move.row < n and 0 <= move.col < n):
             return f"Move out of bounds. Enter row/col between 1 and {n}."
@@ -58,19 +298,15 @@ class MoveValidator:
         return None
 
 class Referee:
-    def check_winner(self, board: Board) -> Optional[Symbol]:
+    def check_winner(self, board: Board | BitBoard) -> Optional[Symbol]:
         # returns winning symbol either X or O
-        for line in board.get_lines():
-            symbols = [board.get(r, c) for (r, c) in line]
-            if symbols[0] != Symbol.EMPTY and all(s == symbols[0] for s in symbols):
-                return symbols[0]
-        return None
+        return board.winner()
 
-    def is_draw(self, board: Board) -> bool:
+    def is_draw(self, board: Board | BitBoard) -> bool:
         return board.is_full() and self.check_winner(board) is None
 
 class UI:
-    def render(self, board: Board) -> None:
+    def render(self, board: Board | BitBoard) -> None:
         n = board.size
         print("\n  " + "   ".join(str(i + 1) for i in range(n)))
         print("  " + "—" * (4 * n - 1))
@@ -109,14 +345,302 @@ class Player:
     def get_move(self, ui: UI) -> Move:
         return ui.prompt_move(self)
 
+    def watch(self, board: Board | BitBoard) -> None:
+        """Called by the game with the board it plays on."""
+
+WIN = 1 << 40
+MATE_BOUND = WIN >> 1
+EXACT, LOWER, UPPER = 0, 1, 2
+
+class SearchTimeout(Exception):
+    pass
+
+@dataclass
+class SearchStats:
+    nodes: int = 0
+    tt_probes: int = 0
+    tt_hits: int = 0
+    depth: int = 0
+    value: int = 0
+    seconds: float = 0.0
+
+    @property
+    def tt_hit_rate(self) -> float:
+        return self.tt_hits / self.tt_probes if self.tt_probes else 0.0
+
+    @property
+    def nodes_per_second(self) -> float:
+        return self.nodes / self.seconds if self.seconds else 0.0
+
+@lru_cache(maxsize=None)
+def symmetries(size: int) -> Tuple[Tuple[int, ...], ...]:
+    """Cell permutations for the 8 rotations and reflections of the board."""
+    n = size
+    maps = [
+        lambda r, c: (r, c), lambda r, c: (c, n - 1 - r),
+        lambda r, c: (n - 1 - r, n - 1 - c), lambda r, c: (n - 1 - c, r),
+        lambda r, c: (r, n - 1 - c), lambda r, c: (n - 1 - r, c),
+        lambda r, c: (c, r), lambda r, c: (n - 1 - c, n - 1 - r),
+    ]
+    perms = []
+    for transform in maps:
+        perm = []
+        for cell in range(n * n):
+            r, c = transform(*divmod(cell, n))
+            perm.append(r * n + c)
+        perms.append(tuple(perm))
+    return tuple(perms)
+
+class AlphaBetaSearch:
+    """Negamax with alpha-beta pruning over a BitBoard, deepened iteratively.
+
+    Positions are stored in the transposition table under their canonical
+    key, the smallest of the 8 symmetric keys, which play/undo keep up to
+    date incrementally. Moves are tried TT move first, then by history
+    score, then centre-first; on boards larger than 4x4 only cells next to
+    a stone are searched. Scores are from the side to move, and a win found
+    p plies from the root scores WIN - p.
+    """
+
+    def __init__(self, size: int, win_length: int, max_entries: int = 1_000_000) -> None:
+        self.board = BitBoard(size, win_length)
+        self.max_entries = max_entries
+        self.table: dict = {}
+        self.stats = SearchStats()
+        n = size
+        cells = n * n
+        masks = win_masks(size, win_length)
+        self.windows = tuple(set(mask for through in masks for mask in through))
+        index = {mask: w for w, mask in enumerate(self.windows)}
+        self.cell_windows = [tuple(index[mask] for mask in masks[cell]) for cell in range(cells)]
+        # worth of a window holding x crosses and o noughts, from X's side
+        k = win_length
+        self.weights = [[0] * (k + 1) for _ in range(k + 1)]
+        for stones in range(1, k + 1):
+            self.weights[stones][0] = 1 << 2 * stones
+            self.weights[0][stones] = -(1 << 2 * stones)
+        self.x_counts = [0] * len(self.windows)
+        self.o_counts = [0] * len(self.windows)
+        self.score = 0
+        self.perms = symmetries(size)
+        self.inverse = tuple(tuple(perm.index(cell) for cell in range(cells)) for perm in self.perms)
+        # what each symmetric key gains when X or O takes a cell
+        self.key_bits = {
+            Symbol.X: [tuple(1 << perm[cell] for perm in self.perms) for cell in range(cells)],
+            Symbol.O: [tuple(1 << (perm[cell] + cells) for perm in self.perms) for cell in range(cells)],
+        }
+        self.centre_first = sorted(range(cells), key=lambda cell: -len(masks[cell]))
+        self.history = [0] * cells
+        self.local = n > 4
+        self.not_first_col = sum(1 << cell for cell in range(cells) if cell % n)
+        self.not_last_col = sum(1 << cell for cell in range(cells) if cell % n != n - 1)
+        self.keys = [0] * 8
+        self.deadline = 0.0
+
+    def best_move(self, position: Board | BitBoard, symbol: Symbol,
+                  time_budget: float, max_depth: Optional[int] = None) -> int:
+        """Return the cell to play, searching until time_budget seconds run out."""
+        self._load(position)
+        self.stats = SearchStats()
+        start = time.perf_counter()
+        self.deadline = start + time_budget
+        opponent = Symbol.O if symbol == Symbol.X else Symbol.X
+        moves = self._ordered_moves(None)
+        best = moves[0]
+        empties = self.board.cells - self.board.filled
+        limit = min(empties, max_depth or empties)
+        for depth in range(1, limit + 1):
+            try:
+                move, value = self._search_root(moves, depth, symbol, opponent)
+            except SearchTimeout:
+                self._load(position)
+                break
+            best = move
+            self.stats.depth = depth
+            self.stats.value = value
+            moves.remove(move)
+            moves.insert(0, move)
+            if abs(value) > MATE_BOUND:
+                break
+        self.stats.seconds = time.perf_counter() - start
+        return best
+
+    def _search_root(self, moves: List[int], depth: int, me: Symbol, them: Symbol) -> Tuple[int, int]:
+        alpha = -2 * WIN
+        best = moves[0]
+        for cell in moves:
+            self._play(cell, me)
+            value = -self._negamax(depth - 1, -2 * WIN, -alpha, 1, them, me)
+            self._undo(cell, me)
+            if value > alpha:
+                alpha, best = value, cell
+        return best, alpha
+
+    def _negamax(self, depth: int, alpha: int, beta: int, ply: int, me: Symbol, them: Symbol) -> int:
+        stats = self.stats
+        stats.nodes += 1
+        if not stats.nodes & 1023 and time.perf_counter() > self.deadline:
+            raise SearchTimeout
+        board = self.board
+        if board.winner() is not None:
+            return ply - WIN
+        if board.is_full():
+            return 0
+        if depth == 0:
+            return self._evaluate(me)
+        key = min(self.keys)
+        symmetry = self.keys.index(key)
+        stats.tt_probes += 1
+        entry = self.table.get(key)
+        hint = None
+        alpha_orig = alpha
+        if entry is not None:
+            stats.tt_hits += 1
+            stored_depth, stored, flag, stored_move = entry
+            hint = self.inverse[symmetry][stored_move]
+            if stored_depth >= depth:
+                value = stored - ply if stored > MATE_BOUND else stored + ply if stored < -MATE_BOUND else stored
+                if flag == EXACT:
+                    return value
+                if flag == LOWER:
+                    alpha = max(alpha, value)
+                else:
+                    beta = min(beta, value)
+                if alpha >= beta:
+                    return value
+        best_value = -2 * WIN
+        best = hint
+        for cell in self._ordered_moves(hint):
+            self._play(cell, me)
+            value = -self._negamax(depth - 1, -beta, -alpha, ply + 1, them, me)
+            self._undo(cell, me)
+            if value > best_value:
+                best_value, best = value, cell
+            if value > alpha:
+                alpha = value
+            if alpha >= beta:
+                self.history[cell] += depth * depth
+                break
+        flag = UPPER if best_value <= alpha_orig else LOWER if best_value >= beta else EXACT
+        stored = best_value + ply if best_value > MATE_BOUND else best_value - ply if best_value < -MATE_BOUND else best_value
+        table = self.table
+        if len(table) >= self.max_entries and key not in table:
+            table.clear()
+        table[key] = (depth, stored, flag, self.perms[symmetry][best])
+        return best_value
+
+    def _ordered_moves(self, hint: Optional[int]) -> List[int]:
+        board = self.board
+        taken = board.x_bits | board.o_bits
+        allowed = board.full_mask & ~taken
+        if self.local and taken:
+            n = board.size
+            near = taken | (taken << 1) & self.not_first_col | (taken >> 1) & self.not_last_col
+            near |= near << n | near >> n
+            allowed = allowed & near or allowed
+        moves = [cell for cell in self.centre_first if allowed >> cell & 1]
+        if self.local and not taken:
+            moves = moves[:1]
+        moves.sort(key=self.history.__getitem__, reverse=True)
+        if hint is not None and hint in moves:
+            moves.remove(hint)
+            moves.insert(0, hint)
+        return moves
+
+    def _evaluate(self, me: Symbol) -> int:
+        """Open windows weighted by how many stones they hold, for me minus them.
+
+        The total is kept up to date by _play and _undo, which only revisit
+        the windows through the changed cell.
+        """
+        return self.score if me == Symbol.X else -self.score
+
+    def _play(self, cell: int, symbol: Symbol) -> None:
+        self.board.play(cell, symbol)
+        keys = self.keys
+        for i, bit in enumerate(self.key_bits[symbol][cell]):
+            keys[i] += bit
+        weights, x_counts, o_counts = self.weights, self.x_counts, self.o_counts
+        score = self.score
+        if symbol == Symbol.X:
+            for w in self.cell_windows[cell]:
+                x, o = x_counts[w], o_counts[w]
+                score += weights[x + 1][o] - weights[x][o]
+                x_counts[w] = x + 1
+        else:
+            for w in self.cell_windows[cell]:
+                x, o = x_counts[w], o_counts[w]
+                score += weights[x][o + 1] - weights[x][o]
+                o_counts[w] = o + 1
+        self.score = score
+
+    def _undo(self, cell: int, symbol: Symbol) -> None:
+        self.board.undo(cell)
+        keys = self.keys
+        for i, bit in enumerate(self.key_bits[symbol][cell]):
+            keys[i] -= bit
+        weights, x_counts, o_counts = self.weights, self.x_counts, self.o_counts
+        score = self.score
+        if symbol == Symbol.X:
+            for w in self.cell_windows[cell]:
+                x, o = x_counts[w], o_counts[w]
+                score += weights[x - 1][o] - weights[x][o]
+                x_counts[w] = x - 1
+        else:
+            for w in self.cell_windows[cell]:
+                x, o = x_counts[w], o_counts[w]
+                score += weights[x][o - 1] - weights[x][o]
+                o_counts[w] = o - 1
+        self.score = score
+
+    def _load(self, position: Board | BitBoard) -> None:
+        self.board.reset()
+        self.keys = [0] * 8
+        self.x_counts = [0] * len(self.windows)
+        self.o_counts = [0] * len(self.windows)
+        self.score = 0
+        n = self.board.size
+        for r in range(n):
+            for c in range(n):
+                symbol = position.get(r, c)
+                if symbol != Symbol.EMPTY:
+                    self._play(r * n + c, symbol)
+
+@dataclass
+class AIPlayer(Player):
+    """Computer player; get_move searches the board the game told it to watch."""
+    time_budget: float = 1.0
+    max_depth: Optional[int] = None
+    board: Optional[Board | BitBoard] = field(default=None, repr=False)
+    search: Optional[AlphaBetaSearch] = field(default=None, repr=False)
+
+    def watch(self, board: Board | BitBoard) -> None:
+        self.board = board
+        self.search = AlphaBetaSearch(board.size, board.win_length)
+
+    def get_move(self, ui: UI) -> Move:
+        if self.board is None:
+            raise RuntimeError(f"{self.name} has no board; call watch(board) before get_move")
+        if self.search is None:
+            self.search = AlphaBetaSearch(self.board.size, self.board.win_length)
+        cell = self.search.best_move(self.board, self.symbol, self.time_budget, self.max_depth)
+        return Move(*divmod(cell, self.board.size))
+
+    @property
+    def stats(self) -> SearchStats:
+        return self.search.stats if self.search else SearchStats()
+
 class TicTacToeGame:
-    def __init__(self, player1: Player, player2: Player, ui: UI | None = None) -> None:
-        self.board = Board()
+    def __init__(self, player1: Player, player2: Player, ui: UI | None = None,
+                 board: Board | BitBoard | None = None) -> None:
+        self.board = board or Board()
         self.players = [player1, player2]
         self.current = 0  # index into self.players
         self.validator = MoveValidator()
         self.referee = Referee()
         self.ui = ui or UI()
+        for player in self.players:
+            player.watch(self.board)
 
     def switch_turn(self) -> None:
         self.current = 1 - self.current
@@ -131,8 +655,6 @@ class TicTacToeGame:
                 continue
             self.board.set(move.row, move.col, player.symbol)
             break
-        import pdb
-        pdb.set_trace()
         winner_symbol = self.referee.check_winner(self.board)
         if winner_symbol is not None:
             # Map symbol -> player
@@ -168,6 +690,9 @@ if __name__ == "__main__":
             print("Invalid choice. Please select X or O.")
     # Setup players (can be extended to prompt names)
     p1 = Player(name="Player 1", symbol=p1_symbol)
-    p2 = Player(name="Player 2", symbol=p2_symbol)
+    if input("Play against the computer? (y/N): ").strip().lower() == "y":
+        p2 = AIPlayer(name="Computer", symbol=p2_symbol)
+    else:
+        p2 = Player(name="Player 2", symbol=p2_symbol)
     game = TicTacToeGame(p1, p2)
     game.run()
\ No newline at end of file
@@ -0,0 +1,83 @@
+"""BitBoard checked against Board and a brute-force winner.
+
+Run with `python -m pytest test_bitboard.py` or `python test_bitboard.py`.
+"""
+import random
+
+from main import BitBoard, Board, Symbol, win_masks
+
+
+def other(symbol):
+    return Symbol.O if symbol == Symbol.X else Symbol.X
+
+
+def brute_winner(board):
+    n = board.size
+    for through in win_masks(n, board.win_length):
+        for mask in through:
+            cells = [cell for cell in range(n * n) if mask >> cell & 1]
+            symbols = {board.get(*divmod(cell, n)) for cell in cells}
+            if len(symbols) == 1 and Symbol.EMPTY not in symbols:
+                return symbols.pop()
+    return None
+
+
+def test_boards_agree_on_random_games_and_undo():
+    rng = random.Random(5)
+    for size, k in [(3, 3), (4, 3), (5, 4), (7, 4)]:
+        board, bits = Board(size, k), BitBoard(size, k)
+        cells = [(r, c) for r in range(size) for c in range(size)]
+        for _ in range(100):
+            rng.shuffle(cells)
+            played = []
+            symbol = Symbol.X
+            for r, c in cells:
+                board.set(r, c, symbol)
+                bits.set(r, c, symbol)
+                played.append((r, c))
+                assert board.winner() == bits.winner() == brute_winner(board)
+                assert board.is_full() == bits.is_full()
+                if board.winner() is not None:
+                    break
+                symbol = other(symbol)
+            for r, c in reversed(played):
+                assert board.get(r, c) == bits.get(r, c)
+                board.set(r, c, Symbol.EMPTY)
+                bits.set(r, c, Symbol.EMPTY)
+            assert board.filled == bits.filled == 0
+            assert board.winner() is None and bits.winner() is None
+
+
+def test_bitboard_rejects_invalid_plays():
+    bits = BitBoard(3)
+    bits.play(4, Symbol.X)
+    for cell, symbol in [(4, Symbol.O), (4, Symbol.X), (0, Symbol.EMPTY)]:
+        try:
+            bits.play(cell, symbol)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"play({cell}, {symbol}) should be rejected")
+    assert bits.filled == 1 and bits.get(1, 1) == Symbol.X and bits.winner() is None
+
+
+def test_boards_agree_under_arbitrary_sets():
+    # overwrites and positions where both players hold a line; X is
+    # reported first on both boards
+    rng = random.Random(9)
+    for size, k in [(3, 3), (4, 3), (5, 2), (4, 1)]:
+        board, bits = Board(size, k), BitBoard(size, k)
+        for _ in range(5000):
+            r, c = rng.randrange(size), rng.randrange(size)
+            symbol = rng.choice(list(Symbol))
+            board.set(r, c, symbol)
+            bits.set(r, c, symbol)
+            assert board.winner() == bits.winner()
+            assert board.filled == bits.filled
+        assert bits.get_lines() == board.get_lines()
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+    print("ok")
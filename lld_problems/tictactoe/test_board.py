@@ -0,0 +1,66 @@
+"""Board win bookkeeping checked against a scan of get_lines().
+
+Run with `python -m pytest test_board.py` or `python test_board.py`.
+"""
+import random
+
+from main import Board, Referee, Symbol
+
+
+def scan_winner(board):
+    for line in board.get_lines():
+        symbols = [board.get(r, c) for (r, c) in line]
+        if symbols[0] != Symbol.EMPTY and all(s == symbols[0] for s in symbols):
+            return symbols[0]
+    return None
+
+
+def test_get_lines_lists_every_window():
+    assert len(Board(3).get_lines()) == 8
+    assert Board(3).get_lines()[-1] == [(0, 2), (1, 1), (2, 0)]
+    lines = Board(5, 4).get_lines()
+    assert len(lines) == 5 * 2 * 2 + 2 * 2 * 2
+    assert all(len(line) == 4 for line in lines)
+    assert len({tuple(line) for line in lines}) == len(lines)
+
+
+def test_winner_matches_line_scan_through_moves_and_undo():
+    rng = random.Random(11)
+    referee = Referee()
+    for size, k in [(3, 3), (4, 4), (4, 3), (6, 4)]:
+        board = Board(size, k)
+        cells = [(r, c) for r in range(size) for c in range(size)]
+        for _ in range(200):
+            rng.shuffle(cells)
+            played = []
+            symbol = Symbol.X
+            for r, c in cells:
+                board.set(r, c, symbol)
+                played.append((r, c))
+                assert referee.check_winner(board) == scan_winner(board)
+                assert board.is_full() == (len(played) == size * size)
+                if board.winner() is not None:
+                    break
+                symbol = Symbol.O if symbol == Symbol.X else Symbol.X
+            for r, c in reversed(played):
+                board.set(r, c, Symbol.EMPTY)
+                assert board.winner() == scan_winner(board)
+            assert board.filled == 0
+
+
+def test_overwriting_a_cell_moves_its_counts():
+    board = Board(3)
+    board.set(0, 0, Symbol.X)
+    board.set(0, 1, Symbol.X)
+    board.set(0, 2, Symbol.O)
+    board.set(0, 2, Symbol.X)
+    assert board.winner() == Symbol.X and board.filled == 3
+    board.set(0, 1, Symbol.O)
+    assert board.winner() is None and board.filled == 3
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+    print("ok")
@@ -0,0 +1,93 @@
+"""AlphaBetaSearch and AIPlayer checked against exhaustive minimax on 3x3.
+
+Run with `python -m pytest test_search.py` or `python test_search.py`.
+"""
+from functools import lru_cache
+
+from main import AIPlayer, AlphaBetaSearch, BitBoard, Symbol
+
+
+def other(symbol):
+    return Symbol.O if symbol == Symbol.X else Symbol.X
+
+
+@lru_cache(maxsize=None)
+def minimax(x_bits, o_bits, to_move):
+    """Exact value of a 3x3 position for the side to move: 1, 0 or -1."""
+    board = BitBoard(3)
+    for cell in range(9):
+        if x_bits >> cell & 1:
+            board.play(cell, Symbol.X)
+        elif o_bits >> cell & 1:
+            board.play(cell, Symbol.O)
+    if board.winner() is not None:
+        return -1
+    if board.is_full():
+        return 0
+    best = -1
+    for cell in board.empty_cells():
+        if to_move == Symbol.X:
+            value = -minimax(x_bits | 1 << cell, o_bits, Symbol.O)
+        else:
+            value = -minimax(x_bits, o_bits | 1 << cell, Symbol.X)
+        best = max(best, value)
+    return best
+
+
+def positions(board, to_move, seen):
+    """Every reachable, undecided 3x3 position, with the side to move."""
+    key = board.key()
+    if key in seen or board.winner() is not None or board.is_full():
+        return
+    seen.add(key)
+    yield board.x_bits, board.o_bits, to_move
+    for cell in board.empty_cells():
+        board.play(cell, to_move)
+        yield from positions(board, other(to_move), seen)
+        board.undo(cell)
+
+
+def test_ai_plays_optimally_on_3x3():
+    search = AlphaBetaSearch(3, 3)
+    for x_bits, o_bits, to_move in list(positions(BitBoard(3), Symbol.X, set())):
+        board = BitBoard(3)
+        for cell in range(9):
+            if x_bits >> cell & 1:
+                board.play(cell, Symbol.X)
+            elif o_bits >> cell & 1:
+                board.play(cell, Symbol.O)
+        cell = search.best_move(board, to_move, time_budget=10.0)
+        assert not (x_bits | o_bits) >> cell & 1
+        if to_move == Symbol.X:
+            value = -minimax(x_bits | 1 << cell, o_bits, Symbol.O)
+        else:
+            value = -minimax(x_bits, o_bits | 1 << cell, Symbol.X)
+        assert value == minimax(x_bits, o_bits, to_move), (x_bits, o_bits, to_move, cell)
+
+
+def test_self_play_on_3x3_is_a_draw():
+    board = BitBoard(3)
+    players = [AIPlayer("X", Symbol.X, time_budget=10.0), AIPlayer("O", Symbol.O, time_budget=10.0)]
+    for player in players:
+        player.watch(board)
+    turn = 0
+    while board.winner() is None and not board.is_full():
+        move = players[turn].get_move(None)
+        board.set(move.row, move.col, players[turn].symbol)
+        turn = 1 - turn
+    assert board.winner() is None
+
+
+def test_ai_needs_a_board():
+    try:
+        AIPlayer("X", Symbol.X).get_move(None)
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("get_move without watch() should raise")
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+    print("ok")